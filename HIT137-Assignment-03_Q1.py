@@ -1,24 +1,42 @@
 import pygame
 import math
-import random
-import json
 import os
 import sys
+import time
 import traceback
+from operator import attrgetter
+from types import SimpleNamespace
 
-# Initialize Pygame with error handling
-try:
-    pygame.init()
-    if not pygame.get_init():
-        raise RuntimeError("Pygame failed to initialize")
-except Exception as e:
-    print(f"Error initializing Pygame: {e}")
-    sys.exit(1)
+from analytics import EVENT_DAMAGE, EVENT_DEATH, EVENT_KILL, EVENT_LEVEL_COMPLETE, EVENT_PICKUP
+from drawlist import (LAYER_BACKGROUND, LAYER_DETAILS, LAYER_ENTITIES, LAYER_PROJECTILES,
+                      DrawList, SpriteSheet, bake, flush_layers, solid)
+from hud import BarWidget, HudLayer, TextWidget
+from minimap import Minimap
+from pipeline import FrameSnapshot, PipelinedGame
+from quality import QualityGovernor
+from runtime import GameRuntime, entity_group
+from spawner import Spawn, WaveSpawner
+from startup import get_font
 
 # Constants
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 FPS = 60
+CULL_MARGIN = SCREEN_WIDTH  # Projectiles this far outside the view moving away are removed
+SPAWN_LEAD = 200  # Level entities spawn this far ahead of the view
+SPAWN_WIDTHS = {"enemy": 60, "boss": 100, "collectible": 20}
+
+# Rewind state rows are (id, kind, 8 fields), strings are stored as indexes
+KIND_GAME, KIND_PLAYER, KIND_ENEMY, KIND_PROJECTILE, KIND_COLLECTIBLE = range(5)
+ENEMY_TYPES = ("basic", "heavy", "boss")
+OWNERS = ("player", "enemy")
+COLLECTIBLE_TYPES = ("health", "extra_life", "score")
+
+# Minimap of the whole level, centered above the view
+MINIMAP_SIZE = (240, 48)
+MINIMAP_POSITION = ((SCREEN_WIDTH - MINIMAP_SIZE[0]) // 2, 10)
+RECT_CENTER = attrgetter("rect.centerx", "rect.centery")
+SPAWN_POSITION = attrgetter("x", "y")
 
 # Colors
 BLACK = (0, 0, 0)
@@ -64,22 +82,33 @@ class Projectile:
         self.damage = damage
         self.owner = owner
         self.color = YELLOW if owner == "player" else RED
+        self.last_move = (0, 0)  # Swept for continuous collision
     
-    def update(self):
+    def update(self, left=-50, right=SCREEN_WIDTH + 1000):
         """Update projectile position"""
+        start_x = self.rect.x
         self.rect.x += self.direction * self.speed
+        self.last_move = (self.rect.x - start_x, 0)
         
-        # Remove if off screen
-        if self.rect.x < -50 or self.rect.x > SCREEN_WIDTH + 1000:
+        # Remove once outside the culling bounds and moving away
+        if self.rect.right < left and self.direction < 0:
+            return False
+        if self.rect.x > right and self.direction > 0:
             return False
         return True
     
-    def draw(self, screen, camera):
+    def draw(self, screen, camera, quality=None):
         """Draw projectile"""
         draw_rect = camera.apply(self)
         pygame.draw.rect(screen, self.color, draw_rect)
         # Add glow effect
-        pygame.draw.rect(screen, WHITE, draw_rect, 1)
+        if quality is None or quality.draw_glow:
+            pygame.draw.rect(screen, WHITE, draw_rect, 1)
+    
+    def emit(self, draw_list, camera_x, quality):
+        """Queue the baked projectile sprite"""
+        suffix = "" if quality.draw_glow else "_plain"
+        draw_list.add(LAYER_PROJECTILES, f"projectile_{self.owner}{suffix}", self.rect.x - camera_x, self.rect.y)
 
 class Enemy:
     """Enemy tank class"""
@@ -90,6 +119,7 @@ class Enemy:
         self.direction = -1  # Moving left
         self.last_shot = 0
         self.shoot_delay = 2000 if enemy_type == "basic" else 1500  # milliseconds
+        self.shot_ready = False  # Set by the scheduler once the delay has passed
         
         # Health based on type
         if enemy_type == "basic":
@@ -107,8 +137,16 @@ class Enemy:
         self.health = self.max_health
         self.alive = True
     
-    def update(self, player_pos, current_time):
-        """Update enemy behavior"""
+    def schedule_reload(self, scheduler):
+        """Register the time this tank can fire again"""
+        self.shot_ready = False
+        scheduler.schedule_at(self.last_shot + self.shoot_delay + 1, self.reload)
+    
+    def reload(self):
+        self.shot_ready = True
+    
+    def update(self, player_pos, current_time, scheduler, rng):
+        """Update enemy behavior, rng is the enemy AI's RandomStream"""
         if not self.alive:
             return []
         
@@ -120,14 +158,15 @@ class Enemy:
             self.rect.x += self.direction * self.speed
             
             # Change direction occasionally
-            if random.randint(1, 200) == 1:
+            if rng.randint(1, 200) == 1:
                 self.direction *= -1
         
         # Shooting logic
         projectiles = []
-        if current_time - self.last_shot > self.shoot_delay:
+        if self.shot_ready:
             if abs(self.rect.x - player_pos[0]) < 400:  # In range
                 self.last_shot = current_time
+                self.schedule_reload(scheduler)
                 projectiles.append(Projectile(
                     self.rect.centerx, self.rect.centery, 
                     self.direction, 5, 1, "enemy"
@@ -143,7 +182,7 @@ class Enemy:
             return True
         return False
     
-    def draw(self, screen, camera):
+    def draw(self, screen, camera, quality=None):
         """Draw enemy tank"""
         if not self.alive:
             return
@@ -158,6 +197,9 @@ class Enemy:
         barrel_rect = pygame.Rect(draw_rect.right - 5, draw_rect.centery - 3, 15, 6)
         pygame.draw.rect(screen, GRAY, barrel_rect)
         
+        if quality is not None and not quality.draw_health_bars:
+            return
+        
         # Health bar
         health_width = 40
         health_height = 4
@@ -170,6 +212,20 @@ class Enemy:
         # Health foreground
         health_ratio = self.health / self.max_health
         pygame.draw.rect(screen, GREEN, (health_x, health_y, health_width * health_ratio, health_height))
+    
+    def emit(self, draw_list, camera_x, quality):
+        """Queue the baked tank sprite and its health bar"""
+        if not self.alive:
+            return
+        
+        x = self.rect.x - camera_x
+        draw_list.add(LAYER_ENTITIES, f"enemy_{self.enemy_type}", x, self.rect.y)
+        
+        if quality.draw_health_bars:
+            health_x = x + (self.rect.width - 40) // 2
+            health_y = self.rect.y - 10
+            draw_list.add(LAYER_DETAILS, "red", health_x, health_y, 40, 4)
+            draw_list.add(LAYER_DETAILS, "green", health_x, health_y, int(40 * self.health / self.max_health), 4)
 
 class Collectible:
     """Collectible items class"""
@@ -197,13 +253,16 @@ class Collectible:
         if self.bob_offset > 6.28:  # 2 * pi
             self.bob_offset = 0
     
-    def draw(self, screen, camera):
+    def draw(self, screen, camera, quality=None):
         """Draw collectible"""
         if self.collected:
             return
         
         draw_rect = camera.apply(self)
-        bob_y = draw_rect.y + math.sin(self.bob_offset) * 3
+        if quality is None or quality.animate_bobbing:
+            bob_y = draw_rect.y + math.sin(self.bob_offset) * 3
+        else:
+            bob_y = draw_rect.y
         
         if self.collectible_type == "health":
             # Draw cross
@@ -221,6 +280,16 @@ class Collectible:
         else:  # score
             # Draw star
             pygame.draw.circle(screen, self.color, (draw_rect.centerx, int(bob_y + 10)), 8)
+    
+    def emit(self, draw_list, camera_x, quality):
+        """Queue the baked collectible sprite, only the star bobs"""
+        if self.collected:
+            return
+        
+        y = self.rect.y
+        if self.collectible_type == "score" and quality.animate_bobbing:
+            y += int(math.sin(self.bob_offset) * 3)
+        draw_list.add(LAYER_ENTITIES, f"collectible_{self.collectible_type}", self.rect.x - camera_x, y)
 
 class Player:
     """Player tank class"""
@@ -236,10 +305,19 @@ class Player:
         self.lives = 3
         self.last_shot = 0
         self.shoot_delay = 200  # milliseconds
+        self.shot_ready = False  # Set by the scheduler once the delay has passed
         self.alive = True
         self.ground_y = SCREEN_HEIGHT - 100  # Ground level
     
-    def update(self, keys, current_time):
+    def schedule_reload(self, scheduler):
+        """Register the time this tank can fire again"""
+        self.shot_ready = False
+        scheduler.schedule_at(self.last_shot + self.shoot_delay + 1, self.reload)
+    
+    def reload(self):
+        self.shot_ready = True
+    
+    def update(self, keys, current_time, scheduler):
         """Update player movement and actions"""
         if not self.alive:
             return []
@@ -271,8 +349,9 @@ class Player:
         
         # Shooting
         projectiles = []
-        if (keys[pygame.K_x] or keys[pygame.K_LCTRL]) and current_time - self.last_shot > self.shoot_delay:
+        if (keys[pygame.K_x] or keys[pygame.K_LCTRL]) and self.shot_ready:
             self.last_shot = current_time
+            self.schedule_reload(scheduler)
             projectiles.append(Projectile(
                 self.rect.right, self.rect.centery, 
                 1, 10, 1, "player"
@@ -319,18 +398,33 @@ class Player:
         # Tank tracks
         track_rect = pygame.Rect(draw_rect.x, draw_rect.bottom - 8, draw_rect.width, 8)
         pygame.draw.rect(screen, BLACK, track_rect)
+    
+    def emit(self, draw_list, camera_x):
+        """Queue the baked tank sprite"""
+        if self.alive:
+            draw_list.add(LAYER_ENTITIES, "player", self.rect.x - camera_x, self.rect.y)
 
 class Level:
     """Level class to manage level-specific data"""
     def __init__(self, level_num):
         self.level_num = level_num
-        self.enemies = []
-        self.collectibles = []
+        self.spawns = []
         self.background_color = BLACK
         self.completed = False
         self.boss_spawned = False
         
         self.generate_level()
+        
+        # World extends a screen past the furthest level content
+        self.width = max(spawn.x + SPAWN_WIDTHS.get(spawn.variant, SPAWN_WIDTHS[spawn.kind])
+                         for spawn in self.spawns) + SCREEN_WIDTH
+        
+        # Entities are created as the camera approaches them
+        self.spawner = WaveSpawner(self.spawns)
+    
+    def add_spawn(self, kind, x, y, variant):
+        """Describe an entity that spawns once the camera gets near x"""
+        self.spawns.append(Spawn(x - SPAWN_LEAD, kind, x, y, variant))
     
     def generate_level(self):
         """Generate level content"""
@@ -339,32 +433,32 @@ class Level:
             for i in range(5):
                 x = 800 + i * 300
                 y = SCREEN_HEIGHT - 140
-                self.enemies.append(Enemy(x, y, "basic"))
+                self.add_spawn("enemy", x, y, "basic")
             
             # Add collectibles
             for i in range(3):
                 x = 600 + i * 400
                 y = SCREEN_HEIGHT - 150
                 ctype = ["health", "score", "extra_life"][i % 3]
-                self.collectibles.append(Collectible(x, y, ctype))
+                self.add_spawn("collectible", x, y, ctype)
         
         elif self.level_num == 2:
             # Level 2: Mix of basic and heavy enemies
             for i in range(3):
                 x = 800 + i * 400
                 y = SCREEN_HEIGHT - 140
-                self.enemies.append(Enemy(x, y, "basic"))
+                self.add_spawn("enemy", x, y, "basic")
             
             for i in range(2):
                 x = 1000 + i * 500
                 y = SCREEN_HEIGHT - 140
-                self.enemies.append(Enemy(x, y, "heavy"))
+                self.add_spawn("enemy", x, y, "heavy")
             
             for i in range(4):
                 x = 700 + i * 300
                 y = SCREEN_HEIGHT - 150
                 ctype = ["health", "score", "extra_life"][i % 3]
-                self.collectibles.append(Collectible(x, y, ctype))
+                self.add_spawn("collectible", x, y, ctype)
         
         elif self.level_num == 3:
             # Level 3: Final level with boss
@@ -372,31 +466,80 @@ class Level:
                 x = 800 + i * 350
                 y = SCREEN_HEIGHT - 140
                 etype = "heavy" if i % 2 == 0 else "basic"
-                self.enemies.append(Enemy(x, y, etype))
+                self.add_spawn("enemy", x, y, etype)
             
             # Boss at the end
             boss_x = 2000
             boss_y = SCREEN_HEIGHT - 160
-            self.enemies.append(Enemy(boss_x, boss_y, "boss"))
+            self.add_spawn("enemy", boss_x, boss_y, "boss")
             
             for i in range(5):
                 x = 600 + i * 350
                 y = SCREEN_HEIGHT - 150
                 ctype = ["health", "score", "extra_life"][i % 3]
-                self.collectibles.append(Collectible(x, y, ctype))
+                self.add_spawn("collectible", x, y, ctype)
+
+def minimap_enemy_color(enemy):
+    return ORANGE if enemy.enemy_type == "boss" else RED
 
-class Game:
+def minimap_spawn_color(spawn):
+    """Dimmer dots for entities that have not spawned yet"""
+    if spawn.kind == "collectible":
+        return (128, 128, 0)
+    return (128, 82, 0) if spawn.variant == "boss" else (128, 0, 0)
+
+class BakeCamera:
+    """Camera stand-in that draws an entity at a fixed spot on a sprite"""
+    def __init__(self, anchor):
+        self.anchor = anchor
+    
+    def apply(self, entity):
+        return entity.rect.move(self.anchor)
+
+# Baked sprites leave health bars out, they are drawn from solid swatches
+BAKE_QUALITY = SimpleNamespace(draw_glow=True, draw_health_bars=False, animate_bobbing=False)
+BAKE_QUALITY_NO_GLOW = SimpleNamespace(draw_glow=False, draw_health_bars=False, animate_bobbing=False)
+
+def bake_sprites():
+    """Bake every entity visual for the render backends"""
+    def bake_entity(entity, extra_width, quality=BAKE_QUALITY):
+        entity.rect.topleft = (0, 0)
+        size = (entity.rect.width + extra_width, entity.rect.height)
+        return bake(size, (0, 0), lambda surface: entity.draw(surface, BakeCamera((0, 0)), quality))
+    
+    sprites = {}
+    player = Player(0, 0)
+    sprites["player"] = bake(
+        (player.rect.width + 20, player.rect.height), (0, 0),
+        lambda surface: player.draw(surface, BakeCamera((0, 0))))
+    for enemy_type in ("basic", "heavy", "boss"):
+        # Barrel sticks out 10 px past the body
+        sprites[f"enemy_{enemy_type}"] = bake_entity(Enemy(0, 0, enemy_type), 10)
+    for owner in ("player", "enemy"):
+        sprites[f"projectile_{owner}"] = bake_entity(Projectile(0, 0, 1, owner=owner), 0)
+        sprites[f"projectile_{owner}_plain"] = bake_entity(
+            Projectile(0, 0, 1, owner=owner), 0, BAKE_QUALITY_NO_GLOW)
+    for collectible_type in ("health", "extra_life", "score"):
+        sprites[f"collectible_{collectible_type}"] = bake_entity(Collectible(0, 0, collectible_type), 0)
+    for name, color in (("red", RED), ("green", GREEN), ("ground", BROWN)):
+        sprites[name] = solid(color)
+    return sprites
+
+class Game(GameRuntime, PipelinedGame):
     """Main game class"""
+    projectiles = entity_group("projectiles")
+    enemies = entity_group("enemies")
+    collectibles = entity_group("collectibles")
+    entity_types = {
+        "projectiles": ("owner", OWNERS),
+        "enemies": ("enemy_type", ENEMY_TYPES),
+        "collectibles": ("collectible_type", COLLECTIBLE_TYPES),
+    }
+    
     def __init__(self):
         try:
-            # Initialize display
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-            if not self.screen:
-                raise RuntimeError("Failed to create display surface")
-            
-            pygame.display.set_caption("Tank Battle - Side Scrolling")
-            self.clock = pygame.time.Clock()
-            self.running = True
+            # Initialize display and main loop
+            super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, "Tank Battle - Side Scrolling", FPS)
             
             # Game state
             self.state = "menu"  # menu, playing, game_over, level_complete
@@ -410,17 +553,32 @@ class Game:
             self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
             self.projectiles = []
             
-            # Initialize fonts with error handling
-            try:
-                self.font_large = pygame.font.Font(None, 48)
-                self.font_medium = pygame.font.Font(None, 32)
-                self.font_small = pygame.font.Font(None, 24)
-            except Exception as e:
-                print(f"Warning: Could not load fonts, using default: {e}")
-                # Fallback to system default
-                self.font_large = pygame.font.SysFont("arial", 48)
-                self.font_medium = pygame.font.SysFont("arial", 32)
-                self.font_small = pygame.font.SysFont("arial", 24)
+            # Frame time governor for drawing detail
+            self.quality = QualityGovernor(FPS)
+            
+            # HUD is built on first draw so fonts load lazily
+            self.hud = None
+            
+            # Level overview, GAME_MINIMAP=0 hides it
+            self.minimap = None
+            if os.environ.get("GAME_MINIMAP") != "0":
+                self.minimap = Minimap(MINIMAP_SIZE, MINIMAP_POSITION)
+            
+            # Entities queue baked sprites here, blitted one layer at a time
+            self.draw_list = DrawList()
+            self.sprites = None
+            self.add_frame_hook(self.record_frame_time)
+            
+            # Game time runs behind the SDL clock after a rewind
+            self.time_offset = 0
+            self.next_entity_id = 1
+            
+            # Rewind history, enabled with GAME_REWIND=<seconds>, hold BACKSPACE to scrub back
+            self.rewind = None
+            rewind_seconds = os.environ.get("GAME_REWIND")
+            if rewind_seconds:
+                from rewind import RewindBuffer
+                self.rewind = RewindBuffer(float(rewind_seconds), FPS)
             
             self.reset_game()
             
@@ -429,6 +587,27 @@ class Game:
             traceback.print_exc()
             sys.exit(1)
     
+    def load_font(self, size):
+        """Load a font on first use with error handling"""
+        try:
+            return get_font(size)
+        except Exception as e:
+            print(f"Warning: Could not load fonts, using default: {e}")
+            # Fallback to system default
+            return get_font(size, "arial")
+    
+    @property
+    def font_large(self):
+        return self.load_font(48)
+    
+    @property
+    def font_medium(self):
+        return self.load_font(32)
+    
+    @property
+    def font_small(self):
+        return self.load_font(24)
+    
     def load_high_score(self):
         """Load high score from file"""
         try:
@@ -464,42 +643,62 @@ class Game:
             self.current_level = 1
             self.score = 0
             self.player = Player(100, SCREEN_HEIGHT - 135)
-            self.level = Level(self.current_level)
-            self.projectiles = []
+            self.player.schedule_reload(self.scheduler)
+            self.set_level(self.level_loader.take(1, lambda: Level(1)))
             self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
         except Exception as e:
             print(f"Error resetting game: {e}")
             traceback.print_exc()
     
+    def set_level(self, level):
+        """Make level the active level and clear projectiles"""
+        if self.level is not None:
+            self.level_loader.retire((self.level, self.enemies, self.collectibles, self.projectiles))
+        self.level = level
+        self.enemies = []
+        self.collectibles = []
+        self.projectiles = []
+        if self.rewind is not None:
+            self.rewind.clear()
+        self.level_started = time.perf_counter()
+        self.mark_level(f"level {level.level_num}")
+        
+        # Build the next level while this one is played. A Level is only spawn descriptors and
+        # builds in tens of microseconds, but taking it is still cheaper than building inline,
+        # retire() keeps freeing the old entities off this thread, and bigger levels stay hitch-free
+        if level.level_num < 3:
+            next_num = level.level_num + 1
+            self.level_loader.prepare(next_num, lambda: Level(next_num))
+    
     def handle_events(self):
         """Handle pygame events"""
         try:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                
-                elif event.type == pygame.KEYDOWN:
-                    if self.state == "menu":
-                        if event.key == pygame.K_RETURN:
-                            self.state = "playing"
-                            self.reset_game()
-                        elif event.key == pygame.K_ESCAPE:
-                            self.running = False
-                    
-                    elif self.state == "game_over":
-                        if event.key == pygame.K_RETURN:
-                            self.state = "menu"
-                        elif event.key == pygame.K_r:
-                            self.state = "playing"
-                            self.reset_game()
-                    
-                    elif self.state == "level_complete":
-                        if event.key == pygame.K_RETURN:
-                            self.next_level()
+            super().handle_events()
         except Exception as e:
             print(f"Error handling events: {e}")
             # Continue running to avoid crash
     
+    def handle_event(self, event):
+        """Handle a single pygame event"""
+        if event.type == pygame.KEYDOWN:
+            if self.state == "menu":
+                if event.key == pygame.K_RETURN:
+                    self.state = "playing"
+                    self.reset_game()
+                elif event.key == pygame.K_ESCAPE:
+                    self.running = False
+            
+            elif self.state == "game_over":
+                if event.key == pygame.K_RETURN:
+                    self.state = "menu"
+                elif event.key == pygame.K_r:
+                    self.state = "playing"
+                    self.reset_game()
+            
+            elif self.state == "level_complete":
+                if event.key == pygame.K_RETURN:
+                    self.next_level()
+    
     def next_level(self):
         """Advance to next level"""
         self.current_level += 1
@@ -510,45 +709,65 @@ class Game:
                 self.high_score = self.score
                 self.save_high_score()
         else:
-            self.level = Level(self.current_level)
-            self.projectiles = []
+            level_num = self.current_level
+            self.set_level(self.level_loader.take(level_num, lambda: Level(level_num)))
             self.player.rect.x = 100  # Reset player position
             self.state = "playing"
     
+    def read_keys(self):
+        """Key state for this frame"""
+        return pygame.key.get_pressed()
+    
     def update_game(self):
         """Update game logic"""
         if self.state != "playing":
             return
         
-        current_time = pygame.time.get_ticks()
-        keys = pygame.key.get_pressed()
+        current_time = self.ticks() - self.time_offset
+        keys = self.read_keys()
+        
+        if self.rewind is not None and keys[pygame.K_BACKSPACE]:
+            self.rewind_step()
+            return
+        
+        # Run timed events that are due, such as reloads
+        self.scheduler.advance(current_time)
         
         # Update player
-        new_projectiles = self.player.update(keys, current_time)
+        new_projectiles = self.player.update(keys, current_time, self.scheduler)
         self.projectiles.extend(new_projectiles)
         
         # Update camera
         self.camera.update(self.player)
         
+        # Spawn level entities coming into view
+        self.level.spawner.advance(self.camera.camera.right, self.spawn)
+        
         # Update enemies
-        for enemy in self.level.enemies:
-            if enemy.alive:
-                new_projectiles = enemy.update((self.player.rect.x, self.player.rect.y), current_time)
-                self.projectiles.extend(new_projectiles)
+        new_projectiles = self.update_group("enemies", (self.player.rect.x, self.player.rect.y), current_time,
+                                            self.scheduler, self.rng.stream("enemy_ai"))
+        self.projectiles.extend(new_projectiles)
         
         # Update collectibles
-        for collectible in self.level.collectibles:
-            collectible.update()
+        if self.quality.settings().animate_bobbing:
+            self.update_group("collectibles")
         
-        # Update projectiles
-        self.projectiles = [p for p in self.projectiles if p.update()]
+        # Update projectiles, culled to the camera view and the world
+        left = max(-50, self.camera.camera.x - CULL_MARGIN)
+        right = min(self.level.width, self.camera.camera.right + CULL_MARGIN)
+        self.cull_group("projectiles", lambda projectile: projectile.update(left, right))
         
         # Collision detection
         self.check_collisions()
         
+        # Drop destroyed enemies and collected items
+        self.cull_group("enemies", lambda enemy: enemy.alive)
+        self.cull_group("collectibles", lambda collectible: not collectible.collected)
+        
         # Check level completion
-        if all(not enemy.alive for enemy in self.level.enemies):
+        if not self.enemies and self.level.spawner.done:
             self.state = "level_complete"
+            self.log_event(EVENT_LEVEL_COMPLETE, "level", time.perf_counter() - self.level_started)
         
         # Check game over
         if not self.player.alive:
@@ -556,39 +775,150 @@ class Game:
             if self.score > self.high_score:
                 self.high_score = self.score
                 self.save_high_score()
+        
+        if self.rewind is not None and self.state == "playing":
+            self.rewind.record(self.capture_state())
+    
+    def entity_id(self, entity):
+        """Stable id of an entity for rewind history"""
+        entity_id = entity.__dict__.get("rewind_id")
+        if entity_id is None:
+            entity_id = entity.rewind_id = self.next_entity_id
+            self.next_entity_id += 1
+        return entity_id
+    
+    def capture_state(self):
+        """Rows describing the game for the rewind buffer"""
+        camera = self.camera
+        player = self.player
+        entity_id = self.entity_id
+        rows = [
+            (0, KIND_GAME, self.score, camera.camera.x, camera.target_x, self.level.spawner.cursor,
+             self.scheduler.now, 0, 0, 0),
+            (entity_id(player), KIND_PLAYER, player.rect.x, player.rect.y, player.y_velocity,
+             player.on_ground, player.health, player.lives, player.alive, player.last_shot),
+        ]
+        for enemy in self.enemies:
+            rows.append((entity_id(enemy), KIND_ENEMY, enemy.rect.x, enemy.rect.y,
+                         ENEMY_TYPES.index(enemy.enemy_type), enemy.health, enemy.alive,
+                         enemy.direction, enemy.last_shot, 0))
+        for projectile in self.projectiles:
+            rows.append((entity_id(projectile), KIND_PROJECTILE, projectile.rect.x, projectile.rect.y,
+                         projectile.direction, projectile.speed, projectile.damage,
+                         OWNERS.index(projectile.owner), projectile.last_move[0], 0))
+        for collectible in self.collectibles:
+            rows.append((entity_id(collectible), KIND_COLLECTIBLE, collectible.rect.x, collectible.rect.y,
+                         COLLECTIBLE_TYPES.index(collectible.collectible_type), collectible.collected,
+                         collectible.bob_offset, 0, 0, 0))
+        return rows
+    
+    def restore_state(self, rows):
+        """Rebuild the game from rows made by capture_state"""
+        enemies = []
+        projectiles = []
+        collectibles = []
+        now = self.scheduler.now
+        for row_id, kind, a, b, c, d, e, f, g, h in rows:
+            if kind == KIND_GAME:
+                self.score = int(a)
+                self.camera.camera.x = int(b)
+                self.camera.target_x = c
+                self.level.spawner.seek(int(d))
+                now = e
+                continue
+            if kind == KIND_PLAYER:
+                entity = self.player
+                entity.rect.topleft = (int(a), int(b))
+                entity.y_velocity = c
+                entity.on_ground = bool(d)
+                entity.health = int(e)
+                entity.lives = int(f)
+                entity.alive = bool(g)
+                entity.last_shot = h
+            elif kind == KIND_ENEMY:
+                entity = Enemy(int(a), int(b), ENEMY_TYPES[int(c)])
+                entity.health = int(d)
+                entity.alive = bool(e)
+                entity.direction = int(f)
+                entity.last_shot = g
+                enemies.append(entity)
+            elif kind == KIND_PROJECTILE:
+                entity = Projectile(int(a), int(b), int(c), int(d), int(e), OWNERS[int(f)])
+                entity.last_move = (int(g), 0)
+                projectiles.append(entity)
+            else:
+                entity = Collectible(int(a), int(b), COLLECTIBLE_TYPES[int(c)])
+                entity.collected = bool(d)
+                entity.bob_offset = e
+                collectibles.append(entity)
+            entity.rewind_id = int(row_id)
+        self.enemies = enemies
+        self.projectiles = projectiles
+        self.collectibles = collectibles
+        
+        # Continue the game clock from the restored time and re-arm reloads
+        self.time_offset = self.ticks() - now
+        self.scheduler.reset(now)
+        self.player.schedule_reload(self.scheduler)
+        for enemy in enemies:
+            enemy.schedule_reload(self.scheduler)
+    
+    def rewind_step(self):
+        """Scrub one tick back through the rewind history"""
+        rows = self.rewind.step_back()
+        if rows is not None:
+            self.restore_state(rows.tolist())
+    
+    def spawn(self, spawn):
+        """Create a level entity from its spawn descriptor"""
+        if spawn.kind == "enemy":
+            enemy = Enemy(spawn.x, spawn.y, spawn.variant)
+            enemy.schedule_reload(self.scheduler)
+            self.enemies.append(enemy)
+        else:
+            self.collectibles.append(Collectible(spawn.x, spawn.y, spawn.variant))
+    
+    def enemies_remaining(self):
+        """Live enemies plus those still waiting to spawn"""
+        return len(self.enemies) + self.level.spawner.pending("enemy")
     
     def check_collisions(self):
         """Check all collisions"""
         # Projectile vs Enemy collisions
-        for projectile in self.projectiles[:]:
-            if projectile.owner == "player":
-                for enemy in self.level.enemies:
-                    if enemy.alive and projectile.rect.colliderect(enemy.rect):
-                        if enemy.take_damage(projectile.damage):
-                            # Enemy destroyed
-                            score_bonus = 50 if enemy.enemy_type == "basic" else 100
-                            if enemy.enemy_type == "boss":
-                                score_bonus = 500
-                            self.score += score_bonus
-                        self.projectiles.remove(projectile)
-                        break
+        self.collide_group("projectiles", self.enemies, self.on_enemy_hit,
+                           accept=lambda projectile: projectile.owner == "player")
         
         # Projectile vs Player collisions
-        for projectile in self.projectiles[:]:
-            if projectile.owner == "enemy" and projectile.rect.colliderect(self.player.rect):
-                self.player.take_damage(projectile.damage)
-                self.projectiles.remove(projectile)
+        self.collide_group("projectiles", [self.player], self.on_player_hit,
+                           accept=lambda projectile: projectile.owner == "enemy")
         
         # Player vs Collectible collisions
-        for collectible in self.level.collectibles:
-            if not collectible.collected and collectible.rect.colliderect(self.player.rect):
-                collectible.collected = True
-                if collectible.collectible_type == "health":
-                    self.player.heal(collectible.value)
-                elif collectible.collectible_type == "extra_life":
-                    self.player.add_life()
-                else:  # score
-                    self.score += collectible.value
+        self.collect_group("collectibles", self.player.rect, self.on_collect)
+    
+    def on_enemy_hit(self, projectile, enemy):
+        if enemy.take_damage(projectile.damage):
+            # Enemy destroyed
+            score_bonus = 50 if enemy.enemy_type == "basic" else 100
+            if enemy.enemy_type == "boss":
+                score_bonus = 500
+            self.score += score_bonus
+            self.log_event(EVENT_KILL, enemy.enemy_type, score_bonus, enemy.rect.centerx)
+    
+    def on_player_hit(self, projectile, player):
+        lives = player.lives
+        player.take_damage(projectile.damage)
+        self.log_event(EVENT_DAMAGE, "shot", projectile.damage, player.rect.centerx)
+        if player.lives < lives:
+            self.log_event(EVENT_DEATH, "shot", 0, player.rect.centerx)
+    
+    def on_collect(self, collectible):
+        self.log_event(EVENT_PICKUP, collectible.collectible_type, collectible.value, collectible.rect.centerx)
+        if collectible.collectible_type == "health":
+            self.player.heal(collectible.value)
+        elif collectible.collectible_type == "extra_life":
+            self.player.add_life()
+        else:  # score
+            self.score += collectible.value
     
     def draw_menu(self):
         """Draw main menu"""
@@ -681,98 +1011,176 @@ class Game:
         """Draw game screen"""
         self.screen.fill((50, 50, 100))  # Sky color
         
-        # Draw ground
-        ground_rect = pygame.Rect(0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100)
-        pygame.draw.rect(self.screen, BROWN, ground_rect)
-        
-        # Draw game objects
-        self.player.draw(self.screen, self.camera)
-        
-        for enemy in self.level.enemies:
-            enemy.draw(self.screen, self.camera)
-        
-        for collectible in self.level.collectibles:
-            collectible.draw(self.screen, self.camera)
-        
-        for projectile in self.projectiles:
-            projectile.draw(self.screen, self.camera)
+        if self.sprites is None:
+            self.sprites = SpriteSheet(bake_sprites())
+        self.draw_list.clear()
+        self.emit_game(self.draw_list)
+        self.draw_list.flush(self.screen, self.sprites)
         
         # Draw UI
         self.draw_ui()
+        if self.minimap is not None:
+            self.minimap.draw(self.screen, self.sample_minimap(), self.draw_minimap_level)
     
-    def draw_ui(self):
-        """Draw user interface"""
-        # Health bar
-        health_width = 200
-        health_height = 20
+    def create_hud(self):
+        """Create HUD widgets bound to the values they display"""
+        hud = HudLayer()
         health_x = 20
         health_y = 20
         
-        # Health background
-        pygame.draw.rect(self.screen, RED, (health_x, health_y, health_width, health_height))
-        
-        # Health foreground
-        if self.player.alive:
-            health_ratio = self.player.health / self.player.max_health
-            pygame.draw.rect(self.screen, GREEN, (health_x, health_y, health_width * health_ratio, health_height))
+        # Health bar
+        hud.add(BarWidget(self.player_health_ratio, (health_x, health_y), (200, 20), RED, GREEN))
         
         # Health text
-        health_text = self.font_small.render(f"Health: {self.player.health}/{self.player.max_health}", True, WHITE)
-        self.screen.blit(health_text, (health_x, health_y + 25))
+        hud.add(TextWidget(self.font_small, "Health: {}/{}",
+                           lambda: (self.player.health, self.player.max_health),
+                           (health_x, health_y + 25)))
         
         # Lives
-        lives_text = self.font_small.render(f"Lives: {self.player.lives}", True, WHITE)
-        self.screen.blit(lives_text, (health_x, health_y + 50))
+        hud.add(TextWidget(self.font_small, "Lives: {}", lambda: self.player.lives,
+                           (health_x, health_y + 50)))
         
         # Score
-        score_text = self.font_medium.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (SCREEN_WIDTH - 200, 20))
+        hud.add(TextWidget(self.font_medium, "Score: {}", lambda: self.score,
+                           (SCREEN_WIDTH - 200, 20)))
         
         # Level
-        level_text = self.font_medium.render(f"Level: {self.current_level}", True, WHITE)
-        self.screen.blit(level_text, (SCREEN_WIDTH - 200, 50))
+        hud.add(TextWidget(self.font_medium, "Level: {}", lambda: self.current_level,
+                           (SCREEN_WIDTH - 200, 50)))
         
         # Enemies remaining
-        enemies_alive = sum(1 for enemy in self.level.enemies if enemy.alive)
-        enemies_text = self.font_small.render(f"Enemies: {enemies_alive}", True, WHITE)
-        self.screen.blit(enemies_text, (SCREEN_WIDTH - 200, 80))
+        hud.add(TextWidget(self.font_small, "Enemies: {}",
+                           self.enemies_remaining,
+                           (SCREEN_WIDTH - 200, 80)))
+        return hud
     
-    def run(self):
-        """Main game loop"""
-        try:
-            while self.running:
-                try:
-                    self.handle_events()
-                    self.update_game()
-                    
-                    # Draw based on current state
-                    if self.state == "menu":
-                        self.draw_menu()
-                    elif self.state == "playing":
-                        self.draw_game()
-                    elif self.state == "game_over":
-                        self.draw_game_over()
-                    elif self.state == "level_complete":
-                        self.draw_level_complete()
-                    
-                    pygame.display.flip()
-                    self.clock.tick(FPS)
-                    
-                except Exception as e:
-                    print(f"Error in game loop iteration: {e}")
-                    # Try to continue running
-                    continue
-        
-        except KeyboardInterrupt:
-            print("Game interrupted by user")
-        except Exception as e:
-            print(f"Critical error in main game loop: {e}")
-            traceback.print_exc()
-        finally:
-            try:
-                pygame.quit()
-            except Exception as e:
-                print(f"Error during cleanup: {e}")
+    def sample_minimap(self):
+        """Minimap dots for the player, enemies, collectibles and entities yet to spawn"""
+        level = self.level
+        spawner = level.spawner
+        return self.minimap.sample(level.level_num, (level.width, SCREEN_HEIGHT), (
+            # Lazy, Minimap.sample only reads the groups every few frames
+            (spawner.upcoming(), SPAWN_POSITION, minimap_spawn_color),
+            (self.collectibles, RECT_CENTER, YELLOW),
+            (self.enemies, RECT_CENTER, minimap_enemy_color),
+            ((self.player,), RECT_CENTER, WHITE),
+        ))
+    
+    def draw_minimap_level(self, surface, level, scale):
+        """Sky and ground at minimap scale"""
+        width, height = surface.get_size()
+        surface.fill((50, 50, 100))
+        ground_y = int((SCREEN_HEIGHT - 100) * scale[1])
+        pygame.draw.rect(surface, BROWN, (0, ground_y, width, height - ground_y))
+        pygame.draw.rect(surface, GRAY, (0, 0, width, height), 1)
+    
+    def player_health_ratio(self):
+        """Health bar fill, None when the player is dead"""
+        if not self.player.alive:
+            return None
+        return self.player.health / self.player.max_health
+    
+    def emit_game(self, draw_list):
+        """Queue the ground and every visible entity into a draw list"""
+        # Ground
+        draw_list.add(LAYER_BACKGROUND, "ground", 0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100)
+        
+        # A copy, record() may change the tier on the main thread while a pipelined frame is built
+        quality = self.quality.settings()
+        camera_x = self.camera.camera.x
+        
+        self.player.emit(draw_list, camera_x)
+        for group in (self.enemies, self.collectibles, self.projectiles):
+            for entity in group:
+                entity.emit(draw_list, camera_x, quality)
+    
+    def submit_game(self):
+        """Submit the game screen to the render backend as layered sprite batches"""
+        backend = self.backend
+        if backend.atlas is None:
+            backend.load_atlas(bake_sprites())
+        backend.begin((50, 50, 100))  # Sky color
+        self.emit_game(backend.draw_list)
+        
+        # HUD texture is re-uploaded only when the layer recomposes
+        if self.hud is None:
+            self.hud = self.create_hud()
+        self.hud.update()
+        backend.overlay("hud", self.hud.origin, self.hud.compositions, lambda: self.hud.surface)
+        
+        # Re-uploaded only when a dot moved
+        minimap = self.minimap
+        if minimap is not None:
+            minimap.update(self.sample_minimap(), self.draw_minimap_level)
+            backend.overlay("minimap", minimap.position, minimap.version, lambda: minimap.surface)
+    
+    def draw_ui(self):
+        """Draw user interface"""
+        if self.hud is None:
+            self.hud = self.create_hud()
+        self.hud.draw(self.screen)
+    
+    def update(self):
+        self.update_game()
+    
+    def start_pipeline(self):
+        super().start_pipeline()
+        if self.pipeline is not None:
+            # Fonts and sprites are loaded here, the simulation thread only reads them
+            self.hud = self.create_hud()
+            self.sprites = SpriteSheet(bake_sprites())
+    
+    def pipeline_active(self):
+        return self.state == "playing"
+    
+    def simulate_frame(self):
+        """Update and capture what to draw, runs on the simulation thread"""
+        started = time.perf_counter()
+        self.update_game()
+        draw_list = DrawList()
+        self.emit_game(draw_list)
+        minimap = self.sample_minimap() if self.minimap is not None else None
+        return FrameSnapshot(self.scheduler.now, draw_list.freeze(), self.hud.sample(), minimap, started)
+    
+    def render_snapshot(self, snapshot):
+        """Draw a frame captured by simulate_frame"""
+        self.screen.fill((50, 50, 100))  # Sky color
+        flush_layers(self.screen, self.sprites, snapshot.layers)
+        self.hud.draw(self.screen, snapshot.hud)
+        if self.minimap is not None:
+            self.minimap.draw(self.screen, snapshot.minimap, self.draw_minimap_level)
+    
+    def profile_label(self):
+        return f"{self.state} level {self.current_level}"
+    
+    def static_screen(self):
+        """Menus and result screens only change with the state, score and level"""
+        if self.state == "playing":
+            return None
+        return (self.state, self.score, self.high_score, self.current_level)
+    
+    def draw(self):
+        """Draw based on current state"""
+        if self.state == "menu":
+            self.draw_menu()
+        elif self.state == "playing":
+            if self.backend is not None:
+                self.submit_game()
+            else:
+                self.draw_game()
+        elif self.state == "game_over":
+            self.draw_game_over()
+        elif self.state == "level_complete":
+            self.draw_level_complete()
+    
+    def record_frame_time(self, game):
+        """Feed the governor the frame time without the tick delay"""
+        if self.state == "playing":
+            self.quality.record(self.clock.get_rawtime())
+    
+    def handle_frame_error(self, error):
+        print(f"Error in game loop iteration: {error}")
+        # Try to continue running
 
 def main():
     """Main function to start the game"""
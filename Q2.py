@@ -1,10 +1,18 @@
 import pygame
-import random
 import math
+import os
 import sys
+import time
+from operator import attrgetter, methodcaller
 
-# Initialize Pygame
-pygame.init()
+from analytics import EVENT_DAMAGE, EVENT_DEATH, EVENT_KILL, EVENT_LEVEL_COMPLETE, EVENT_PICKUP
+from collision import MaskCache
+from drawlist import (LAYER_BACKGROUND, LAYER_DETAILS, LAYER_ENTITIES, LAYER_HUD, LAYER_PROJECTILES,
+                      bake, solid)
+from minimap import Minimap
+from runtime import GameRuntime, entity_group
+from scheduler import Scheduler
+from startup import get_font
 
 # Constants
 SCREEN_WIDTH = 1024
@@ -26,8 +34,16 @@ YELLOW = (255, 255, 0)
 DARK_GREEN = (0, 100, 0)
 SKY_BLUE = (135, 206, 235)
 
+GET_RECT = methodcaller("get_rect")
+POSITION = attrgetter("x", "y")
+
+# Minimap of the whole level in the top right corner
+MINIMAP_SIZE = (200, 60)
+MINIMAP_POSITION = (SCREEN_WIDTH - MINIMAP_SIZE[0] - 10, 10)
+
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, scheduler):
+        self.scheduler = scheduler
         self.x = x
         self.y = y
         self.width = 40
@@ -42,8 +58,25 @@ class Player:
         self.lives = 3
         self.score = 0
         self.facing_right = True
-        self.shoot_cooldown = 0
-        self.invulnerable = 0
+        self.can_shoot = True
+        self.invulnerable_until = 0
+        
+    @property
+    def invulnerable(self):
+        """Frames of invulnerability left, counted on the scheduler clock"""
+        return max(0, self.invulnerable_until - self.scheduler.now)
+        
+    @invulnerable.setter
+    def invulnerable(self, frames):
+        self.invulnerable_until = self.scheduler.now + frames
+        
+    @property
+    def sprite_name(self):
+        """Baked sprite for the current facing, without the damage flash"""
+        return "player_right" if self.facing_right else "player_left"
+        
+    def reload(self):
+        self.can_shoot = True
         
     def update(self, keys):
         # Handle input
@@ -79,15 +112,10 @@ class Player:
         elif self.x + self.width > 2000:  # Level width
             self.x = 2000 - self.width
             
-        # Update cooldowns
-        if self.shoot_cooldown > 0:
-            self.shoot_cooldown -= 1
-        if self.invulnerable > 0:
-            self.invulnerable -= 1
-            
     def shoot(self):
-        if self.shoot_cooldown <= 0:
-            self.shoot_cooldown = 20
+        if self.can_shoot:
+            self.can_shoot = False
+            self.scheduler.schedule(20, self.reload)
             direction = 1 if self.facing_right else -1
             return Projectile(self.x + self.width//2, self.y + self.height//2, direction)
         return None
@@ -129,9 +157,11 @@ class Projectile:
         self.width = 6
         self.height = 3
         self.damage = 25
+        self.last_move = (0, 0)  # Swept for continuous collision
         
     def update(self):
         self.x += self.speed * self.direction
+        self.last_move = (self.speed * self.direction, 0)
         
     def draw(self, screen, camera_x):
         x = self.x - camera_x
@@ -141,7 +171,8 @@ class Projectile:
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
 class Enemy:
-    def __init__(self, x, y, enemy_type="soldier"):
+    def __init__(self, x, y, enemy_type, scheduler):
+        self.scheduler = scheduler
         self.x = x
         self.y = y
         self.width = 35
@@ -154,10 +185,17 @@ class Enemy:
         self.direction = -1
         self.patrol_range = 150
         self.start_x = x
-        self.shoot_cooldown = 0
+        self.can_shoot = True
         self.alive = True
         
-    def update(self, player):
+    @property
+    def sprite_name(self):
+        return f"enemy_{self.enemy_type}"
+        
+    def reload(self):
+        self.can_shoot = True
+        
+    def update(self, player, rng):
         if not self.alive:
             return None
             
@@ -177,14 +215,13 @@ class Enemy:
         self.x += self.speed * self.direction
         
         # Shoot at player occasionally
-        if dist_to_player < 300 and self.shoot_cooldown <= 0 and random.randint(1, 100) < 3:
-            self.shoot_cooldown = 60
+        if dist_to_player < 300 and self.can_shoot and rng.randint(1, 100) < 3:
+            # Ready again 60 ticks after this one
+            self.can_shoot = False
+            self.scheduler.schedule(61, self.reload)
             direction = 1 if player.x > self.x else -1
             return Projectile(self.x + self.width//2, self.y + self.height//2, direction)
             
-        if self.shoot_cooldown > 0:
-            self.shoot_cooldown -= 1
-            
         return None
         
     def take_damage(self, damage):
@@ -254,26 +291,106 @@ class Collectible:
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Fox Adventure")
-        self.clock = pygame.time.Clock()
-        self.running = True
+def draw_tree(surface, x, y):
+    """Tree whose trunk's top left corner is at (x, y)"""
+    pygame.draw.rect(surface, BROWN, (x, y, 20, 150))
+    pygame.draw.circle(surface, DARK_GREEN, (x + 10, y + 10), 30)
+
+def draw_cactus(surface, x, y):
+    """Cactus whose trunk's top left corner is at (x, y)"""
+    pygame.draw.rect(surface, DARK_GREEN, (x, y, 15, 80))
+    pygame.draw.rect(surface, DARK_GREEN, (x - 10, y + 20, 35, 10))
+
+SCENERY = {"tree": draw_tree, "cactus": draw_cactus}
+
+# Sky color and repeating scenery (name, spacing, parallax, height) per level, any other level is the boss level
+LEVEL_BACKGROUNDS = {
+    1: (SKY_BLUE, "tree", 100, 0.5, 150),  # Forest
+    2: ((255, 218, 185), "cactus", 150, 0.3, 80),  # Desert
+}
+BOSS_SKY = (64, 64, 128)
+
+def level_background(level, level_width, camera_x):
+    """Sky color and the (name, x, y) scenery on screen, drawn by draw_background or submitted as sprites"""
+    if level not in LEVEL_BACKGROUNDS:
+        return BOSS_SKY, []
+    sky, name, spacing, parallax, height = LEVEL_BACKGROUNDS[level]
+    scenery = []
+    for i in range(0, level_width, spacing):
+        x = i - (camera_x * parallax) % spacing
+        if -50 < x < SCREEN_WIDTH + 50:
+            scenery.append((name, x, GROUND_LEVEL - height))
+    return sky, scenery
+
+def bake_sprites():
+    """Bake every entity and scenery visual for the render backends"""
+    def bake_entity(entity, size, anchor):
+        entity.x, entity.y = anchor
+        return bake(size, anchor, lambda surface: entity.draw(surface, 0))
+    
+    sprites = {}
+    # Ears rise 10 px above the fox and the tail sticks out 15-25 px to either side
+    for facing in ("right", "left"):
+        for flash in (False, True):
+            player = Player(0, 0, Scheduler())
+            player.facing_right = facing == "right"
+            player.invulnerable = 5 if flash else 0
+            name = f"player_{facing}_flash" if flash else f"player_{facing}"
+            sprites[name] = bake_entity(player, (player.width + 40, player.height + 10), (15, 10))
+    sprites["projectile"] = bake_entity(Projectile(0, 0, 1), (6, 3), (0, 0))
+    for enemy_type in ("soldier", "boss"):
+        # Heads sit up to 30 px above the body and the weapon pokes out on the right
+        enemy = Enemy(0, 0, enemy_type, Scheduler())
+        enemy.health = enemy.max_health
+        sprites[f"enemy_{enemy_type}"] = bake_entity(enemy, (enemy.width + 5, enemy.height + 30), (0, 30))
+    for item_type in ("health", "life", "score"):
+        sprites[f"collectible_{item_type}"] = bake_entity(Collectible(0, 0, item_type), (20, 21), (0, 0))
+    
+    sprites["tree"] = bake((60, 170), (20, 20), lambda surface: draw_tree(surface, 20, 20))
+    sprites["cactus"] = bake((35, 80), (10, 0), lambda surface: draw_cactus(surface, 10, 0))
+    for name, color in (("red", RED), ("green", GREEN), ("ground", BROWN)):
+        sprites[name] = solid(color)
+    return sprites
+
+def minimap_enemy_color(enemy):
+    return (160, 0, 160) if enemy.enemy_type == "boss" else RED
+
+class Game(GameRuntime):
+    projectiles = entity_group("projectiles")
+    enemy_projectiles = entity_group("enemy_projectiles")
+    enemies = entity_group("enemies")
+    collectibles = entity_group("collectibles")
+    entity_types = {
+        "enemies": ("enemy_type", ("soldier", "boss")),
+        "collectibles": ("item_type", ("health", "life", "score")),
+    }
+    
+    def __init__(self, headless=False):
+        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, "Fox Adventure", FPS, headless)
         self.game_state = "menu"
         self.current_level = 1
         self.camera_x = 0
         self.level_width = 2000
         
         # Initialize empty game objects
-        self.player = Player(100, GROUND_LEVEL - 50)
+        self.player = Player(100, GROUND_LEVEL - 50, self.scheduler)
         self.projectiles = []
         self.enemy_projectiles = []
         self.enemies = []
         self.collectibles = []
         
+        # Pixel-accurate collision against the baked sprites, enabled with GAME_PIXEL_COLLISION=1
+        self.masks = None
+        if os.environ.get("GAME_PIXEL_COLLISION"):
+            self.masks = MaskCache(bake_sprites())
+        
+        # Level overview, GAME_MINIMAP=0 hides it
+        self.minimap = None
+        if not headless and os.environ.get("GAME_MINIMAP") != "0":
+            self.minimap = Minimap(MINIMAP_SIZE, MINIMAP_POSITION)
+        
     def reset_game(self):
-        self.player = Player(100, GROUND_LEVEL - 50)
+        self.player = Player(100, GROUND_LEVEL - 50, self.scheduler)
         self.projectiles = []
         self.enemy_projectiles = []
         self.enemies = []
@@ -283,39 +400,55 @@ class Game:
         self.load_level(self.current_level)
         
     def load_level(self, level):
-        self.enemies.clear()
-        self.collectibles.clear()
-        self.projectiles.clear()
-        self.enemy_projectiles.clear()
+        # Looked up here rather than in the build, a reseed may replace the
+        # stream before a preload runs
+        items = self.rng.stream("level_items")
+        enemies, collectibles = self.level_loader.take(level, lambda: self.build_level(level, items))
+        self.level_loader.retire((self.enemies, self.collectibles, self.projectiles, self.enemy_projectiles))
+        self.enemies = enemies
+        self.collectibles = collectibles
+        self.projectiles = []
+        self.enemy_projectiles = []
+        self.level_started = time.perf_counter()
+        self.mark_level(f"level {level}")
         
+        # Build the next level while this one is played
+        if level < 3:
+            self.level_loader.prepare(level + 1, lambda: self.build_level(level + 1, items))
+        
+    def build_level(self, level, items):
+        """Enemies and collectibles for a level, safe to run on the preload thread"""
+        enemies = []
+        collectibles = []
         if level == 1:
             # Level 1: Forest
             for i in range(5):
-                self.enemies.append(Enemy(300 + i * 200, GROUND_LEVEL - 45, "soldier"))
+                enemies.append(Enemy(300 + i * 200, GROUND_LEVEL - 45, "soldier", self.scheduler))
             for i in range(8):
-                x = random.randint(200, self.level_width - 200)
-                y = random.randint(GROUND_LEVEL - 200, GROUND_LEVEL - 50)
-                item_type = random.choice(["health", "score", "score", "score"])
-                self.collectibles.append(Collectible(x, y, item_type))
+                x = items.randint(200, self.level_width - 200)
+                y = items.randint(GROUND_LEVEL - 200, GROUND_LEVEL - 50)
+                item_type = items.choice(["health", "score", "score", "score"])
+                collectibles.append(Collectible(x, y, item_type))
         elif level == 2:
             # Level 2: Desert
             for i in range(7):
-                self.enemies.append(Enemy(250 + i * 180, GROUND_LEVEL - 45, "soldier"))
+                enemies.append(Enemy(250 + i * 180, GROUND_LEVEL - 45, "soldier", self.scheduler))
             for i in range(10):
-                x = random.randint(200, self.level_width - 200)
-                y = random.randint(GROUND_LEVEL - 200, GROUND_LEVEL - 50)
-                item_type = random.choice(["health", "life", "score", "score"])
-                self.collectibles.append(Collectible(x, y, item_type))
+                x = items.randint(200, self.level_width - 200)
+                y = items.randint(GROUND_LEVEL - 200, GROUND_LEVEL - 50)
+                item_type = items.choice(["health", "life", "score", "score"])
+                collectibles.append(Collectible(x, y, item_type))
         else:
             # Level 3: Final boss level
-            self.enemies.append(Enemy(self.level_width - 300, GROUND_LEVEL - 45, "boss"))
+            enemies.append(Enemy(self.level_width - 300, GROUND_LEVEL - 45, "boss", self.scheduler))
             for i in range(3):
-                self.enemies.append(Enemy(400 + i * 200, GROUND_LEVEL - 45, "soldier"))
+                enemies.append(Enemy(400 + i * 200, GROUND_LEVEL - 45, "soldier", self.scheduler))
             for i in range(12):
-                x = random.randint(200, self.level_width - 400)
-                y = random.randint(GROUND_LEVEL - 200, GROUND_LEVEL - 50)
-                item_type = random.choice(["health", "life", "score"])
-                self.collectibles.append(Collectible(x, y, item_type))
+                x = items.randint(200, self.level_width - 400)
+                y = items.randint(GROUND_LEVEL - 200, GROUND_LEVEL - 50)
+                item_type = items.choice(["health", "life", "score"])
+                collectibles.append(Collectible(x, y, item_type))
+        return enemies, collectibles
                 
     def update_camera(self):
         # Smooth camera following
@@ -326,46 +459,97 @@ class Game:
         self.camera_x = max(0, min(self.camera_x, self.level_width - SCREEN_WIDTH))
         
     def handle_collisions(self):
+        if self.masks is not None:
+            self.handle_pixel_collisions()
+            return
         player_rect = self.player.get_rect()
         
         # Player projectiles vs enemies
-        for projectile in self.projectiles[:]:
-            proj_rect = projectile.get_rect()
-            for enemy in self.enemies:
-                if enemy.alive and proj_rect.colliderect(enemy.get_rect()):
-                    enemy.take_damage(projectile.damage)
-                    if projectile in self.projectiles:
-                        self.projectiles.remove(projectile)
-                    if not enemy.alive:
-                        self.player.score += 100
-                    break
+        self.collide_group("projectiles", self.enemies, self.on_enemy_hit, GET_RECT)
                     
         # Enemy projectiles vs player
-        for projectile in self.enemy_projectiles[:]:
-            if projectile.get_rect().colliderect(player_rect):
-                self.player.take_damage(15)
-                self.enemy_projectiles.remove(projectile)
+        self.collide_group("enemy_projectiles", [self.player], self.on_player_hit, GET_RECT)
                 
         # Player vs enemies
         for enemy in self.enemies:
             if enemy.alive and player_rect.colliderect(enemy.get_rect()):
-                self.player.take_damage(enemy.damage)
+                self.damage_player(enemy.damage, enemy.enemy_type)
                 
         # Player vs collectibles
-        for collectible in self.collectibles:
-            if not collectible.collected and player_rect.colliderect(collectible.get_rect()):
-                collectible.collected = True
-                if collectible.item_type == "health":
-                    self.player.health = min(self.player.max_health, self.player.health + 25)
-                elif collectible.item_type == "life":
-                    self.player.lives += 1
-                else:  # score
-                    self.player.score += 50
+        self.collect_group("collectibles", player_rect, self.on_collect, GET_RECT)
+        
+    def handle_pixel_collisions(self):
+        """handle_collisions using sprite masks for the fox and enemies.
+        
+        Boxes around each sprite's visible pixels are tested first, masks
+        are only compared for pairs whose boxes overlap.
+        """
+        masks = self.masks
+        player = self.player
+        player_rect = masks.bounds(player.sprite_name, player.x, player.y)
+        
+        # Projectiles are plain boxes, their swept path is tested against the target's mask
+        self.collide_group("projectiles", self.enemies, self.on_enemy_hit, self.collision_rect,
+                           refine=self.mask_touches)
+        self.collide_group("enemy_projectiles", [player], self.on_player_hit, self.collision_rect,
+                           refine=self.mask_touches)
+        
+        for enemy in self.enemies:
+            if (enemy.alive and player_rect.colliderect(masks.bounds(enemy.sprite_name, enemy.x, enemy.y))
+                    and masks.overlap(player.sprite_name, player.x, player.y, enemy.sprite_name, enemy.x, enemy.y)):
+                self.damage_player(enemy.damage, enemy.enemy_type)
+                
+        # Pickups stay generous
+        self.collect_group("collectibles", player.get_rect(), self.on_collect, GET_RECT)
+        
+    def collision_rect(self, entity):
+        """Visible sprite bounds for masked entities, the plain rect for projectiles"""
+        if isinstance(entity, Projectile):
+            return entity.get_rect()
+        return self.masks.bounds(entity.sprite_name, entity.x, entity.y)
+        
+    def mask_touches(self, target, path):
+        return self.masks.overlap_rect(target.sprite_name, target.x, target.y, path)
+        
+    def on_enemy_hit(self, projectile, enemy):
+        enemy.take_damage(projectile.damage)
+        if not enemy.alive:
+            self.player.score += 100
+            self.log_event(EVENT_KILL, enemy.enemy_type, 100, enemy.x)
+            
+    def on_player_hit(self, projectile, player):
+        self.damage_player(15, "shot")
+        
+    def damage_player(self, damage, source):
+        """Damage the fox and log what it actually lost, invulnerability can absorb the hit"""
+        player = self.player
+        health = player.health
+        lives = player.lives
+        player.take_damage(damage)
+        if player.health != health or player.lives != lives:
+            self.log_event(EVENT_DAMAGE, source, damage, player.x)
+            if player.lives < lives:
+                self.log_event(EVENT_DEATH, source, 0, player.x)
+        
+    def on_collect(self, collectible):
+        player = self.player
+        if collectible.item_type == "health":
+            # Logged as the health actually gained, less than 25 near full health
+            amount = min(player.max_health, player.health + 25) - player.health
+            player.health += amount
+        elif collectible.item_type == "life":
+            amount = 1
+            player.lives += 1
+        else:  # score
+            amount = 50
+            player.score += 50
+        self.log_event(EVENT_PICKUP, collectible.item_type, amount, collectible.x)
                     
     def check_level_complete(self):
         # Check if all enemies are defeated
         alive_enemies = [e for e in self.enemies if e.alive]
         if not alive_enemies:
+            self.log_event(EVENT_LEVEL_COMPLETE, "level", time.perf_counter() - self.level_started)
             if self.current_level < 3:
                 self.current_level += 1
                 self.load_level(self.current_level)
@@ -381,181 +565,258 @@ class Game:
         health_ratio = self.player.health / self.player.max_health
         pygame.draw.rect(self.screen, GREEN, (20, 20, 200 * health_ratio, 20))
         
+        self.draw_hud_text(self.screen)
+        
+    def draw_hud_text(self, screen):
         # Lives
-        font = pygame.font.Font(None, 36)
+        font = get_font(36)
         lives_text = font.render(f"Lives: {self.player.lives}", True, WHITE)
-        self.screen.blit(lives_text, (20, 50))
+        screen.blit(lives_text, (20, 50))
         
         # Score
         score_text = font.render(f"Score: {self.player.score}", True, WHITE)
-        self.screen.blit(score_text, (20, 80))
+        screen.blit(score_text, (20, 80))
         
         # Level
         level_text = font.render(f"Level: {self.current_level}", True, WHITE)
-        self.screen.blit(level_text, (20, 110))
+        screen.blit(level_text, (20, 110))
         
     def draw_background(self):
-        if self.current_level == 1:
-            # Forest background
-            self.screen.fill(SKY_BLUE)
-            # Trees
-            for i in range(0, self.level_width, 100):
-                x = i - (self.camera_x * 0.5) % 100
-                if -50 < x < SCREEN_WIDTH + 50:
-                    pygame.draw.rect(self.screen, BROWN, (x, GROUND_LEVEL - 150, 20, 150))
-                    pygame.draw.circle(self.screen, DARK_GREEN, (x + 10, GROUND_LEVEL - 140), 30)
-        elif self.current_level == 2:
-            # Desert background
-            self.screen.fill((255, 218, 185))
-            # Cacti
-            for i in range(0, self.level_width, 150):
-                x = i - (self.camera_x * 0.3) % 150
-                if -50 < x < SCREEN_WIDTH + 50:
-                    pygame.draw.rect(self.screen, DARK_GREEN, (x, GROUND_LEVEL - 80, 15, 80))
-                    pygame.draw.rect(self.screen, DARK_GREEN, (x - 10, GROUND_LEVEL - 60, 35, 10))
-        else:
-            # Boss level
-            self.screen.fill((64, 64, 128))
+        sky, scenery = level_background(self.current_level, self.level_width, self.camera_x)
+        self.screen.fill(sky)
+        for name, x, y in scenery:
+            SCENERY[name](self.screen, x, y)
             
         # Ground
         pygame.draw.rect(self.screen, BROWN, (0, GROUND_LEVEL, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_LEVEL))
         
-    def run(self):
-        try:
-            while self.running:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                    elif event.type == pygame.KEYDOWN:
-                        if self.game_state == "menu":
-                            if event.key == pygame.K_RETURN:
-                                self.game_state = "playing"
-                                self.reset_game()
-                        elif self.game_state == "playing":
-                            if event.key == pygame.K_x or event.key == pygame.K_LCTRL:
-                                projectile = self.player.shoot()
-                                if projectile:
-                                    self.projectiles.append(projectile)
-                        elif self.game_state in ["game_over", "victory"]:
-                            if event.key == pygame.K_RETURN:
-                                self.reset_game()
-                                self.game_state = "playing"
-                            elif event.key == pygame.K_ESCAPE:
-                                self.game_state = "menu"
-                                
-                if self.game_state == "menu":
-                    self.screen.fill(BLACK)
-                    font = pygame.font.Font(None, 72)
-                    title = font.render("FOX ADVENTURE", True, ORANGE)
-                    self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 200))
-                    
-                    font = pygame.font.Font(None, 36)
-                    instructions = [
-                        "Arrow Keys / WASD to Move",
-                        "Space / Up to Jump",
-                        "X / Ctrl to Shoot",
-                        "",
-                        "Press ENTER to Start"
-                    ]
-                    for i, instruction in enumerate(instructions):
-                        text = font.render(instruction, True, WHITE)
-                        self.screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, 350 + i * 40))
-                        
-                elif self.game_state == "playing":
-                    keys = pygame.key.get_pressed()
-                    
-                    # Update
-                    self.player.update(keys)
-                    self.update_camera()
-                    
-                    # Update projectiles
-                    for projectile in self.projectiles[:]:
-                        projectile.update()
-                        if projectile.x < 0 or projectile.x > self.level_width:
-                            self.projectiles.remove(projectile)
-                            
-                    for projectile in self.enemy_projectiles[:]:
-                        projectile.update()
-                        if projectile.x < 0 or projectile.x > self.level_width:
-                            self.enemy_projectiles.remove(projectile)
-                    
-                    # Update enemies
-                    for enemy in self.enemies:
-                        enemy_projectile = enemy.update(self.player)
-                        if enemy_projectile:
-                            self.enemy_projectiles.append(enemy_projectile)
-                            
-                    # Update collectibles
-                    for collectible in self.collectibles:
-                        collectible.update()
-                    
-                    # Handle collisions
-                    self.handle_collisions()
-                    
-                    # Check level completion
-                    self.check_level_complete()
-                    
-                    # Check game over
-                    if self.player.lives <= 0:
-                        self.game_state = "game_over"
-                    
-                    # Draw
-                    self.draw_background()
-                    
-                    self.player.draw(self.screen, self.camera_x)
-                    
-                    for projectile in self.projectiles:
-                        projectile.draw(self.screen, self.camera_x)
-                        
-                    for projectile in self.enemy_projectiles:
-                        projectile.draw(self.screen, self.camera_x)
-                    
-                    for enemy in self.enemies:
-                        enemy.draw(self.screen, self.camera_x)
-                        
-                    for collectible in self.collectibles:
-                        collectible.draw(self.screen, self.camera_x)
-                    
-                    self.draw_hud()
-                    
-                elif self.game_state == "game_over":
-                    self.screen.fill(BLACK)
-                    font = pygame.font.Font(None, 72)
-                    title = font.render("GAME OVER", True, RED)
-                    self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 250))
-                    
-                    font = pygame.font.Font(None, 36)
-                    score_text = font.render(f"Final Score: {self.player.score}", True, WHITE)
-                    self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 350))
-                    
-                    restart_text = font.render("Press ENTER to Restart or ESC for Menu", True, WHITE)
-                    self.screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, 450))
-                    
-                elif self.game_state == "victory":
-                    self.screen.fill(BLACK)
-                    font = pygame.font.Font(None, 72)
-                    title = font.render("VICTORY!", True, GREEN)
-                    self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 200))
-                    
-                    font = pygame.font.Font(None, 48)
-                    congrats = font.render("You defeated all enemies!", True, WHITE)
-                    self.screen.blit(congrats, (SCREEN_WIDTH//2 - congrats.get_width()//2, 300))
-                    
-                    font = pygame.font.Font(None, 36)
-                    score_text = font.render(f"Final Score: {self.player.score}", True, WHITE)
-                    self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 380))
+    def in_level(self, projectile):
+        return 0 <= projectile.x <= self.level_width
+        
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if self.game_state == "menu":
+                if event.key == pygame.K_RETURN:
+                    self.game_state = "playing"
+                    self.reset_game()
+            elif self.game_state == "playing":
+                if event.key == pygame.K_x or event.key == pygame.K_LCTRL:
+                    projectile = self.player.shoot()
+                    if projectile:
+                        self.projectiles.append(projectile)
+            elif self.game_state in ["game_over", "victory"]:
+                if event.key == pygame.K_RETURN:
+                    self.reset_game()
+                    self.game_state = "playing"
+                elif event.key == pygame.K_ESCAPE:
+                    self.game_state = "menu"
                     
-                    restart_text = font.render("Press ENTER to Play Again or ESC for Menu", True, WHITE)
-                    self.screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, 450))
+    def read_keys(self):
+        """Key state for this tick, replaced by the autopilot when soak testing"""
+        return pygame.key.get_pressed()
+        
+    def update(self):
+        if self.game_state != "playing":
+            return
+            
+        keys = self.read_keys()
+        
+        # Run timed events that are due this tick, such as reloads
+        self.scheduler.tick()
+        
+        # Update
+        self.player.update(keys)
+        self.update_camera()
+        
+        # Update projectiles
+        self.update_group("projectiles")
+        self.cull_group("projectiles", self.in_level)
+        
+        self.update_group("enemy_projectiles")
+        self.cull_group("enemy_projectiles", self.in_level)
+        
+        # Update enemies
+        self.enemy_projectiles.extend(self.update_group("enemies", self.player, self.rng.stream("enemy_fire")))
                 
-                pygame.display.flip()
-                self.clock.tick(FPS)
+        # Update collectibles
+        self.update_group("collectibles")
+        
+        # Handle collisions
+        self.handle_collisions()
+        
+        # Check level completion
+        self.check_level_complete()
+        
+        # Check game over
+        if self.player.lives <= 0:
+            self.game_state = "game_over"
+            
+    def profile_label(self):
+        return f"{self.game_state} level {self.current_level}"
+        
+    def static_screen(self):
+        if self.game_state == "playing":
+            return None
+        return (self.game_state, self.player.score)
+        
+    def draw(self):
+        if self.game_state == "menu":
+            self.draw_menu()
+        elif self.game_state == "playing":
+            if self.backend is not None:
+                self.submit_game()
+            else:
+                self.draw_game()
+        elif self.game_state == "game_over":
+            self.draw_game_over()
+        elif self.game_state == "victory":
+            self.draw_victory()
+            
+    def draw_menu(self):
+        self.screen.fill(BLACK)
+        font = get_font(72)
+        title = font.render("FOX ADVENTURE", True, ORANGE)
+        self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 200))
+        
+        font = get_font(36)
+        instructions = [
+            "Arrow Keys / WASD to Move",
+            "Space / Up to Jump",
+            "X / Ctrl to Shoot",
+            "",
+            "Press ENTER to Start"
+        ]
+        for i, instruction in enumerate(instructions):
+            text = font.render(instruction, True, WHITE)
+            self.screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, 350 + i * 40))
+            
+    def draw_game(self):
+        self.draw_background()
+        
+        self.player.draw(self.screen, self.camera_x)
+        
+        self.draw_group("projectiles", self.screen, self.camera_x)
+        self.draw_group("enemy_projectiles", self.screen, self.camera_x)
+        self.draw_group("enemies", self.screen, self.camera_x)
+        self.draw_group("collectibles", self.screen, self.camera_x)
+        
+        self.draw_hud()
+        if self.minimap is not None:
+            self.minimap.draw(self.screen, self.sample_minimap(), self.draw_minimap_level)
+        
+    def sample_minimap(self):
+        """Minimap dots for the fox, live enemies and collectibles left"""
+        return self.minimap.sample(self.current_level, (self.level_width, SCREEN_HEIGHT), (
+            ((c for c in self.collectibles if not c.collected), POSITION, YELLOW),
+            ((e for e in self.enemies if e.alive), POSITION, minimap_enemy_color),
+            ((self.player,), POSITION, WHITE),
+        ))
+        
+    def draw_minimap_level(self, surface, level, scale):
+        """Level background and ground at minimap scale"""
+        width, height = surface.get_size()
+        if level == 1:
+            surface.fill(SKY_BLUE)
+        elif level == 2:
+            surface.fill((255, 218, 185))
+        else:
+            surface.fill((64, 64, 128))
+        ground_y = int(GROUND_LEVEL * scale[1])
+        pygame.draw.rect(surface, BROWN, (0, ground_y, width, height - ground_y))
+        pygame.draw.rect(surface, GRAY, (0, 0, width, height), 1)
+        
+    def submit_game(self):
+        """Submit the game screen to the render backend as layered sprite batches"""
+        backend = self.backend
+        if backend.atlas is None:
+            backend.load_atlas(bake_sprites())
+        camera_x = self.camera_x
+        
+        # Background
+        sky, scenery = level_background(self.current_level, self.level_width, camera_x)
+        backend.begin(sky)
+        for name, x, y in scenery:
+            backend.submit(LAYER_BACKGROUND, name, x, y)
+        backend.submit(LAYER_BACKGROUND, "ground", 0, GROUND_LEVEL, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_LEVEL)
+        
+        player = self.player
+        flash = "" if player.invulnerable % 10 < 5 else "_flash"
+        backend.submit(LAYER_ENTITIES, player.sprite_name + flash, player.x - camera_x, player.y)
+        
+        for projectile in self.projectiles:
+            backend.submit(LAYER_PROJECTILES, "projectile", projectile.x - camera_x, projectile.y)
+        for projectile in self.enemy_projectiles:
+            backend.submit(LAYER_PROJECTILES, "projectile", projectile.x - camera_x, projectile.y)
+            
+        for enemy in self.enemies:
+            if not enemy.alive:
+                continue
+            x = enemy.x - camera_x
+            backend.submit(LAYER_ENTITIES, enemy.sprite_name, x, enemy.y)
+            if enemy.health < enemy.max_health:
+                backend.submit(LAYER_DETAILS, "red", x, enemy.y - 20, 30, 4)
+                backend.submit(LAYER_DETAILS, "green", x, enemy.y - 20,
+                               int(30 * enemy.health / enemy.max_health), 4)
                 
-        except Exception as e:
-            print(f"Error occurred: {e}")
-        finally:
-            pygame.quit()
-            sys.exit()
+        for collectible in self.collectibles:
+            if not collectible.collected:
+                y = collectible.y + math.sin(collectible.bob_offset) * 3
+                backend.submit(LAYER_ENTITIES, f"collectible_{collectible.item_type}",
+                               collectible.x - camera_x, y)
+        
+        # HUD
+        backend.submit(LAYER_HUD, "red", 20, 20, 200, 20)
+        backend.submit(LAYER_HUD, "green", 20, 20, int(200 * self.player.health / self.player.max_health), 20)
+        backend.overlay("hud", (0, 0), (player.lives, player.score, self.current_level), self.render_hud_text)
+        
+        # Re-uploaded only when a dot moved
+        minimap = self.minimap
+        if minimap is not None:
+            minimap.update(self.sample_minimap(), self.draw_minimap_level)
+            backend.overlay("minimap", minimap.position, minimap.version, lambda: minimap.surface)
+        
+    def render_hud_text(self):
+        surface = pygame.Surface((300, 150), pygame.SRCALPHA)
+        self.draw_hud_text(surface)
+        return surface
+        
+    def draw_game_over(self):
+        self.screen.fill(BLACK)
+        font = get_font(72)
+        title = font.render("GAME OVER", True, RED)
+        self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 250))
+        
+        font = get_font(36)
+        score_text = font.render(f"Final Score: {self.player.score}", True, WHITE)
+        self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 350))
+        
+        restart_text = font.render("Press ENTER to Restart or ESC for Menu", True, WHITE)
+        self.screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, 450))
+        
+    def draw_victory(self):
+        self.screen.fill(BLACK)
+        font = get_font(72)
+        title = font.render("VICTORY!", True, GREEN)
+        self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 200))
+        
+        font = get_font(48)
+        congrats = font.render("You defeated all enemies!", True, WHITE)
+        self.screen.blit(congrats, (SCREEN_WIDTH//2 - congrats.get_width()//2, 300))
+        
+        font = get_font(36)
+        score_text = font.render(f"Final Score: {self.player.score}", True, WHITE)
+        self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 380))
+        
+        restart_text = font.render("Press ENTER to Play Again or ESC for Menu", True, WHITE)
+        self.screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, 450))
+        
+    def handle_frame_error(self, error):
+        print(f"Error occurred: {error}")
+        self.running = False
+        
+    def shutdown(self):
+        super().shutdown()
+        sys.exit()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,197 @@
+import glob
+import os
+import threading
+import time
+from array import array
+from collections import Counter
+
+import numpy as np
+
+# Event types
+EVENT_KILL = 0
+EVENT_PICKUP = 1
+EVENT_DAMAGE = 2
+EVENT_DEATH = 3
+EVENT_LEVEL_COMPLETE = 4
+
+EVENT_NAMES = {
+    EVENT_KILL: "kill",
+    EVENT_PICKUP: "pickup",
+    EVENT_DAMAGE: "damage",
+    EVENT_DEATH: "death",
+    EVENT_LEVEL_COMPLETE: "level_complete",
+}
+
+# Record schema, one array per column. kind is a code into the session's
+# kinds vocabulary (enemy type, item type, damage source), value holds the
+# damage amount or level time and x the player or entity position.
+COLUMNS = (("time", "d"), ("event", "B"), ("level", "B"), ("kind", "H"), ("value", "f"), ("x", "f"))
+DTYPES = {"d": np.float64, "B": np.uint8, "H": np.uint16, "f": np.float32}
+
+def new_buffers():
+    return [array(typecode) for _name, typecode in COLUMNS]
+
+class AnalyticsLog:
+    """Appends gameplay events to columnar buffers, a background thread writes them out.
+
+    Appending only takes an uncontended lock and six array appends. The
+    writer thread swaps the buffers out every interval seconds, or sooner
+    once chunk_rows records are waiting, and saves each batch as one
+    compressed .npz chunk in the session directory.
+    """
+    def __init__(self, directory, chunk_rows=4096, interval=5.0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.interval = interval
+        self.buffers = new_buffers()
+        self.kinds = {}  # Kind name -> code, codes are assigned in order
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = False
+        self.chunks = 0
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.flush_loop, name="analytics", daemon=True)
+
+    @classmethod
+    def from_environment(cls, game_name, variable="GAME_ANALYTICS"):
+        """Create a log when the variable is set, its value is the directory for sessions"""
+        value = os.environ.get(variable)
+        if not value:
+            return None
+        session = f"{game_name}-{time.strftime('%Y%m%d-%H%M%S')}"
+        try:
+            return cls(os.path.join(value, session))
+        except OSError as e:
+            print(f"Warning: Could not create analytics directory: {e}")
+            return None
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        """Write out everything still buffered"""
+        self.stopping = True
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+
+    def append(self, event, level, kind, value=0.0, x=0.0):
+        seconds = time.perf_counter() - self.started
+        with self.lock:
+            code = self.kinds.get(kind)
+            if code is None:
+                code = self.kinds[kind] = len(self.kinds)
+            time_column, event_column, level_column, kind_column, value_column, x_column = self.buffers
+            time_column.append(seconds)
+            event_column.append(event)
+            level_column.append(level)
+            kind_column.append(code)
+            value_column.append(value)
+            x_column.append(x)
+            rows = len(time_column)
+        if rows >= self.chunk_rows:
+            self.wake.set()
+
+    def flush_loop(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            # Read before flushing, rows appended during a flush need one more pass
+            stopping = self.stopping
+            self.flush()
+            if stopping:
+                return
+
+    def flush(self):
+        with self.lock:
+            buffers, self.buffers = self.buffers, new_buffers()
+            kinds = list(self.kinds)
+        if not buffers[0]:
+            return
+        columns = {name: np.frombuffer(buffer, DTYPES[typecode])
+                   for (name, typecode), buffer in zip(COLUMNS, buffers)}
+        path = os.path.join(self.directory, f"chunk-{self.chunks:06d}.npz")
+        temporary = f"{path}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                np.savez_compressed(f, kinds=np.array(kinds, dtype=str), **columns)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Warning: Could not write analytics chunk: {e}")
+            return
+        self.chunks += 1
+
+class AnalyticsReader:
+    """A session's records as memory-mapped columns.
+
+    Compressed chunks cannot be mapped, so on first load they are unpacked
+    once into one .npy file per column under columns/. Later loads map
+    those files directly, unpacking again only when new chunks appeared.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        chunks = sorted(glob.glob(os.path.join(directory, "chunk-*.npz")))
+        cache = os.path.join(directory, "columns")
+        manifest = os.path.join(cache, "chunks.txt")
+        names = "\n".join(os.path.basename(path) for path in chunks)
+        current = None
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                current = f.read()
+        if current != names:
+            self.unpack(chunks, cache, manifest, names)
+        self.columns = {name: np.load(os.path.join(cache, f"{name}.npy"), mmap_mode="r")
+                        for name, _typecode in COLUMNS}
+        self.kinds = np.load(os.path.join(cache, "kinds.npy")).tolist()
+
+    def unpack(self, chunks, cache, manifest, names):
+        os.makedirs(cache, exist_ok=True)
+        loaded = [np.load(path) for path in chunks]
+        rows = sum(len(chunk["time"]) for chunk in loaded)
+        for name, typecode in COLUMNS:
+            column = np.lib.format.open_memmap(os.path.join(cache, f"{name}.npy"), "w+",
+                                               DTYPES[typecode], (rows,))
+            start = 0
+            for chunk in loaded:
+                values = chunk[name]
+                column[start:start + len(values)] = values
+                start += len(values)
+            column.flush()
+            del column
+        # Codes only grow, the last chunk's vocabulary covers every earlier one
+        kinds = loaded[-1]["kinds"] if loaded else np.array([], dtype=str)
+        np.save(os.path.join(cache, "kinds.npy"), kinds)
+        with open(manifest, "w") as f:
+            f.write(names)
+
+    def __len__(self):
+        return len(self.columns["time"])
+
+    def select(self, event):
+        return self.columns["event"] == event
+
+    def count_by_kind(self, event):
+        """Counter of kind name -> records of an event type"""
+        codes = np.bincount(self.columns["kind"][self.select(event)], minlength=len(self.kinds))
+        return Counter({self.kinds[code]: int(count) for code, count in enumerate(codes) if count})
+
+    def kills_by_type(self):
+        return self.count_by_kind(EVENT_KILL)
+
+    def pickups_by_type(self):
+        return self.count_by_kind(EVENT_PICKUP)
+
+    def damage_by_source(self):
+        """Counter of damage source -> total damage taken"""
+        mask = self.select(EVENT_DAMAGE)
+        totals = np.bincount(self.columns["kind"][mask], self.columns["value"][mask], len(self.kinds))
+        return Counter({self.kinds[code]: float(total) for code, total in enumerate(totals) if total})
+
+    def deaths(self):
+        return int(self.select(EVENT_DEATH).sum())
+
+    def level_times(self):
+        """(level, seconds) for every completed level, in order"""
+        mask = self.select(EVENT_LEVEL_COMPLETE)
+        return list(zip(self.columns["level"][mask].tolist(), self.columns["value"][mask].tolist()))
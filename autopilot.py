@@ -0,0 +1,93 @@
+import pygame
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed() holding a set of pressed keys"""
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class Autopilot:
+    """Scripted Fox Adventure player: hunts enemies, shoots, jumps shots and grabs items.
+
+    Install with game.read_keys = autopilot.read_keys, the game then asks
+    the autopilot for its key state once per tick.
+    """
+    def __init__(self, game, shoot_range=280, dodge_range=70, item_patience=120):
+        self.game = game
+        self.shoot_range = shoot_range
+        self.dodge_range = dodge_range  # Jump incoming shots this close
+        self.item_patience = item_patience  # Ticks spent on one item before giving up on it
+        self.shots = 0
+        self.item = None
+        self.item_ticks = 0
+        self.ignored = set()  # Items out of reach, cleared each level
+        self.level = None
+
+    def read_keys(self):
+        game = self.game
+        player = game.player
+        center = player.x + player.width / 2
+        pressed = []
+
+        if game.current_level != self.level:
+            self.level = game.current_level
+            self.ignored.clear()
+        enemy = self.nearest(center, [e for e in game.enemies if e.alive])
+        item = self.choose_item(center)
+
+        if enemy is not None:
+            offset = enemy.x + enemy.width / 2 - center
+            toward = pygame.K_RIGHT if offset > 0 else pygame.K_LEFT
+            if abs(offset) < self.shoot_range:
+                # Stand and fire, turning first if needed
+                if player.facing_right != (offset > 0):
+                    pressed.append(toward)
+                else:
+                    self.shoot()
+            elif item is not None and abs(item.x - center) < abs(offset) - self.shoot_range:
+                # A collectible is on the way to the enemy
+                pressed.append(pygame.K_RIGHT if item.x > center else pygame.K_LEFT)
+            else:
+                pressed.append(toward)
+        elif item is not None:
+            pressed.append(pygame.K_RIGHT if item.x > center else pygame.K_LEFT)
+
+        if player.on_ground and (self.incoming_shot(player) or self.item_above(player, item)):
+            pressed.append(pygame.K_SPACE)
+        return KeyState(pressed)
+
+    @staticmethod
+    def nearest(x, entities):
+        return min(entities, key=lambda entity: abs(entity.x - x), default=None)
+
+    def choose_item(self, x):
+        """Nearest collectible, skipping ones chased too long without reaching them"""
+        item = self.nearest(x, [c for c in self.game.collectibles
+                                if not c.collected and c not in self.ignored])
+        if item is not self.item:
+            self.item = item
+            self.item_ticks = 0
+        self.item_ticks += 1
+        if item is not None and self.item_ticks > self.item_patience:
+            self.ignored.add(item)
+        return item
+
+    def shoot(self):
+        """Fire like pressing X, the player's reload still applies"""
+        projectile = self.game.player.shoot()
+        if projectile:
+            self.game.projectiles.append(projectile)
+            self.shots += 1
+
+    def incoming_shot(self, player):
+        for projectile in self.game.enemy_projectiles:
+            distance = (player.x - projectile.x) * projectile.direction
+            if 0 < distance < self.dodge_range + player.width:
+                return True
+        return False
+
+    def item_above(self, player, item):
+        return (item is not None and abs(item.x - player.x) < player.width
+                and item.y + item.height < player.y)
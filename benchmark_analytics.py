@@ -0,0 +1,59 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from analytics import EVENT_DAMAGE, EVENT_DEATH, EVENT_KILL, EVENT_LEVEL_COMPLETE, EVENT_PICKUP
+from analytics import AnalyticsLog, AnalyticsReader
+
+# Kinds Tank Battle logs with each event
+KINDS = {
+    EVENT_KILL: ("basic", "heavy", "boss"),
+    EVENT_PICKUP: ("health", "extra_life", "score"),
+    EVENT_DAMAGE: ("shot",),
+    EVENT_DEATH: ("shot",),
+    EVENT_LEVEL_COMPLETE: ("level",),
+}
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    directory = tempfile.mkdtemp(prefix="analytics-")
+    log = AnalyticsLog(directory, chunk_rows=65536)
+    log.start()
+    print(f"Analytics benchmark, {events} events")
+
+    # Event types take turns, each cycling through its own kinds
+    types = (EVENT_KILL, EVENT_PICKUP, EVENT_DAMAGE, EVENT_DEATH, EVENT_LEVEL_COMPLETE)
+    plan = [(event, KINDS[event][turn % len(KINDS[event])]) for turn in range(3) for event in types]
+    append = log.append
+    start = time.perf_counter()
+    for i in range(events):
+        event, kind = plan[i % len(plan)]
+        append(event, i % 3 + 1, kind, 15.0, 400.0)
+    append_ns = (time.perf_counter() - start) / events * 1e9
+    start = time.perf_counter()
+    log.stop()
+    stop_ms = (time.perf_counter() - start) * 1000
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    print(f"append {append_ns:6.1f} ns/event   final flush {stop_ms:6.1f} ms   "
+          f"{log.chunks} chunks, {size / events:.2f} bytes/event on disk")
+
+    start = time.perf_counter()
+    reader = AnalyticsReader(directory)
+    unpack_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    reader = AnalyticsReader(directory)
+    load_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    kills, pickups, damage, deaths = (reader.kills_by_type(), reader.pickups_by_type(), reader.damage_by_source(),
+                                      reader.deaths())
+    query_ms = (time.perf_counter() - start) * 1000
+    print(f"reader: first load {unpack_ms:6.1f} ms   mapped load {load_ms:6.2f} ms   "
+          f"4 summaries {query_ms:6.2f} ms over {len(reader)} rows")
+    print(f"kills {dict(kills)}  pickups {dict(pickups)}")
+    print(f"damage {dict(damage)}  deaths {deaths}")
+    shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
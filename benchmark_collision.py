@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from benchmark_render import load_game
+from collision import MaskCache
+
+def populate(module, game, count):
+    """Spread enemies over a level sized to the count, with shots flying in both directions"""
+    game.game_state = "playing"
+    game.reset_game()
+    game.enemies = []
+    game.collectibles = []
+    game.projectiles = []
+    game.enemy_projectiles = []
+    player = game.player
+    width = 25 * count
+    player.x = width // 2
+    player.y = module.GROUND_LEVEL - 50
+    for _ in range(count):
+        x = random.randint(0, width)
+        game.enemies.append(module.Enemy(x, module.GROUND_LEVEL - 45, random.choice(["soldier", "boss"]),
+                                         game.scheduler))
+        for _ in range(4):
+            shot = module.Projectile(random.randint(0, width),
+                                     random.randint(module.GROUND_LEVEL - 80, module.GROUND_LEVEL),
+                                     random.choice([-1, 1]))
+            shot.update()
+            game.projectiles.append(shot)
+    # A handful of shots around the fox, where its rect and its shape differ
+    for _ in range(20):
+        shot = module.Projectile(player.x + random.randint(-30, 70), player.y + random.randint(-15, 55),
+                                 random.choice([-1, 1]))
+        shot.update()
+        game.enemy_projectiles.append(shot)
+
+def measure(game, masks, ticks):
+    """Time handle_collisions over ticks, restoring the scene before each one"""
+    game.masks = masks
+    enemies = game.enemies
+    projectiles = list(game.projectiles)
+    enemy_projectiles = list(game.enemy_projectiles)
+    hits = [0]
+    game.player.take_damage = lambda damage: hits.__setitem__(0, hits[0] + 1)
+    elapsed = 0.0
+    for _ in range(ticks):
+        for enemy in enemies:
+            enemy.health = enemy.max_health
+            enemy.alive = True
+        game.projectiles = list(projectiles)
+        game.enemy_projectiles = list(enemy_projectiles)
+        start = time.perf_counter()
+        game.handle_collisions()
+        elapsed += time.perf_counter() - start
+        hits[0] += len(projectiles) - len(game.projectiles)
+    game.projectiles = projectiles
+    game.enemy_projectiles = enemy_projectiles
+    return elapsed / ticks * 1000, hits[0] // ticks
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    fox_adventure = load_game("Q2.py", "fox_adventure")
+    game = fox_adventure.Game(headless=True)
+    masks = MaskCache(fox_adventure.bake_sprites())
+    print(f"Collision benchmark, Fox Adventure, {ticks} ticks per case")
+    for count in (50, 200, 800):
+        random.seed(1)
+        populate(fox_adventure, game, count)
+        rect_ms, rect_hits = measure(game, None, ticks)
+        mask_ms, mask_hits = measure(game, masks, ticks)
+        print(f"{count:4} enemies, {4 * count + 20:4} shots   rect {rect_ms:6.3f} ms ({rect_hits:3} hits)   "
+              f"pixel {mask_ms:6.3f} ms ({mask_hits:3} hits)   {mask_ms / rect_ms:4.2f}x")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
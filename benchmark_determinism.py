@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from autopilot import Autopilot, KeyState
+from benchmark_collision import populate
+from benchmark_render import load_game
+from collision import first_swept_hit
+from determinism import DeterminismChecker
+from entity_list import EntityList
+from runtime import RECT, is_alive
+
+def list_collide_group(game, name, targets, on_hit, rect_of=RECT, accept=None, refine=None):
+    """Reference collide_group, the plain list version with list.remove"""
+    projectiles = list(game.groups[name])
+    targets = [target for target in targets if is_alive(target)]
+    target_rects = [rect_of(target) for target in targets]
+    for projectile in projectiles[:]:
+        if accept is not None and not accept(projectile):
+            continue
+        target = first_swept_hit(rect_of(projectile), projectile.last_move,
+                                 targets, target_rects, is_alive, refine)
+        if target is not None:
+            on_hit(projectile, target)
+            projectiles.remove(projectile)
+    game.groups[name] = EntityList(projectiles)
+
+def swap_remove_collide_group(game, name, targets, on_hit, rect_of=RECT, accept=None, refine=None):
+    """Broken candidate, swap-remove reorders the group"""
+    projectiles = list(game.groups[name])
+    targets = [target for target in targets if is_alive(target)]
+    target_rects = [rect_of(target) for target in targets]
+    index = 0
+    while index < len(projectiles):
+        projectile = projectiles[index]
+        target = None
+        if accept is None or accept(projectile):
+            target = first_swept_hit(rect_of(projectile), projectile.last_move,
+                                     targets, target_rects, is_alive, refine)
+        if target is None:
+            index += 1
+            continue
+        on_hit(projectile, target)
+        projectiles[index] = projectiles[-1]
+        projectiles.pop()
+    game.groups[name] = EntityList(projectiles)
+
+def fox_adventure(module, count, collide_group=None):
+    """A headless game full of enemies and shots, played by the autopilot"""
+    random.seed(1)
+    game = module.Game(headless=True)
+    game.rng.seed(1)
+    populate(module, game, count)
+    if collide_group is not None:
+        game.collide_group = lambda *args, **kwargs: collide_group(game, *args, **kwargs)
+    game.read_keys = Autopilot(game).read_keys
+    return game
+
+def step_fox_adventure(game, tick):
+    game.update()
+
+def tank_battle(module):
+    game = module.Game()
+    game.rng.seed(1)
+    game.state = "playing"
+    game.reset_game()
+    keys = KeyState((pygame.K_RIGHT, pygame.K_x))
+    game.read_keys = lambda: keys
+    return game
+
+def step_tank_battle(game, tick):
+    game.update_game()
+    if game.state == "level_complete":
+        game.next_level()
+
+def check(label, checker, ticks):
+    divergence = checker.run(ticks)
+    reference_ms, candidate_ms, compare_ms = checker.step_ms()
+    result = "identical" if divergence is None else "DIVERGED"
+    print(f"{label:46} {checker.tick:5} ticks {result:9}  reference {reference_ms:6.3f} ms  "
+          f"candidate {candidate_ms:6.3f} ms  hashing {compare_ms:6.3f} ms per tick")
+    if divergence is not None:
+        print(divergence)
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    print(f"Determinism check, up to {ticks} ticks per case")
+    fox = load_game("Q2.py", "fox_adventure")
+    for count in (50, 200):
+        check(f"Fox Adventure +{count}, EntityList vs list.remove",
+              DeterminismChecker(fox_adventure(fox, count, list_collide_group), fox_adventure(fox, count),
+                                 step_fox_adventure), ticks)
+    check("Fox Adventure +50, swap-remove vs list.remove",
+          DeterminismChecker(fox_adventure(fox, 50, list_collide_group),
+                             fox_adventure(fox, 50, swap_remove_collide_group), step_fox_adventure), ticks)
+
+    tank = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    check("Tank Battle, replayed against itself",
+          DeterminismChecker(tank_battle(tank), tank_battle(tank), step_tank_battle), ticks)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import random
+import sys
+import time
+
+from entity_list import EntityList
+
+class Shot:
+    pass
+
+def list_frame(shots, hit):
+    """The old removal, iterate a copy and remove hits by value"""
+    for shot in shots[:]:
+        if hit(shot):
+            shots.remove(shot)
+
+def entity_list_frame(shots, hit):
+    slots = shots.slots
+    for slot in range(len(slots)):
+        shot = slots[slot]
+        if shot is not None and hit(shot):
+            shots.discard_at(slot)
+    shots.compact()
+
+def measure(frame, make, count, fraction, frames):
+    """Mean ms per frame removing fraction of count shots, refilled every frame"""
+    random.seed(1)
+    population = [Shot() for _ in range(count)]
+    hits = set(random.sample(population, int(count * fraction)))
+    hit = hits.__contains__
+    elapsed = 0.0
+    for _ in range(frames):
+        shots = make(population)
+        start = time.perf_counter()
+        frame(shots, hit)
+        elapsed += time.perf_counter() - start
+    assert len(shots) == count - len(hits)
+    return elapsed / frames * 1000
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"Entity removal benchmark, {frames} frames per case")
+    for count in (500, 2000, 8000):
+        for fraction in (0.1, 0.5):
+            list_ms = measure(list_frame, list, count, fraction, frames)
+            entity_ms = measure(entity_list_frame, EntityList, count, fraction, frames)
+            print(f"{count:5} shots, {fraction:4.0%} hit   list.remove {list_ms:8.3f} ms   "
+                  f"EntityList {entity_ms:6.3f} ms   {list_ms / entity_ms:6.1f}x")
+
+if __name__ == "__main__":
+    main()
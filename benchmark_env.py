@@ -0,0 +1,55 @@
+import sys
+import time
+
+import numpy as np
+
+from fox_env import FoxEnv, VectorFoxEnv
+
+def measure_single(steps):
+    env = FoxEnv()
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, env.action_count, steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        _observation, _reward, terminated, truncated, _info = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+def measure_phases(steps):
+    """Mean (update, observe) microseconds of a single game's step"""
+    env = FoxEnv()
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, env.action_count, steps).tolist()
+    updating = observing = 0.0
+    for action in actions:
+        start = time.perf_counter()
+        _reward, terminated, truncated, _info = env.advance(action)
+        updated = time.perf_counter()
+        env.observe(env.observation)
+        observing += time.perf_counter() - updated
+        updating += updated - start
+        if terminated or truncated:
+            env.reset()
+    return updating / steps * 1e6, observing / steps * 1e6
+
+def measure_vector(count, steps):
+    env = VectorFoxEnv(count)
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, env.action_count, (steps // count, count))
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    return len(actions) * count / (time.perf_counter() - start)
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"Fox Adventure environment, random actions, {steps} steps")
+    print(f"single          {measure_single(steps):9.0f} steps/s")
+    update_us, observe_us = measure_phases(steps)
+    print(f"  per step      {update_us:6.1f} us update + {observe_us:5.1f} us observe")
+    for count in (8, 64):
+        print(f"vector x{count:<6} {measure_vector(count, steps):9.0f} steps/s")
+
+if __name__ == "__main__":
+    main()
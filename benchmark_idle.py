@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from benchmark_render import load_game
+
+def measure(game, seconds):
+    """Run the loop for seconds, returns (CPU percent, frames, static screen draws)"""
+    draws = game.static_draws
+    frames = 0
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    while time.perf_counter() - start < seconds:
+        game.run_frame()
+        frames += 1
+    cpu = time.process_time() - cpu_start
+    return cpu / (time.perf_counter() - start) * 100, frames, game.static_draws - draws
+
+def compare(label, game, set_state, states, seconds):
+    """Compare each static screen with the event-driven idle loop and without it"""
+    static_screen = game.static_screen
+    for state in states:
+        set_state(state)
+        game.static_screen = lambda: None
+        busy = measure(game, seconds)
+        game.static_screen = static_screen
+        game.static_key = None
+        idle = measure(game, seconds)
+        print(f"{label:14} {state:15} redraw every frame {busy[0]:5.1f}% CPU, {busy[1]:4} frames   "
+              f"idle {idle[0]:5.1f}% CPU, {idle[1]:3} wakeups, {idle[2]} draws")
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    print(f"Idle benchmark, {seconds:g} s per screen")
+
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    game.reset_game()
+    compare("Tank Battle", game, lambda state: setattr(game, "state", state),
+            ("menu", "game_over", "level_complete"), seconds)
+
+    fox_adventure = load_game("Q2.py", "fox_adventure")
+    game = fox_adventure.Game()
+    compare("Fox Adventure", game, lambda state: setattr(game, "game_state", state),
+            ("menu", "game_over", "victory"), seconds)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from autopilot import KeyState
+from benchmark_render import load_game, populate_tank_battle
+from minimap import dot_rect
+
+def full_redraw(game, minimap):
+    """What the minimap costs without caching: static layer and every dot, every frame"""
+    surface = minimap.surface
+    level = game.level
+    width, height = surface.get_size()
+    game.draw_minimap_level(surface, level.level_num, (width / level.width, height / game.screen.get_height()))
+    minimap.frames = minimap.interval
+    _level, _scale, dots = game.sample_minimap()
+    for dot in dots.values():
+        surface.fill(dot[2], dot_rect(dot))
+    game.screen.blit(surface, minimap.position)
+
+def incremental(game, minimap):
+    minimap.draw(game.screen, game.sample_minimap(), game.draw_minimap_level)
+
+def measure(module, game, draw_minimap, interval, count, frames):
+    """Mean ms per frame spent on the minimap while the game plays"""
+    random.seed(1)
+    game.rng.seed(1)
+    populate_tank_battle(module, game, count)
+    game.player.take_damage = lambda damage: None
+    minimap = game.minimap
+    minimap.interval = interval
+    minimap.reset()
+    redraws = 0
+    spent = 0.0
+    for _ in range(frames):
+        game.update_game()
+        before = minimap.redraws
+        start = time.perf_counter()
+        draw_minimap(game, minimap)
+        spent += time.perf_counter() - start
+        redraws += max(0, minimap.redraws - before)
+    return spent / frames * 1000, redraws / frames
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    keys = KeyState((pygame.K_RIGHT, pygame.K_x))
+    game.read_keys = lambda: keys
+    print(f"Minimap benchmark, Tank Battle, {frames} frames per case")
+    for count in (0, 100, 400):
+        full_ms, _ = measure(tank_battle, game, full_redraw, 1, count, frames)
+        every_ms, every_dots = measure(tank_battle, game, incremental, 1, count, frames)
+        cached_ms, cached_dots = measure(tank_battle, game, incremental, 6, count, frames)
+        print(f"+{count:3d} entities  full redraw {full_ms:6.3f} ms   incremental every frame {every_ms:6.3f} ms "
+              f"({every_dots:5.1f} dots)   every 6th frame {cached_ms:6.3f} ms ({cached_dots:5.1f} dots)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
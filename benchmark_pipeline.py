@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from autopilot import KeyState
+from benchmark_render import load_game, populate_tank_battle
+
+def run(module, game, count, frames):
+    """Run uncapped frames, returns (frames per second, mean latency ms, p95 latency ms)"""
+    random.seed(1)
+    game.rng.seed(1)
+    populate_tank_battle(module, game, count)
+    game.player.take_damage = lambda damage: None
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.run_frame()
+        latencies.append(game.latency_ms)
+        if game.state != "playing":
+            populate_tank_battle(module, game, count)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return frames / elapsed, sum(latencies) / frames, latencies[int(frames * 0.95)]
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    print(f"Pipeline benchmark, Tank Battle, {frames} uncapped frames per case")
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    game.fps = 0
+    keys = KeyState((pygame.K_RIGHT, pygame.K_x))
+    game.read_keys = lambda: keys
+    game.start_pipeline()
+    pipeline = game.pipeline
+    if pipeline is None:
+        os.environ["GAME_PIPELINE"] = "1"
+        game.start_pipeline()
+        pipeline = game.pipeline
+
+    for count in (0, 50, 200):
+        game.pipeline = None
+        serial = run(tank_battle, game, count, frames)
+        game.pipeline = pipeline
+        pipelined = run(tank_battle, game, count, frames)
+        print(f"+{count:<3} entities  serial {serial[0]:6.0f} fps, latency {serial[1]:5.2f} / {serial[2]:5.2f} ms"
+              f"   pipelined {pipelined[0]:6.0f} fps, latency {pipelined[1]:5.2f} / {pipelined[2]:5.2f} ms"
+              f"   ({pipelined[0] / serial[0] - 1:+.0%})")
+    pipeline.stop()
+
+if __name__ == "__main__":
+    main()
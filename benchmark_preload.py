@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from autopilot import KeyState
+from benchmark_render import load_game
+
+def grow_tank_levels(module, extra):
+    """Pad every Tank Battle level with extra spawns, standing in for bigger levels"""
+    generate_level = module.Level.generate_level
+
+    def generate_bigger_level(level):
+        generate_level(level)
+        for i in range(extra):
+            level.add_spawn("enemy", 800 + i * 5, module.SCREEN_HEIGHT - 140, "basic")
+            level.add_spawn("collectible", 800 + i * 5, module.SCREEN_HEIGHT - 150, "score")
+
+    module.Level.generate_level = generate_bigger_level
+
+def grow_fox_levels(module, game, extra):
+    """Pad every Fox Adventure level with extra enemies and collectibles"""
+    build_level = game.build_level
+
+    def build_bigger_level(level, items):
+        enemies, collectibles = build_level(level, items)
+        for i in range(extra):
+            x = items.randint(200, game.level_width - 200)
+            enemies.append(module.Enemy(x, module.GROUND_LEVEL - 45, "soldier", game.scheduler))
+            collectibles.append(module.Collectible(x, module.GROUND_LEVEL - 150, "score"))
+        return enemies, collectibles
+
+    game.build_level = build_bigger_level
+
+def play(game, frames):
+    for _ in range(frames):
+        game.run_frame()
+
+def tank_battle_hitch(module, game, preload, frames):
+    """Milliseconds spent in next_level after playing level 1 for frames"""
+    game.level_loader.enabled = preload
+    game.state = "playing"
+    game.reset_game()
+    play(game, frames)
+    start = time.perf_counter()
+    game.next_level()
+    return (time.perf_counter() - start) * 1000, game.level_loader.swap_ms
+
+def level_state(game):
+    """Entity counts and positions, unchanged as long as the level is not updated"""
+    return ([(enemy.x, enemy.alive) for enemy in game.enemies],
+            [(collectible.x, collectible.collected) for collectible in game.collectibles])
+
+def fox_adventure_hitch(module, game, preload, frames):
+    """Milliseconds spent in check_level_complete on the frame level 1 is cleared"""
+    game.level_loader.enabled = preload
+    game.game_state = "playing"
+    game.reset_game()
+    level = level_state(game)
+    play(game, frames)
+    assert level_state(game) == level, "the padded level was played"
+    for enemy in game.enemies:
+        enemy.alive = False
+    start = time.perf_counter()
+    game.check_level_complete()
+    return (time.perf_counter() - start) * 1000, game.level_loader.swap_ms
+
+def main():
+    extra = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    frames = 30
+    keys = KeyState((pygame.K_RIGHT,))
+    print(f"Level transition benchmark, {extra} extra entities per level, {frames} frames played first")
+
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    grow_tank_levels(tank_battle, extra)
+    game = tank_battle.Game()
+    game.fps = 0
+    game.read_keys = lambda: keys
+    for preload in (False, True):
+        total_ms, swap_ms = tank_battle_hitch(tank_battle, game, preload, frames)
+        print(f"Tank Battle    preload {'on ' if preload else 'off'}  transition {total_ms:8.3f} ms  "
+              f"(level swap {swap_ms:8.3f} ms)")
+    pygame.quit()
+
+    fox_adventure = load_game("Q2.py", "fox_adventure")
+    game = fox_adventure.Game()
+    game.fps = 0
+    grow_fox_levels(fox_adventure, game, extra)
+    game.update = lambda: None  # Only the transition matters, keep the padded level intact
+    for preload in (False, True):
+        total_ms, swap_ms = fox_adventure_hitch(fox_adventure, game, preload, frames)
+        print(f"Fox Adventure  preload {'on ' if preload else 'off'}  transition {total_ms:8.3f} ms  "
+              f"(level swap {swap_ms:8.3f} ms)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pstats
+
+import pygame
+
+from autopilot import KeyState
+from benchmark_render import load_game, populate_tank_battle
+
+def run(module, game, seconds):
+    """Run uncapped frames for seconds from the same start, returns mean frame ms"""
+    random.seed(1)
+    game.rng.seed(1)
+    populate_tank_battle(module, game, 100)
+    game.player.take_damage = lambda damage: None
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        game.run_frame()
+        frames += 1
+    return (time.perf_counter() - start) / frames * 1000
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    directory = tempfile.mkdtemp(prefix="profile-")
+    os.environ["GAME_PROFILE_SECONDS"] = str(seconds)
+    os.environ["GAME_PROFILE_DIR"] = directory
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    game.fps = 0
+    keys = KeyState((pygame.K_RIGHT, pygame.K_x))
+    game.read_keys = lambda: keys
+    print(f"Profiler benchmark, Tank Battle +100 entities, {seconds:g} s per case")
+
+    idle_ms = run(tank_battle, game, seconds)
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F9, mod=0, unicode="", scancode=0))
+    capture_ms = run(tank_battle, game, seconds)
+    game.profile.stop()
+    print(f"no capture {idle_ms:6.3f} ms/frame   capturing {capture_ms:6.3f} ms/frame "
+          f"({capture_ms / idle_ms - 1:+.1%}), {game.profile.samples} samples")
+
+    path = game.profile.path
+    stats = pstats.Stats(f"{path}.pstats")
+    stats.sort_stats("cumulative").print_stats(8)
+    with open(f"{path}.folded") as f:
+        print(f"{sum(1 for _line in f)} distinct stacks in {path}.folded")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import importlib.util
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from sdl2_backend import Sdl2Backend
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_game(filename, name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def populate_tank_battle(module, game, count):
+    """Fill the view with enemies, collectibles and projectiles"""
+    game.state = "playing"
+    game.reset_game()
+    for i in range(count):
+        x = random.randint(0, module.SCREEN_WIDTH)
+        game.enemies.append(module.Enemy(x, module.SCREEN_HEIGHT - 140, random.choice(["basic", "heavy"])))
+        game.collectibles.append(module.Collectible(x, module.SCREEN_HEIGHT - 150, "score"))
+        for _ in range(4):
+            y = random.randint(100, module.SCREEN_HEIGHT - 120)
+            game.projectiles.append(module.Projectile(x, y, 1, owner=random.choice(["player", "enemy"])))
+
+def populate_fox_adventure(module, game, count):
+    """Fill the view with enemies, collectibles and projectiles"""
+    game.game_state = "playing"
+    game.reset_game()
+    for i in range(count):
+        x = random.randint(0, module.SCREEN_WIDTH)
+        enemy = module.Enemy(x, module.GROUND_LEVEL - 45, "soldier", game.scheduler)
+        enemy.health = 25
+        game.enemies.append(enemy)
+        game.collectibles.append(module.Collectible(x, module.GROUND_LEVEL - 150, "score"))
+        for _ in range(4):
+            y = random.randint(100, module.GROUND_LEVEL - 20)
+            game.projectiles.append(module.Projectile(x, y, 1))
+
+def time_frames(draw, present, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+        present()
+    return (time.perf_counter() - start) / frames * 1000
+
+def compare(label, game, backend, frames):
+    """Time the surface draw path against the SDL2 batched path"""
+    game.backend = None
+    surface_ms = time_frames(game.draw_game, pygame.display.flip, frames)
+    game.backend = backend
+    game.submit_game()
+    backend.end()
+    sdl2_ms = time_frames(game.submit_game, backend.end, frames)
+    print(f"{label:28} surface {surface_ms:7.2f} ms   sdl2 {sdl2_ms:7.2f} ms   "
+          f"({backend.draw_calls} texture draws)")
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    driver = os.environ.get("GAME_RENDER_DRIVER", "software")
+    random.seed(1)
+    print(f"Render benchmark, {frames} frames per case, SDL2 driver: {driver}")
+
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    backend = Sdl2Backend((tank_battle.SCREEN_WIDTH, tank_battle.SCREEN_HEIGHT), "benchmark", driver)
+    for count in (0, 50, 200):
+        populate_tank_battle(tank_battle, game, count)
+        compare(f"Tank Battle +{count} entities", game, backend, frames)
+
+    fox_adventure = load_game("Q2.py", "fox_adventure")
+    game = fox_adventure.Game()
+    backend = Sdl2Backend((fox_adventure.SCREEN_WIDTH, fox_adventure.SCREEN_HEIGHT), "benchmark", driver)
+    for count in (0, 50, 200):
+        populate_fox_adventure(fox_adventure, game, count)
+        compare(f"Fox Adventure +{count} entities", game, backend, frames)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from autopilot import KeyState
+from benchmark_render import load_game, populate_tank_battle
+from rewind import RewindBuffer
+
+def measure(module, game, count, ticks):
+    """Record ticks of play, then scrub all the way back"""
+    random.seed(1)
+    game.rng.seed(1)
+    populate_tank_battle(module, game, count)
+    game.player.take_damage = lambda damage: None
+    buffer = RewindBuffer(10, module.FPS)
+    entities = 0
+    record_time = 0.0
+    for tick in range(ticks):
+        game.update_game()
+        rows = game.capture_state()
+        entities += len(rows)
+        start = time.perf_counter()
+        buffer.record(rows)
+        record_time += time.perf_counter() - start
+    stored = buffer.ticks
+    start = time.perf_counter()
+    while buffer.cursor is None or buffer.cursor < stored - 1:
+        game.restore_state(buffer.step_back().tolist())
+    scrub_time = time.perf_counter() - start
+    return (entities / ticks, buffer.bytes_per_second(), buffer.nbytes, stored,
+            record_time / ticks * 1e6, scrub_time / (stored - 1) * 1e6)
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    keys = KeyState((pygame.K_RIGHT, pygame.K_x))
+    game.read_keys = lambda: keys
+    print(f"Rewind benchmark, Tank Battle, {ticks} ticks recorded into a 10 s buffer")
+    for count in (0, 50, 200):
+        rows, rate, size, stored, record_us, scrub_us = measure(tank_battle, game, count, ticks)
+        print(f"+{count:<3} entities ({rows:5.1f} rows)  {rate / 1024:7.1f} KB/s  "
+              f"{size / 1024:7.1f} KB for {stored} ticks  record {record_us:5.1f} us  "
+              f"scrub {scrub_us:6.1f} us/tick")
+
+if __name__ == "__main__":
+    main()
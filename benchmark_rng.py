@@ -0,0 +1,47 @@
+import hashlib
+import random
+import sys
+import time
+
+import numpy as np
+
+from fox_env import FoxEnv
+from rng import RandomService
+
+def time_calls(draw, calls):
+    """Nanoseconds per call of draw()"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        draw()
+    return (time.perf_counter() - start) / calls * 1e9
+
+def play(seed, steps):
+    """Digest of every observation of a headless game driven by fixed actions"""
+    env = FoxEnv(max_steps=steps)
+    env.reset(seed)
+    actions = np.random.default_rng(0).integers(0, env.action_count, steps).tolist()
+    digest = hashlib.md5()
+    for action in actions:
+        observation, _reward, terminated, truncated, _info = env.step(action)
+        digest.update(observation.tobytes())
+        if terminated or truncated:
+            env.reset()
+    return digest.hexdigest()
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    stream = RandomService(1).stream("benchmark")
+    print(f"RNG benchmark, {calls} calls per case")
+    print(f"random.randint(1, 200)  {time_calls(lambda: random.randint(1, 200), calls):6.1f} ns")
+    print(f"stream.randint(1, 200)  {time_calls(lambda: stream.randint(1, 200), calls):6.1f} ns")
+    print(f"random.random()         {time_calls(random.random, calls):6.1f} ns")
+    print(f"stream.random()         {time_calls(stream.random, calls):6.1f} ns")
+
+    # Replays must match exactly, and a different seed should play differently
+    steps = 3000
+    first, second, other = play(7, steps), play(7, steps), play(8, steps)
+    print(f"Fox Adventure, {steps} steps: seed 7 {first[:12]}, again {second[:12]}, seed 8 {other[:12]}  "
+          f"{'deterministic' if first == second and first != other else 'NOT DETERMINISTIC'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from benchmark_render import load_game, populate_fox_adventure, populate_tank_battle, time_frames
+from scaled_backend import ScaledBackend
+
+SCALES = (1.0, 0.75, 0.5)
+
+def compare(label, module, game, frames):
+    """Time the surface draw path against the scaled backend at each scale"""
+    size = (module.SCREEN_WIDTH, module.SCREEN_HEIGHT)
+    game.backend = None
+    game.screen = pygame.display.set_mode(size)
+    timings = [f"surface {time_frames(game.draw_game, pygame.display.flip, frames):6.2f} ms"]
+    for smooth in (False, True):
+        for scale in SCALES:
+            render_size = (round(size[0] * scale), round(size[1] * scale))
+            backend = ScaledBackend(size, "benchmark", render_size, smooth)
+            game.backend = backend
+            game.screen = backend.window
+            game.submit_game()
+            backend.end()
+            filter_name = "smooth" if smooth else "scale"
+            timings.append(f"{filter_name} {scale:.2f} {time_frames(game.submit_game, backend.end, frames):6.2f} ms")
+    game.backend = None
+    print(f"{label:28} " + "  ".join(timings))
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(1)
+    print(f"Internal resolution benchmark, {frames} frames per case")
+
+    tank_battle = load_game("HIT137-Assignment-03_Q1.py", "tank_battle")
+    game = tank_battle.Game()
+    for count in (0, 50, 200):
+        populate_tank_battle(tank_battle, game, count)
+        compare(f"Tank Battle +{count} entities", tank_battle, game, frames)
+
+    fox_adventure = load_game("Q2.py", "fox_adventure")
+    game = fox_adventure.Game()
+    for count in (0, 50, 200):
+        populate_fox_adventure(fox_adventure, game, count)
+        compare(f"Fox Adventure +{count} entities", fox_adventure, game, frames)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+GAMES = {
+    "Tank Battle": "HIT137-Assignment-03_Q1.py",
+    "Fox Adventure": "Q2.py",
+}
+
+# Runs in a fresh interpreter so nothing is cached between measurements
+PROBE = """
+import time
+start = time.perf_counter()
+import importlib.util
+import pygame
+spec = importlib.util.spec_from_file_location("game", {path!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+game = module.Game()
+pygame.event.post(pygame.event.Event(pygame.QUIT))
+try:
+    game.run()
+except SystemExit:
+    pass
+first_frame = time.perf_counter()
+print(imported - start, first_frame - start)
+"""
+
+def measure(path, runs):
+    """Return (import seconds, first frame seconds) lists for a game file"""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    imports = []
+    frames = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(path=path)],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        import_time, frame_time = map(float, result.stdout.split()[-2:])
+        imports.append(import_time)
+        frames.append(frame_time)
+    return imports, frames
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"Startup benchmark ({runs} runs, best / median)")
+    for name, filename in GAMES.items():
+        imports, frames = measure(os.path.join(here, filename), runs)
+        imports.sort()
+        frames.sort()
+        print(f"{name:14} import {imports[0] * 1000:7.1f} / {imports[runs // 2] * 1000:7.1f} ms"
+              f"   first frame {frames[0] * 1000:7.1f} / {frames[runs // 2] * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import pygame
+
+def sweep_time(x, y, width, height, dx, dy, target):
+    """Time in [0, 1] when a box moving by (dx, dy) first overlaps target.
+
+    Returns None when the swept box never overlaps the target rect. Boxes
+    that only touch edges do not overlap, matching Rect.colliderect.
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+    for start, size, delta, low, high in (
+        (x, width, dx, target.left, target.right),
+        (y, height, dy, target.top, target.bottom),
+    ):
+        if delta == 0:
+            if start + size <= low or start >= high:
+                return None
+            continue
+        t_near = (low - (start + size)) / delta
+        t_far = (high - start) / delta
+        if t_near > t_far:
+            t_near, t_far = t_far, t_near
+        if t_near > t_enter:
+            t_enter = t_near
+        if t_far < t_exit:
+            t_exit = t_far
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+def first_swept_hit(rect, move, targets, target_rects, is_alive, refine=None):
+    """Earliest target hit by rect over the move that ended at its current position.
+
+    target_rects holds the rect of each target, so callers testing many
+    projectiles against the same targets build it only once. refine(target,
+    path), when given, is a finer test of candidates whose box the path
+    rect overlaps, such as a pixel mask check.
+    """
+    dx, dy = move
+    x = rect.x - dx
+    y = rect.y - dy
+    # Only targets touching the box around the whole move can be hit
+    path = rect.union((x, y, rect.width, rect.height))
+    hit = None
+    hit_time = 2.0
+    for index in path.collidelistall(target_rects):
+        target = targets[index]
+        if not is_alive(target):
+            continue
+        t = sweep_time(x, y, rect.width, rect.height, dx, dy, target_rects[index])
+        if t is not None and t < hit_time and (refine is None or refine(target, path)):
+            hit = target
+            hit_time = t
+    return hit
+
+class MaskCache:
+    """Collision masks built once per sprite variant from baked sprites.
+
+    sprites maps names to (surface, anchor) as returned by bake, the
+    entity's position lands on the anchor. Each mask is trimmed to its
+    visible pixels so its bounds make a tight box for prefiltering.
+    """
+    def __init__(self, sprites):
+        self.masks = {}
+        for name, (surface, (anchor_x, anchor_y)) in sprites.items():
+            mask = pygame.mask.from_surface(surface)
+            visible = mask.get_bounding_rects()
+            if not visible:
+                continue
+            box = visible[0].unionall(visible[1:])
+            # Offset from the entity position to the trimmed mask's top left
+            self.masks[name] = (trim(mask, box), box.x - anchor_x, box.y - anchor_y)
+        self.boxes = {}
+
+    def bounds(self, name, x, y):
+        """Rect around the visible pixels of a sprite drawn at (x, y)"""
+        mask, dx, dy = self.masks[name]
+        width, height = mask.get_size()
+        return pygame.Rect(int(x) + dx, int(y) + dy, width, height)
+
+    def box(self, width, height):
+        """Filled mask for plain rectangles such as projectile paths"""
+        mask = self.boxes.get((width, height))
+        if mask is None:
+            mask = self.boxes[width, height] = pygame.mask.Mask((width, height), fill=True)
+        return mask
+
+    def overlap(self, name, x, y, other, other_x, other_y):
+        """Whether two sprites drawn at (x, y) and (other_x, other_y) share a pixel"""
+        mask, dx, dy = self.masks[name]
+        other_mask, other_dx, other_dy = self.masks[other]
+        offset = (int(other_x) + other_dx - int(x) - dx, int(other_y) + other_dy - int(y) - dy)
+        return mask.overlap(other_mask, offset) is not None
+
+    def overlap_rect(self, name, x, y, rect):
+        """Whether a sprite drawn at (x, y) covers any pixel of rect"""
+        mask, dx, dy = self.masks[name]
+        offset = (rect.x - int(x) - dx, rect.y - int(y) - dy)
+        return mask.overlap(self.box(rect.width, rect.height), offset) is not None
+
+def trim(mask, box):
+    """Copy of the part of mask inside box"""
+    trimmed = pygame.mask.Mask(box.size)
+    trimmed.draw(mask, (-box.x, -box.y))
+    return trimmed
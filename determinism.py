@@ -0,0 +1,181 @@
+import time
+
+import pygame
+
+PLAIN_TYPES = (int, float, str, bool, type(None))
+
+def plain_value(value):
+    """value as a comparable plain value, or None when it is not entity state"""
+    if isinstance(value, PLAIN_TYPES):
+        return (value,)
+    if isinstance(value, pygame.Rect):
+        return (tuple(value),)
+    if isinstance(value, tuple) and all(isinstance(item, PLAIN_TYPES) for item in value):
+        return (value,)
+    # Callables, references to other objects and containers are not compared
+    return None
+
+def attributes(entity):
+    try:
+        return vars(entity)
+    except TypeError:
+        # Entities with __slots__, such as pooled ones, have no __dict__
+        return {name: getattr(entity, name) for cls in type(entity).__mro__
+                for name in getattr(cls, "__slots__", ()) if hasattr(entity, name)}
+
+def entity_state(entity, ignore=()):
+    """Sorted (field, value) pairs of an entity's plain attributes"""
+    fields = []
+    for name, value in sorted(attributes(entity).items()):
+        if name in ignore:
+            continue
+        value = plain_value(value)
+        if value is not None:
+            fields.append((name, value[0]))
+    return tuple(fields)
+
+def game_entities(game):
+    """Default entities to compare, the player and every entity group"""
+    entities = {"player": [game.player]}
+    entities.update(game.groups)
+    return entities
+
+def field_diff(reference, candidate):
+    """(field, reference value, candidate value) for every field that differs"""
+    reference = dict(reference)
+    candidate = dict(candidate)
+    missing = object()
+    diff = []
+    for name in sorted(set(reference) | set(candidate)):
+        ours = reference.get(name, missing)
+        theirs = candidate.get(name, missing)
+        if ours != theirs or type(ours) is not type(theirs):
+            diff.append((name, None if ours is missing else ours, None if theirs is missing else theirs))
+    return diff
+
+class Divergence:
+    """First place where the candidate's state left the reference's"""
+    def __init__(self, tick, group, index, diff, lengths=None):
+        self.tick = tick
+        self.group = group
+        self.index = index  # Position of the entity in its group, None when only the counts differ
+        self.diff = diff
+        self.lengths = lengths  # (reference, candidate) entity counts when they differ
+
+    def __str__(self):
+        lines = [f"Diverged at tick {self.tick} in {self.group}"]
+        if self.lengths is not None:
+            lines.append(f"  {self.lengths[0]} entities in the reference, {self.lengths[1]} in the candidate")
+        if self.index is not None:
+            lines.append(f"  entity {self.index}:")
+            for name, ours, theirs in self.diff:
+                lines.append(f"    {name}: {ours!r} != {theirs!r}")
+        return "\n".join(lines)
+
+class DeterminismChecker:
+    """Steps a reference and a candidate game in lockstep and compares their entities.
+
+    Both games must already be set up the same way, seeded with the same
+    seed and fed the same input. step(game, tick) advances a game by one
+    tick, the games' clocks are replaced with a fixed step clock so
+    timers agree. Each tick every entity's plain attributes are hashed
+    and only on a mismatch are the fields compared, to report the first
+    diverging entity with a field diff. The time each side spends in
+    step is kept so the checker can run inside benchmarks.
+    """
+    def __init__(self, reference, candidate, step, entities=game_entities, ignore=(), tick_ms=1000 / 60):
+        self.reference = reference
+        self.candidate = candidate
+        self.step = step
+        self.entities = entities
+        self.ignore = frozenset(ignore)
+        self.tick_ms = tick_ms
+        self.tick = 0
+        self.reference_seconds = 0.0
+        self.candidate_seconds = 0.0
+        self.compare_seconds = 0.0  # Spent hashing and comparing state
+        self.layouts = {}  # (class, attribute count) -> fields hashed for such entities
+        for game in (reference, candidate):
+            game.ticks = self.now
+
+    def now(self):
+        return int(self.tick * self.tick_ms)
+
+    def run(self, ticks):
+        """Step both games ticks times, returns the first Divergence or None"""
+        for _ in range(ticks):
+            self.tick += 1
+            start = time.perf_counter()
+            self.step(self.reference, self.tick)
+            stepped = time.perf_counter()
+            self.step(self.candidate, self.tick)
+            compared = time.perf_counter()
+            divergence = self.compare()
+            self.reference_seconds += stepped - start
+            self.candidate_seconds += compared - stepped
+            self.compare_seconds += time.perf_counter() - compared
+            if divergence is not None:
+                return divergence
+        return None
+
+    def layout(self, entity, attributes):
+        """(hash of the field names, field names, positions of Rect fields)"""
+        names = tuple(name for name, value in sorted(attributes.items())
+                      if name not in self.ignore and plain_value(value) is not None)
+        rects = tuple(index for index, name in enumerate(names) if isinstance(attributes[name], pygame.Rect))
+        layout = self.layouts[(type(entity), len(attributes))] = (hash(names), names, rects)
+        return layout
+
+    def entity_hash(self, entity):
+        """Hash of entity_state(entity), with the field names worked out once per class"""
+        fields = attributes(entity)
+        layout = self.layouts.get((type(entity), len(fields)))
+        if layout is None:
+            layout = self.layout(entity, fields)
+        names_hash, names, rects = layout
+        try:
+            values = [fields[name] for name in names]
+            for index in rects:
+                values[index] = tuple(values[index])
+            return hash((names_hash, tuple(values)))
+        except (KeyError, TypeError):
+            # A field changed to something that is not plain state
+            return hash(entity_state(entity, self.ignore))
+
+    def state_hashes(self, game):
+        """Group name -> one hash per entity, in group order"""
+        entity_hash = self.entity_hash
+        return {name: [entity_hash(entity) for entity in group] for name, group in self.entities(game).items()}
+
+    def compare(self):
+        reference_hashes = self.state_hashes(self.reference)
+        candidate_hashes = self.state_hashes(self.candidate)
+        if reference_hashes == candidate_hashes:
+            return None
+        reference_entities = self.entities(self.reference)
+        candidate_entities = self.entities(self.candidate)
+        names = list(reference_hashes) + [name for name in candidate_hashes if name not in reference_hashes]
+        for name in names:
+            ours = reference_hashes.get(name, [])
+            theirs = candidate_hashes.get(name, [])
+            if ours == theirs:
+                continue
+            lengths = (len(ours), len(theirs)) if len(ours) != len(theirs) else None
+            for index, (our_hash, their_hash) in enumerate(zip(ours, theirs)):
+                if our_hash != their_hash:
+                    reference_entity = list(reference_entities[name])[index]
+                    candidate_entity = list(candidate_entities[name])[index]
+                    diff = field_diff(entity_state(reference_entity, self.ignore),
+                                      entity_state(candidate_entity, self.ignore))
+                    # Equal states can hash apart when a field holds an object
+                    if diff:
+                        return Divergence(self.tick, name, index, diff, lengths)
+            if lengths is not None:
+                return Divergence(self.tick, name, None, [], lengths)
+        return None
+
+    def step_ms(self):
+        """Mean (reference, candidate, compare) ms per tick"""
+        ticks = max(self.tick, 1)
+        return (self.reference_seconds / ticks * 1000, self.candidate_seconds / ticks * 1000,
+                self.compare_seconds / ticks * 1000)
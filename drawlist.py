@@ -0,0 +1,90 @@
+import pygame
+
+# Draw layers, lower layers are drawn first
+LAYER_BACKGROUND = 0
+LAYER_ENTITIES = 1
+LAYER_DETAILS = 2
+LAYER_PROJECTILES = 3
+LAYER_HUD = 4
+
+def bake(size, anchor, draw):
+    """Render a sprite by calling draw(surface) on a transparent surface.
+
+    anchor is where the entity's own position lands inside the sprite,
+    so parts drawn above or left of it (heads, barrels, tails) fit.
+    """
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    draw(surface)
+    return surface, anchor
+
+def solid(color):
+    """Small flat colored sprite, stretched when drawn"""
+    surface = pygame.Surface((4, 4), pygame.SRCALPHA)
+    surface.fill(color)
+    return surface, (0, 0)
+
+class SpriteSheet:
+    """Baked sprites for software blitting, with stretched copies cached by size"""
+    def __init__(self, sprites):
+        self.sprites = {}
+        for name, (surface, anchor) in sprites.items():
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.sprites[name] = (surface, anchor)
+        self.stretched = {}
+
+    def __getitem__(self, name):
+        return self.sprites[name]
+
+    def sized(self, name, width, height):
+        key = (name, width, height)
+        surface = self.stretched.get(key)
+        if surface is None:
+            surface = pygame.transform.scale(self.sprites[name][0], (width, height))
+            self.stretched[key] = surface
+        return surface
+
+class DrawList:
+    """Per-frame sprite commands grouped by layer"""
+    def __init__(self):
+        self.layers = {}
+        self.count = 0
+
+    def clear(self):
+        for commands in self.layers.values():
+            commands.clear()
+        self.count = 0
+
+    def add(self, layer, name, x, y, width=None, height=None):
+        """Queue a sprite at (x, y), optionally stretched to width x height"""
+        commands = self.layers.get(layer)
+        if commands is None:
+            commands = self.layers[layer] = []
+        commands.append((name, x, y, width, height))
+        self.count += 1
+
+    def __iter__(self):
+        """Commands in layer order, submission order within a layer"""
+        for layer in sorted(self.layers):
+            yield from self.layers[layer]
+
+    def freeze(self):
+        """Immutable copy of the commands as (layer, commands) pairs in layer order"""
+        return tuple((layer, tuple(self.layers[layer])) for layer in sorted(self.layers))
+
+    def flush(self, screen, sprites):
+        """Blit every layer with one Surface.blits call each"""
+        flush_layers(screen, sprites, ((layer, self.layers[layer]) for layer in sorted(self.layers)))
+
+def flush_layers(screen, sprites, layers):
+    """Blit (layer, commands) pairs, one Surface.blits call per layer"""
+    for _layer, commands in layers:
+        blits = []
+        for name, x, y, width, height in commands:
+            if width is None:
+                surface, (anchor_x, anchor_y) = sprites[name]
+                blits.append((surface, (x - anchor_x, y - anchor_y)))
+            elif width > 0 and height > 0:
+                blits.append((sprites.sized(name, width, height), (x, y)))
+        if blits:
+            screen.blits(blits, False)
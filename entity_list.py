@@ -0,0 +1,52 @@
+class EntityList:
+    """Entity group with O(1) removal by slot that is safe to change while iterating.
+
+    A removed entity leaves a None tombstone in its slot, so the entities
+    after it keep their slots and loops over the group neither skip nor
+    repeat anything. compact() drops the tombstones in one pass and keeps
+    the order, once the loops that removed entities are done. The slots
+    stay one contiguous list. Iteration skips tombstones, entities must
+    not be falsy.
+    """
+    def __init__(self, entities=()):
+        self.slots = list(entities)
+        self.removed = 0  # Tombstones waiting for compact()
+
+    def __len__(self):
+        return len(self.slots) - self.removed
+
+    def __bool__(self):
+        return len(self.slots) > self.removed
+
+    def __iter__(self):
+        return filter(None, self.slots)
+
+    def __repr__(self):
+        return f"EntityList({list(self)!r})"
+
+    def append(self, entity):
+        self.slots.append(entity)
+
+    def extend(self, entities):
+        self.slots.extend(entities)
+
+    def clear(self):
+        # A new list, loops already running over the old one finish undisturbed
+        self.slots = []
+        self.removed = 0
+
+    def discard_at(self, slot):
+        """Remove the entity in a slot"""
+        if self.slots[slot] is not None:
+            self.slots[slot] = None
+            self.removed += 1
+
+    def compact(self):
+        if self.removed:
+            self.slots = [entity for entity in self.slots if entity is not None]
+            self.removed = 0
+
+    def retain(self, keep):
+        """Keep only the entities for which keep(entity) is true, compacting as well"""
+        self.slots = [entity for entity in self.slots if entity is not None and keep(entity)]
+        self.removed = 0
@@ -0,0 +1,195 @@
+import numpy as np
+import pygame
+
+from autopilot import KeyState
+from Q2 import SCREEN_HEIGHT, Game
+
+# Actions are move (none, left, right) x jump x shoot, action = move + 3 * jump + 6 * shoot
+MOVES = ((), (pygame.K_LEFT,), (pygame.K_RIGHT,))
+ACTION_KEYS = [KeyState(move + ((pygame.K_SPACE,) if jump else ()))
+               for jump in (False, True) for move in MOVES]
+ACTION_COUNT = 12
+
+# Observation layout, nearest entities first and missing slots left at zero
+PLAYER_FEATURES = 11  # x, y, vel_x, vel_y, on_ground, facing, health, lives, can_shoot, invulnerable, level
+ENEMY_SLOTS, ENEMY_FEATURES = 4, 5  # present, dx, dy, health, is_boss
+SHOT_SLOTS, SHOT_FEATURES = 4, 4  # present, dx, dy, direction
+ITEM_SLOTS, ITEM_FEATURES = 4, 5  # present, dx, dy, is_health, is_life
+OBSERVATION_SIZE = (PLAYER_FEATURES + ENEMY_SLOTS * ENEMY_FEATURES
+                    + SHOT_SLOTS * SHOT_FEATURES + ITEM_SLOTS * ITEM_FEATURES)
+DISTANCE_SCALE = 500.0
+EMPTY_ENEMY = [0.0] * ENEMY_FEATURES
+EMPTY_SHOT = [0.0] * SHOT_FEATURES
+EMPTY_ITEM = [0.0] * ITEM_FEATURES
+
+# Rewards
+SCORE_REWARD = 0.01  # Per point, a kill is 100 points
+DAMAGE_PENALTY = 0.01  # Per health point lost, losing a life costs the rest of the bar
+LEVEL_REWARD = 1.0
+VICTORY_REWARD = 5.0
+
+class FoxEnv:
+    """reset()/step(action) environment over a headless Fox Adventure game.
+
+    Steps run one game tick each with nothing drawn. Randomness comes from
+    the game's RandomService, reset(seed) reseeds it. The observation array
+    is reused and overwritten by every step.
+    """
+    observation_size = OBSERVATION_SIZE
+    action_count = ACTION_COUNT
+
+    def __init__(self, max_steps=5000, observation=None):
+        self.game = Game(headless=True)
+        self.keys = ACTION_KEYS[0]
+        self.game.read_keys = self.read_keys
+        self.max_steps = max_steps
+        self.steps = 0
+        if observation is None:
+            observation = np.zeros(OBSERVATION_SIZE, np.float32)
+        self.observation = observation
+
+    def read_keys(self):
+        return self.keys
+
+    def reset(self, seed=None):
+        """Start a new game, returns (observation, info)"""
+        game = self.game
+        if seed is not None:
+            game.rng.seed(seed)
+        game.reset_game()
+        game.game_state = "playing"
+        self.steps = 0
+        self.vitality = self.player_vitality()
+        self.score = game.player.score
+        self.level = game.current_level
+        self.observe(self.observation)
+        return self.observation, {}
+
+    def player_vitality(self):
+        player = self.game.player
+        return player.lives * player.max_health + max(0, player.health)
+
+    def step(self, action):
+        """Run one tick, returns (observation, reward, terminated, truncated, info)"""
+        reward, terminated, truncated, info = self.advance(action)
+        self.observe(self.observation)
+        return self.observation, reward, terminated, truncated, info
+
+    def advance(self, action):
+        """step() without writing the observation, returns (reward, terminated, truncated, info)"""
+        game = self.game
+        action = int(action)
+        self.keys = ACTION_KEYS[action % 6]
+        if action >= 6:
+            projectile = game.player.shoot()
+            if projectile:
+                game.projectiles.append(projectile)
+        game.update()
+        self.steps += 1
+
+        vitality = self.player_vitality()
+        score = game.player.score
+        reward = (score - self.score) * SCORE_REWARD - (self.vitality - vitality) * DAMAGE_PENALTY
+        self.vitality = vitality
+        self.score = score
+        if game.current_level != self.level:
+            reward += LEVEL_REWARD
+            self.level = game.current_level
+        terminated = game.game_state != "playing"
+        if game.game_state == "victory":
+            reward += VICTORY_REWARD
+        truncated = not terminated and self.steps >= self.max_steps
+        return reward, terminated, truncated, {"level": self.level, "score": score}
+
+    def observe(self, out):
+        """Write the observation vector into out"""
+        game = self.game
+        player = game.player
+        px = player.x + player.width / 2
+        py = player.y + player.height / 2
+        values = [
+            player.x / game.level_width, player.y / SCREEN_HEIGHT,
+            player.vel_x / player.speed, player.vel_y / -player.jump_power,
+            float(player.on_ground), 1.0 if player.facing_right else -1.0,
+            player.health / player.max_health, player.lives / 3,
+            float(player.can_shoot), float(player.invulnerable > 0), game.current_level / 3,
+        ]
+
+        # Rows lead with the distance so sorting compares plain numbers
+        enemies = sorted([(abs(dx), 1.0, dx / DISTANCE_SCALE, (e.y + e.height / 2 - py) / DISTANCE_SCALE,
+                           e.health / e.max_health, float(e.enemy_type == "boss"))
+                          for e in game.enemies if e.alive
+                          for dx in (e.x + e.width / 2 - px,)])[:ENEMY_SLOTS]
+        for row in enemies:
+            values += row[1:]
+        values += EMPTY_ENEMY * (ENEMY_SLOTS - len(enemies))
+
+        shots = sorted([(abs(dx), 1.0, dx / DISTANCE_SCALE, (shot.y - py) / DISTANCE_SCALE,
+                         float(shot.direction))
+                        for shot in game.enemy_projectiles
+                        for dx in (shot.x - px,)])[:SHOT_SLOTS]
+        for row in shots:
+            values += row[1:]
+        values += EMPTY_SHOT * (SHOT_SLOTS - len(shots))
+
+        items = sorted([(abs(dx), 1.0, dx / DISTANCE_SCALE, (c.y + 10 - py) / DISTANCE_SCALE,
+                         float(c.item_type == "health"), float(c.item_type == "life"))
+                        for c in game.collectibles if not c.collected
+                        for dx in (c.x + 10 - px,)])[:ITEM_SLOTS]
+        for row in items:
+            values += row[1:]
+        values += EMPTY_ITEM * (ITEM_SLOTS - len(items))
+        out[:] = values
+
+class VectorFoxEnv:
+    """N independent FoxEnv games stepped together with batched arrays.
+
+    Games that finish are reset straight away, the observation returned
+    for them is the first one of the new game and their last one is in
+    info["final_observation"], as with Gymnasium's vector environments.
+    The games still step one after another in Python, batching saves the
+    caller copying arrays but does not make a step cheaper.
+    """
+    observation_size = OBSERVATION_SIZE
+    action_count = ACTION_COUNT
+
+    def __init__(self, count, max_steps=5000):
+        # Each game writes its observation straight into its row
+        self.observations = np.zeros((count, OBSERVATION_SIZE), np.float32)
+        self.envs = [FoxEnv(max_steps, self.observations[index]) for index in range(count)]
+        self.rewards = np.zeros(count, np.float32)
+        self.terminated = np.zeros(count, bool)
+        self.truncated = np.zeros(count, bool)
+
+    def __len__(self):
+        return len(self.envs)
+
+    def reset(self, seed=None):
+        # Each game gets its own seed so they do not play in lockstep
+        for index, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + index)
+        return self.observations, {}
+
+    def step(self, actions):
+        """Step every game with its action, returns batched (observations, rewards, terminated, truncated, info)"""
+        rewards = self.rewards
+        info = {}
+        for index, (env, action) in enumerate(zip(self.envs, actions.tolist())):
+            observation, reward, terminated, truncated, env_info = env.step(action)
+            rewards[index] = reward
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            if terminated or truncated:
+                if not info:
+                    # Per game, None for games still running and masked by the underscored key
+                    count = len(self.envs)
+                    info = {"final_observation": np.full(count, None, object),
+                            "_final_observation": np.zeros(count, bool),
+                            "final_info": np.full(count, None, object),
+                            "_final_info": np.zeros(count, bool)}
+                # The reset below overwrites the game's row
+                info["final_observation"][index] = observation.copy()
+                info["final_info"][index] = env_info
+                info["_final_observation"][index] = info["_final_info"][index] = True
+                env.reset()
+        return self.observations, rewards, self.terminated, self.truncated, info
@@ -0,0 +1,123 @@
+import abc
+
+import pygame
+
+class HudWidget(abc.ABC):
+    """Base HUD widget bound to a value getter"""
+    def __init__(self, getter, pos):
+        self.getter = getter
+        self.pos = pos
+        self.value = None
+        self.surface = None
+        self.invalidations = 0
+
+    def refresh(self):
+        """Re-render if the bound value changed, returns True when it did"""
+        return self.set_value(self.getter())
+
+    def set_value(self, value):
+        """Re-render if value differs from the shown one, returns True when it did"""
+        if self.surface is not None and value == self.value:
+            return False
+        self.value = value
+        self.surface = self.render(value)
+        self.invalidations += 1
+        return True
+
+    @abc.abstractmethod
+    def render(self, value):
+        """Return a surface showing value"""
+
+class TextWidget(HudWidget):
+    """Text label formatted from the bound value"""
+    def __init__(self, font, template, getter, pos, color=(255, 255, 255)):
+        super().__init__(getter, pos)
+        self.font = font
+        self.template = template
+        self.color = color
+
+    def render(self, value):
+        if isinstance(value, tuple):
+            text = self.template.format(*value)
+        else:
+            text = self.template.format(value)
+        return self.font.render(text, True, self.color)
+
+class BarWidget(HudWidget):
+    """Filled bar, the getter returns a 0..1 ratio or None for empty"""
+    def __init__(self, getter, pos, size, back_color, fill_color):
+        super().__init__(getter, pos)
+        self.size = size
+        self.back_color = back_color
+        self.fill_color = fill_color
+
+    def render(self, ratio):
+        width, height = self.size
+        surface = pygame.Surface(self.size)
+        surface.fill(self.back_color)
+        if ratio is not None:
+            pygame.draw.rect(surface, self.fill_color, (0, 0, width * ratio, height))
+        return surface
+
+class HudLayer:
+    """Retained-mode HUD composed into its own surface"""
+    def __init__(self):
+        self.surface = None
+        self.origin = (0, 0)
+        self.widgets = []
+        self.compositions = 0
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        return widget
+
+    def sample(self):
+        """Current value of every widget, for drawing the HUD later or on another thread"""
+        return tuple(widget.getter() for widget in self.widgets)
+
+    def update(self, values=None):
+        """Refresh widgets and recompose only when one of them changed.
+
+        values, from sample(), replaces reading the getters.
+        """
+        if values is None:
+            values = self.sample()
+        changed = False
+        for widget, value in zip(self.widgets, values):
+            if widget.set_value(value):
+                changed = True
+        if changed or self.surface is None:
+            self.compose()
+
+    def compose(self):
+        """Compose all widgets into one surface covering their bounds"""
+        rects = [widget.surface.get_rect(topleft=widget.pos) for widget in self.widgets]
+        bounds = rects[0].unionall(rects[1:])
+        if self.surface is None or self.surface.get_size() != bounds.size:
+            self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        self.origin = bounds.topleft
+        self.surface.blits([
+            (widget.surface, (widget.pos[0] - bounds.x, widget.pos[1] - bounds.y))
+            for widget in self.widgets
+        ], False)
+        self.compositions += 1
+
+    def draw(self, screen, values=None):
+        """Blit the composed HUD in one call"""
+        if not self.widgets:
+            return
+        self.update(values)
+        screen.blit(self.surface, self.origin)
+
+    def invalidate(self):
+        """Force every widget to re-render on the next update"""
+        for widget in self.widgets:
+            widget.surface = None
+
+    def stats(self):
+        """Invalidation counts for profiling"""
+        return {
+            "compositions": self.compositions,
+            "widgets": [(type(widget).__name__, widget.invalidations) for widget in self.widgets],
+        }
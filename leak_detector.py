@@ -0,0 +1,95 @@
+import os
+import time
+import tracemalloc
+
+class LeakDetector:
+    """Samples traced memory and entity counts and warns on sustained growth"""
+    def __init__(self, interval=10.0, window=4, threshold_kb=256, top=5):
+        self.interval = interval  # Seconds between timed samples
+        self.window = window  # Consecutive growing samples before warning
+        self.threshold = threshold_kb * 1024  # Growth across the window that counts
+        self.top = top
+        self.samples = []  # (label, seconds, traced bytes, entity counts)
+        self.warnings = []
+        self.snapshot = None
+        self.last_sample = 0.0
+        self.started = 0.0
+
+    @classmethod
+    def from_environment(cls, variable="GAME_MEMORY_DEBUG"):
+        """Create a detector when the variable is set, its value is the interval"""
+        value = os.environ.get(variable)
+        if not value:
+            return None
+        try:
+            interval = float(value)
+        except ValueError:
+            interval = 10.0
+        return cls(interval=interval)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        self.last_sample = self.started
+        self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.snapshot = None
+
+    def __call__(self, game):
+        """Frame hook, samples once per interval"""
+        if time.perf_counter() - self.last_sample >= self.interval:
+            self.sample("timer", game.entity_counts())
+
+    def sample(self, label, counts):
+        """Record memory and entity counts, diffing against the previous sample"""
+        if self.snapshot is None:
+            self.start()
+        now = time.perf_counter()
+        self.last_sample = now
+        snapshot = tracemalloc.take_snapshot()
+        traced, _peak = tracemalloc.get_traced_memory()
+        differences = snapshot.compare_to(self.snapshot, "lineno")[:self.top]
+        self.snapshot = snapshot
+        self.samples.append((label, now - self.started, traced, dict(counts)))
+        self.check_growth(differences)
+        return differences
+
+    def check_growth(self, differences):
+        """Warn when memory or an entity count grew for a whole window"""
+        if len(self.samples) <= self.window:
+            return
+        recent = self.samples[-(self.window + 1):]
+        sizes = [sample[2] for sample in recent]
+        growing_memory = (all(b > a for a, b in zip(sizes, sizes[1:]))
+                          and sizes[-1] - sizes[0] >= self.threshold)
+
+        growing_groups = []
+        for name in recent[-1][3]:
+            counts = [sample[3].get(name, 0) for sample in recent]
+            if all(b > a for a, b in zip(counts, counts[1:])):
+                growing_groups.append(name)
+
+        if not growing_memory and not growing_groups:
+            return
+
+        label, seconds, traced, counts = recent[-1]
+        message = (f"Warning: sustained growth over {self.window} samples at {label} "
+                   f"({seconds:.0f}s): traced {traced / 1024:.0f} KiB")
+        if growing_memory:
+            message += f", +{(sizes[-1] - sizes[0]) / 1024:.0f} KiB"
+        if growing_groups:
+            message += ", growing groups " + ", ".join(f"{name}={counts[name]}" for name in growing_groups)
+        self.warnings.append(message)
+        print(message)
+        for difference in differences:
+            print(f"  {difference}")
+
+    def report(self):
+        """Print every sample with its memory and entity counts"""
+        for label, seconds, traced, counts in self.samples:
+            groups = " ".join(f"{name}={count}" for name, count in counts.items())
+            print(f"{seconds:8.1f}s {label:12} {traced / 1024:10.0f} KiB  {groups}")
@@ -0,0 +1,106 @@
+import pygame
+
+DOT_SIZE = 3
+
+def dot_rect(dot):
+    x, y, _color = dot
+    return pygame.Rect(x - DOT_SIZE // 2, y - DOT_SIZE // 2, DOT_SIZE, DOT_SIZE)
+
+class Minimap:
+    """Whole-level overview kept in one small surface.
+
+    The level's static content is rasterized once at the minimap's
+    resolution. Entities are sampled as dots every interval frames and
+    only dots that moved, appeared or went away are redrawn, by copying
+    the static layer back over their old spot and filling the new one.
+    When many dots moved the whole static layer is copied back instead.
+    sample() only reads entity positions, so with the pipeline it runs
+    on the simulation thread and update() on the render thread, like the
+    HUD's sample() and update(). The two share no state: sample() keeps
+    its own frame count and level, everything update() needs travels in
+    the sample.
+    """
+    def __init__(self, size, position, interval=6):
+        self.size = size
+        self.position = position
+        self.interval = interval
+        self.surface = pygame.Surface(size)
+        self.static = pygame.Surface(size)
+        self.level = None  # Level on the surface, update() only
+        self.sampled_level = None  # Level of the last sample, sample() only
+        self.dots = {}  # Entity id -> (x, y, color) in minimap pixels
+        self.rects = {}  # Entity id -> rect of the dot on the surface
+        self.frames = 0  # Since the last sample, sample() only
+        self.version = 0  # Bumped whenever the surface changes
+        self.redraws = 0  # Dots filled since the level started, for profiling
+
+    def sample(self, level, world_size, groups):
+        """Dots for update(), or None on frames between refreshes.
+
+        level is any key that changes with the static content. groups are
+        (entities, position, color) where position returns an entity's
+        world (x, y) and color is an RGB tuple or a function of the entity.
+        """
+        self.frames += 1
+        if self.frames < self.interval and level == self.sampled_level:
+            return None
+        self.frames = 0
+        self.sampled_level = level
+        width, height = self.size
+        scale_x = width / world_size[0]
+        scale_y = height / world_size[1]
+        dots = {}
+        for entities, position, color in groups:
+            fixed = not callable(color)
+            for entity in entities:
+                x, y = position(entity)
+                dots[id(entity)] = (int(x * scale_x), int(y * scale_y), color if fixed else color(entity))
+        return level, (scale_x, scale_y), dots
+
+    def reset(self):
+        """Redraw the level's static content and sample again on the next frame, only between frames"""
+        self.level = None
+        self.sampled_level = None
+
+    def update(self, values, draw_level):
+        """Apply a sample, draw_level(surface, level, scale) draws a new level's static content"""
+        if values is None:
+            return
+        level, scale, dots = values
+        surface = self.surface
+        bounds = surface.get_rect()
+        if level != self.level:
+            self.level = level
+            self.static.fill((0, 0, 0))
+            draw_level(self.static, level, scale)
+            surface.blit(self.static, (0, 0))
+            self.dots = {}
+            self.rects = {}
+            self.redraws = 0
+            self.version += 1
+        old = self.dots
+        rects = self.rects  # Left holding the dots that stayed put
+        changed = [key for key, dot in dots.items() if old.get(key) != dot]
+        erased = [rects.pop(key) for key, dot in old.items() if dots.get(key) != dot]
+        if len(changed) * 4 > len(dots):
+            # Starting over from the static layer is cheaper than erasing many dots
+            surface.blit(self.static, (0, 0))
+            changed = list(dots)
+        elif erased:
+            for rect in erased:
+                surface.blit(self.static, rect, rect)
+            # Erasing may have cut into dots that stayed put
+            changed.extend(key for key, rect in rects.items() if rect.collidelist(erased) != -1)
+        for key in changed:
+            dot = dots[key]
+            # Clipped, a blit from a rect hanging off the edge would shift the copy
+            rect = rects[key] = dot_rect(dot).clip(bounds)
+            surface.fill(dot[2], rect)
+        self.dots = dots
+        self.redraws += len(changed)
+        if changed or erased:
+            self.version += 1
+
+    def draw(self, screen, values, draw_level):
+        self.update(values, draw_level)
+        screen.blit(self.surface, self.position)
@@ -0,0 +1,91 @@
+import abc
+import threading
+from collections import namedtuple
+
+# Everything the renderer needs for one frame, built by the simulation thread.
+# layers holds frozen draw list commands, hud the HUD widget values and
+# started the perf_counter time the frame's update began.
+FrameSnapshot = namedtuple("FrameSnapshot", "tick layers hud minimap started")
+
+class SnapshotPipeline:
+    """Runs the simulation one frame ahead of rendering on a worker thread.
+
+    request() lets the worker run step() for the next frame while the
+    caller renders the current one, take() waits for the result. Snapshots
+    are double buffered: the worker fills the back slot while the front
+    slot is being rendered, and take() swaps them.
+    """
+    def __init__(self, step):
+        self.step = step
+        self.condition = threading.Condition()
+        self.buffers = [None, None]
+        self.front = 0
+        self.ready = False
+        self.requested = False
+        self.error = None
+        self.stopping = False
+        self.thread = threading.Thread(target=self.work, name="simulation", daemon=True)
+
+    @property
+    def pending(self):
+        """True while a requested frame has not been taken yet"""
+        return self.requested or self.ready
+
+    def request(self):
+        """Start simulating the next frame"""
+        if not self.thread.is_alive():
+            self.thread.start()
+        with self.condition:
+            self.requested = True
+            self.condition.notify_all()
+
+    def take(self):
+        """Wait for the requested frame and return its snapshot"""
+        with self.condition:
+            while not self.ready and self.error is None:
+                self.condition.wait()
+            if self.error is not None:
+                error, self.error = self.error, None
+                raise error
+            self.ready = False
+            self.front = 1 - self.front
+            return self.buffers[self.front]
+
+    def work(self):
+        condition = self.condition
+        while True:
+            with condition:
+                while not self.requested and not self.stopping:
+                    condition.wait()
+                if self.stopping:
+                    return
+                self.requested = False
+            try:
+                snapshot = self.step()
+            except Exception as e:
+                with condition:
+                    self.error = e
+                    condition.notify_all()
+                continue
+            with condition:
+                self.buffers[1 - self.front] = snapshot
+                self.ready = True
+                condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if self.thread.is_alive():
+            self.thread.join(timeout=2)
+
+class PipelinedGame(abc.ABC):
+    """Mixin for games that can run in pipelined mode, GameRuntime only starts a pipeline for these"""
+
+    @abc.abstractmethod
+    def simulate_frame(self):
+        """Update the game and return a FrameSnapshot, runs on the simulation thread"""
+
+    @abc.abstractmethod
+    def render_snapshot(self, snapshot):
+        """Draw a FrameSnapshot on the render thread"""
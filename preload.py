@@ -0,0 +1,85 @@
+import queue
+import threading
+import time
+
+class LevelPreloader:
+    """Builds the next level on a worker thread so that switching to it is a swap.
+
+    prepare(key, build) queues build() for the worker, take(key, build)
+    hands back its result when the keys match and otherwise builds on the
+    calling thread. take() waits for a build that is still running, so at
+    most one build runs at a time and builds can share state, such as a
+    random stream, that nothing else touches. retire() passes the level
+    being left to the worker so that freeing it is not part of the swap.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.jobs = queue.SimpleQueue()  # (build or None, objects to drop)
+        self.thread = None
+        self.ready = threading.Event()
+        self.ready.set()
+        self.key = None
+        self.result = None
+        self.error = None
+        self.hits = 0  # Levels taken from a finished preload
+        self.misses = 0  # Levels built when they were needed
+        self.swap_ms = 0.0  # Time the last take() held up the caller
+
+    def submit(self, build, retired=None):
+        # One long-lived worker, starting a thread per level would make the
+        # caller wait for the new thread to get going
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, name="level preload", daemon=True)
+            self.thread.start()
+        self.jobs.put((build, retired))
+
+    def work(self):
+        while True:
+            build, retired = self.jobs.get()
+            del retired
+            if build is None:
+                continue
+            try:
+                self.result = build()
+            except Exception as e:
+                self.error = e
+            self.ready.set()
+
+    def prepare(self, key, build):
+        """Start building the level for key in the background"""
+        if not self.enabled:
+            return
+        self.discard()
+        self.key = key
+        self.ready.clear()
+        self.submit(build)
+
+    def retire(self, objects):
+        """Drop objects on the worker thread"""
+        if self.enabled:
+            self.submit(None, objects)
+
+    def discard(self):
+        """Drop the preloaded level, waiting for its build to end"""
+        self.ready.wait()
+        self.key = None
+        self.result = None
+        self.error = None
+
+    def take(self, key, build):
+        """The level for key, preloaded when possible"""
+        start = time.perf_counter()
+        self.ready.wait()
+        if self.error is not None:
+            print(f"Warning: Preloading level {self.key} failed, building it now: {self.error}")
+        if self.key == key and self.error is None:
+            level = self.result
+            self.hits += 1
+        else:
+            level = build()
+            self.misses += 1
+        self.key = None
+        self.result = None
+        self.error = None
+        self.swap_ms = (time.perf_counter() - start) * 1000
+        return level
@@ -0,0 +1,166 @@
+import marshal
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+# Windows has neither SIGALRM nor interval timers
+TIMER_SAMPLING = hasattr(signal, "SIGALRM") and hasattr(signal, "setitimer")
+
+class ProfileCapture:
+    """Samples stacks from a wall-clock interval timer for a fixed time.
+
+    SIGALRM interrupts the main thread every interval and the handler
+    records its stack plus those of the other threads, so nothing is
+    hooked into the profiled code and no cost is paid between samples.
+    Where there is no SIGALRM a sampler thread wakes every interval and
+    reads the stacks from sys._current_frames() instead, which is
+    coarser as it has to wait for the GIL. label() is read with every
+    sample and becomes the root of its stack, so flamegraphs split by
+    game state and level. When the time is up, or on stop(), the samples
+    are written on a background thread as a pstats file and as collapsed
+    stacks. Must be started from the main thread.
+    """
+    def __init__(self, path, label, seconds=10.0, interval=0.002, timer=None):
+        self.path = path  # Output path without extension
+        self.label = label
+        self.seconds = seconds
+        self.interval = interval
+        self.timer = TIMER_SAMPLING if timer is None else timer  # False samples from a thread
+        self.stacks = Counter()  # Tuple of code keys, root first -> samples
+        self.samples = 0
+        self.deadline = 0.0
+        self.active = False
+        self.previous_handler = None
+        self.sampler = None
+        self.writer = None
+        self.lock = threading.RLock()  # Reentrant, SIGALRM can arrive while stop() holds it
+
+    def start(self):
+        self.deadline = time.perf_counter() + self.seconds
+        self.active = True
+        if self.timer:
+            self.previous_handler = signal.signal(signal.SIGALRM, self.on_sample)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            self.sampler = threading.Thread(target=self.sample_loop, name="profile sampler", daemon=True)
+            self.sampler.start()
+
+    def stop(self):
+        """End the capture early, the files are written before this returns"""
+        self.finish()
+        if self.sampler is not None:
+            self.sampler.join()
+        if self.writer is not None:
+            self.writer.join()
+
+    def finish(self):
+        # The sampler thread and stop() can both get here
+        with self.lock:
+            if not self.active:
+                return
+            self.active = False
+        if self.timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous_handler or signal.SIG_DFL)
+        self.writer = threading.Thread(target=self.write, name="profile writer")
+        self.writer.start()
+
+    def on_sample(self, signum, frame):
+        if time.perf_counter() >= self.deadline:
+            self.finish()
+            return
+        self.sample(frame)
+
+    def sample_loop(self):
+        main = threading.main_thread()
+        while self.active:
+            time.sleep(self.interval)
+            if time.perf_counter() >= self.deadline:
+                self.finish()
+                return
+            frame = sys._current_frames().get(main.ident)
+            # Under the lock, so no sample lands once the writer has started
+            with self.lock:
+                if self.active and frame is not None:
+                    self.sample(frame)
+
+    def sample(self, frame):
+        """Record frame, the main thread's, and the stacks of the other threads"""
+        root = ("", 0, self.label())
+        main = threading.main_thread()
+        self.record(root, main.name, frame)
+        names = None
+        sampler = threading.get_ident()
+        for ident, other in sys._current_frames().items():
+            if ident == main.ident or ident == sampler:
+                continue
+            if names is None:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            self.record(root, names.get(ident, str(ident)), other)
+        self.samples += 1
+
+    def record(self, root, thread_name, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack.append(("", 0, thread_name))
+        stack.append(root)
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+
+    def write(self):
+        try:
+            self.write_collapsed(f"{self.path}.folded")
+            self.write_pstats(f"{self.path}.pstats")
+        except OSError as e:
+            print(f"Warning: Could not write profile: {e}")
+            return
+        print(f"Profile: {self.samples} samples written to {self.path}.pstats and {self.path}.folded")
+
+    def write_collapsed(self, path):
+        """One 'root;caller;callee count' line per distinct stack, for flamegraph.pl or speedscope"""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                frames = ";".join(frame_name(key) for key in stack)
+                f.write(f"{frames} {count}\n")
+
+    def write_pstats(self, path):
+        """Write samples in the marshal format pstats.Stats loads.
+
+        Times are sample counts times the interval. Call counts are the
+        number of samples a function appeared in, since sampling cannot
+        count calls.
+        """
+        own = Counter()
+        total = Counter()
+        callers = {}
+        for stack, count in self.stacks.items():
+            # Skip the label and thread name at the root
+            frames = stack[2:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for key in set(frames):
+                total[key] += count
+            for caller, callee in set(zip(frames, frames[1:])):
+                edges = callers.setdefault(callee, Counter())
+                edges[caller] += count
+        interval = self.interval
+        stats = {}
+        for key, count in total.items():
+            edges = {caller: (samples, samples, 0.0, samples * interval)
+                     for caller, samples in callers.get(key, {}).items()}
+            stats[key] = (count, count, own[key] * interval, count * interval, edges)
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+
+def frame_name(key):
+    filename, line, name = key
+    if not filename:
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
@@ -0,0 +1,122 @@
+import threading
+from collections import deque
+
+# Quality tiers, from full detail down to the cheapest drawing path
+QUALITY_FULL = 0
+QUALITY_NO_GLOW = 1
+QUALITY_NO_HEALTH_BARS = 2
+QUALITY_NO_BOBBING = 3
+
+TIER_NAMES = {
+    QUALITY_FULL: "full",
+    QUALITY_NO_GLOW: "no glow",
+    QUALITY_NO_HEALTH_BARS: "no health bars",
+    QUALITY_NO_BOBBING: "no bobbing",
+}
+
+class QualitySettings:
+    """Drawing detail for one frame, copied from the governor so it holds still while the frame is built"""
+    def __init__(self, tier):
+        self.tier = tier
+
+    @property
+    def draw_glow(self):
+        return self.tier < QUALITY_NO_GLOW
+
+    @property
+    def draw_health_bars(self):
+        return self.tier < QUALITY_NO_HEALTH_BARS
+
+    @property
+    def animate_bobbing(self):
+        return self.tier < QUALITY_NO_BOBBING
+
+class QualityGovernor:
+    """Adjusts drawing detail so frames stay within the time budget.
+
+    record() runs after each frame on the main thread. Code that builds a
+    frame on another thread, such as the pipelined simulation, reads a
+    settings() copy instead of the governor.
+
+    Every tier change is kept in history, but only printed once the tier
+    has held for announce_after frames, so a frame time hovering around
+    the budget does not flood the console.
+    """
+    def __init__(self, fps=60, window=30, headroom=0.6, cooldown=60, announce_after=300):
+        self.budget_ms = 1000.0 / fps
+        self.samples = deque(maxlen=window)
+        self.total_ms = 0
+        self.headroom = headroom  # Step up when below this fraction of budget
+        self.cooldown = cooldown  # Frames to wait between tier changes
+        self.frames_since_change = 0
+        self.frame_count = 0
+        self.announce_after = announce_after
+        self.tier = QUALITY_FULL
+        self.announced_tier = QUALITY_FULL
+        self.history = []  # (frame, old_tier, new_tier, average_ms)
+        self.lock = threading.RLock()  # record() calls set_tier()
+
+    @property
+    def tier_name(self):
+        return TIER_NAMES[self.tier]
+
+    def settings(self):
+        """Consistent copy of the current tier for building one frame"""
+        with self.lock:
+            return QualitySettings(self.tier)
+
+    @property
+    def draw_glow(self):
+        return self.tier < QUALITY_NO_GLOW
+
+    @property
+    def draw_health_bars(self):
+        return self.tier < QUALITY_NO_HEALTH_BARS
+
+    @property
+    def animate_bobbing(self):
+        return self.tier < QUALITY_NO_BOBBING
+
+    @property
+    def average_ms(self):
+        if not self.samples:
+            return 0.0
+        return self.total_ms / len(self.samples)
+
+    def record(self, frame_ms):
+        """Record the raw time of the last frame and re-evaluate the tier"""
+        with self.lock:
+            if len(self.samples) == self.samples.maxlen:
+                self.total_ms -= self.samples[0]
+            self.samples.append(frame_ms)
+            self.total_ms += frame_ms
+            self.frame_count += 1
+            self.frames_since_change += 1
+            if self.tier != self.announced_tier and self.frames_since_change >= self.announce_after:
+                self.announce()
+
+            # Only decide once the window is full and the last change has settled
+            if len(self.samples) < self.samples.maxlen or self.frames_since_change < self.cooldown:
+                return
+
+            average = self.average_ms
+            if average > self.budget_ms and self.tier < QUALITY_NO_BOBBING:
+                self.set_tier(self.tier + 1)
+            elif average < self.budget_ms * self.headroom and self.tier > QUALITY_FULL:
+                self.set_tier(self.tier - 1)
+
+    def set_tier(self, tier):
+        """Switch to a quality tier and record the change in history"""
+        with self.lock:
+            tier = max(QUALITY_FULL, min(QUALITY_NO_BOBBING, tier))
+            if tier == self.tier:
+                return
+            self.history.append((self.frame_count, self.tier, tier, self.average_ms))
+            self.tier = tier
+            self.frames_since_change = 0
+
+    def announce(self):
+        """Print the tier the governor settled on"""
+        print(f"Quality: {TIER_NAMES[self.announced_tier]} -> {TIER_NAMES[self.tier]} "
+              f"(avg frame {self.average_ms:.1f} ms, budget {self.budget_ms:.1f} ms)")
+        self.announced_tier = self.tier
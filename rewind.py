@@ -0,0 +1,200 @@
+from array import array
+
+import numpy as np
+
+# Every tick stores three uint32 stream ends in Segment.offsets
+TICK_BYTES = 12
+
+def delta_bytes(changed, removed, added):
+    """Bytes taken by changed cells (id, column, value), removed ids and added row values"""
+    return 13 * changed + 4 * removed + 8 * added
+
+class Segment:
+    """A keyframe and the deltas of the ticks after it, packed into flat arrays.
+
+    Tick i of the segment (i >= 1) is stored as the changed cells (entity
+    id, column, value), the ids of removed rows and the full rows of added
+    entities. Each stream grows by one slice per tick, offsets records
+    where each tick's slices end.
+    """
+    def __init__(self, keyframe):
+        self.keyframe = keyframe
+        self.width = keyframe.shape[1]
+        self.changed_ids = array("i")
+        self.changed_columns = array("B")
+        self.changed_values = array("d")
+        self.removed = array("i")
+        self.added = array("d")
+        self.offsets = array("I", [0, 0, 0])  # Per tick: changed, removed, added ends
+        self.ticks = 1
+        self.nbytes = keyframe.nbytes + TICK_BYTES
+
+    def append(self, previous, table):
+        """Store table as a delta from previous, returns the bytes it took"""
+        previous_ids = previous[:, 0]
+        ids = table[:, 0]
+        if len(previous_ids) == len(ids) and (previous_ids == ids).all():
+            # Same entities as last tick, the common case
+            common = ids
+            old = previous
+            new = table
+        else:
+            common, previous_rows, rows = np.intersect1d(previous_ids, ids, assume_unique=True,
+                                                         return_indices=True)
+            old = previous[previous_rows]
+            new = table[rows]
+            if len(common) < len(previous_ids):
+                removed = np.setdiff1d(previous_ids, common, assume_unique=True)
+                self.removed.frombytes(removed.astype(np.int32).tobytes())
+            if len(common) < len(ids):
+                added = table[~np.isin(ids, common, assume_unique=True)]
+                self.added.frombytes(added.tobytes())
+        changed_rows, columns = np.nonzero(old != new)
+        self.changed_ids.frombytes(common[changed_rows].astype(np.int32).tobytes())
+        self.changed_columns.frombytes(columns.astype(np.uint8).tobytes())
+        self.changed_values.frombytes(new[changed_rows, columns].tobytes())
+
+        offsets = self.offsets
+        changed_start, removed_start, added_start = offsets[-3:]
+        offsets.extend((len(self.changed_ids), len(self.removed), len(self.added)))
+        size = delta_bytes(len(self.changed_ids) - changed_start, len(self.removed) - removed_start,
+                           len(self.added) - added_start) + TICK_BYTES
+        self.ticks += 1
+        self.nbytes += size
+        return size
+
+    def decode(self):
+        """Rebuild every tick's table, oldest first"""
+        tables = [self.keyframe]
+        table = self.keyframe
+        offsets = self.offsets
+        for tick in range(1, self.ticks):
+            start = 3 * (tick - 1)
+            changed_start, removed_start, added_start = offsets[start:start + 3]
+            changed_end, removed_end, added_end = offsets[start + 3:start + 6]
+            table = table.copy()
+            if removed_end > removed_start:
+                removed = np.frombuffer(self.removed, np.int32, removed_end - removed_start, 4 * removed_start)
+                table = table[~np.isin(table[:, 0], removed)]
+            if changed_end > changed_start:
+                count = changed_end - changed_start
+                ids = np.frombuffer(self.changed_ids, np.int32, count, 4 * changed_start)
+                columns = np.frombuffer(self.changed_columns, np.uint8, count, changed_start)
+                values = np.frombuffer(self.changed_values, np.float64, count, 8 * changed_start)
+                table[np.searchsorted(table[:, 0], ids), columns] = values
+            if added_end > added_start:
+                added = np.frombuffer(self.added, np.float64, added_end - added_start, 8 * added_start)
+                table = np.concatenate((table, added.reshape(-1, self.width)))
+                table = table[np.argsort(table[:, 0], kind="stable")]
+            tables.append(table)
+        return tables
+
+    def truncate(self, ticks):
+        """Keep only the first ticks ticks"""
+        offsets = self.offsets
+        changed_end, removed_end, added_end = offsets[3 * (ticks - 1):3 * ticks]
+        del self.changed_ids[changed_end:], self.changed_columns[changed_end:]
+        del self.changed_values[changed_end:], self.removed[removed_end:], self.added[added_end:]
+        del offsets[3 * ticks:]
+        self.ticks = ticks
+        # Counted the way append() counts, so the buffer's total stays in step
+        self.nbytes = self.keyframe.nbytes + delta_bytes(changed_end, removed_end, added_end) + TICK_BYTES * ticks
+
+class RewindBuffer:
+    """Ring of keyframes plus per-tick deltas of entity state tables.
+
+    A table is one row per entity: its id, then numeric fields. Ids must be
+    unique and stable across ticks. Old segments are dropped to stay within
+    seconds of history and max_bytes.
+    """
+    def __init__(self, seconds=10, fps=60, keyframe_interval=30, max_bytes=4 * 2**20):
+        self.capacity = int(seconds * fps)
+        self.fps = fps
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes = max_bytes
+        self.segments = []
+        self.ticks = 0
+        self.nbytes = 0
+        self.previous = None
+        self.cursor = None  # Ticks back from the newest while scrubbing
+        self.decoded = {}  # Segment -> decoded tables while scrubbing
+        self.recorded = 0
+        self.recorded_bytes = 0
+
+    def bytes_per_second(self):
+        """Average storage cost of recording at the buffer's frame rate"""
+        if not self.recorded:
+            return 0.0
+        return self.recorded_bytes / self.recorded * self.fps
+
+    def clear(self):
+        self.segments = []
+        self.ticks = 0
+        self.nbytes = 0
+        self.previous = None
+        self.cursor = None
+        self.decoded = {}
+
+    def record(self, rows):
+        """Add the newest tick from a list of (id, field, ...) rows"""
+        if self.cursor is not None:
+            self.resume()
+        table = np.array(rows, np.float64)
+        table = table[np.argsort(table[:, 0], kind="stable")]
+        if (self.previous is None or self.previous.shape[1] != table.shape[1]
+                or self.segments[-1].ticks >= self.keyframe_interval):
+            segment = Segment(table)
+            self.segments.append(segment)
+            added = segment.nbytes
+        else:
+            added = self.segments[-1].append(self.previous, table)
+        self.previous = table
+        self.ticks += 1
+        self.nbytes += added
+        self.recorded += 1
+        self.recorded_bytes += added
+
+        # Drop whole segments from the old end
+        segments = self.segments
+        while len(segments) > 1 and (self.ticks - segments[0].ticks >= self.capacity
+                                     or self.nbytes > self.max_bytes):
+            oldest = segments.pop(0)
+            self.ticks -= oldest.ticks
+            self.nbytes -= oldest.nbytes
+
+    def step_back(self, ticks=1):
+        """Move ticks further into the past and return that tick's table, None when empty"""
+        if not self.ticks:
+            return None
+        self.cursor = min(self.ticks - 1, (self.cursor or 0) + ticks)
+        return self.table_at(self.ticks - 1 - self.cursor)
+
+    def table_at(self, index):
+        """Table of the index-th stored tick, oldest first"""
+        for segment in self.segments:
+            if index < segment.ticks:
+                tables = self.decoded.get(segment)
+                if tables is None:
+                    tables = self.decoded[segment] = segment.decode()
+                return tables[index]
+            index -= segment.ticks
+        raise IndexError(index)
+
+    def resume(self):
+        """Forget the ticks after the scrub position so recording continues from it"""
+        if self.cursor is None:
+            return
+        keep = self.ticks - self.cursor
+        self.previous = self.table_at(keep - 1)
+        while self.ticks - self.segments[-1].ticks >= keep:
+            dropped = self.segments.pop()
+            self.ticks -= dropped.ticks
+            self.nbytes -= dropped.nbytes
+        segment = self.segments[-1]
+        self.ticks -= segment.ticks
+        self.nbytes -= segment.nbytes
+        segment.truncate(keep - self.ticks)
+        self.ticks += segment.ticks
+        self.nbytes += segment.nbytes
+        self.cursor = None
+        self.decoded = {}
@@ -0,0 +1,72 @@
+import os
+import zlib
+
+import numpy as np
+
+class RandomStream:
+    """Seeded random numbers for one subsystem, generated in NumPy batches.
+
+    A batch of floats in [0, 1) is drawn at once and handed out one at a
+    time, so a call costs an iterator step instead of a generator call.
+    """
+    def __init__(self, seed_sequence, batch=4096):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.batch = batch
+        self.next_value = iter(()).__next__
+        self.refills = 0
+
+    def refill(self):
+        self.next_value = iter(self.generator.random(self.batch).tolist()).__next__
+        self.refills += 1
+
+    def random(self):
+        """Float in [0, 1)"""
+        try:
+            return self.next_value()
+        except StopIteration:
+            self.refill()
+            return self.next_value()
+
+    def randint(self, low, high):
+        """Integer in [low, high], both ends included like random.randint"""
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, sequence):
+        return sequence[int(self.random() * len(sequence))]
+
+class RandomService:
+    """Independent seeded streams per subsystem, all derived from one seed.
+
+    Streams are keyed by name, so adding a stream or drawing more from one
+    never shifts the numbers another stream produces.
+    """
+    def __init__(self, seed=None, batch=4096):
+        self.batch = batch
+        self.seed(seed)
+
+    @classmethod
+    def from_environment(cls, variable="GAME_SEED"):
+        """Service seeded from the variable, or from fresh entropy when it is not set"""
+        value = os.environ.get(variable)
+        if not value:
+            return cls()
+        try:
+            return cls(int(value))
+        except ValueError:
+            print(f"Warning: {variable} must be an integer, using a random seed")
+            return cls()
+
+    def seed(self, seed=None):
+        """Restart every stream from seed, a fresh random seed when None"""
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed_value = seed
+        self.streams = {}
+
+    def stream(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            # crc32 rather than hash() so names map to the same stream in every process
+            sequence = np.random.SeedSequence([self.seed_value, zlib.crc32(name.encode())])
+            stream = self.streams[name] = RandomStream(sequence, self.batch)
+        return stream
@@ -0,0 +1,422 @@
+import os
+import signal
+import time
+import traceback
+from operator import attrgetter
+
+import pygame
+
+from collision import first_swept_hit
+from entity_list import EntityList
+from preload import LevelPreloader
+from rng import RandomService
+from scheduler import Scheduler
+from startup import init_pygame
+
+RECT = attrgetter("rect")
+
+# F9 or SIGUSR1 starts a profile capture, pressing or signalling again ends it early
+PROFILE_KEY = pygame.K_F9
+PROFILE_EVENT = pygame.event.custom_type()
+
+def is_alive(entity):
+    return getattr(entity, "alive", True)
+
+def entity_group(name):
+    """Game attribute backed by the runtime's entity group table, lists are stored as EntityLists"""
+    def get(self):
+        return self.groups[name]
+
+    def set(self, entities):
+        if not isinstance(entities, EntityList):
+            entities = EntityList(entities)
+        self.groups[name] = entities
+
+    return property(get, set)
+
+class GameRuntime:
+    """Main loop, entity storage and update/collide/draw pipeline shared by both games"""
+    # Group name -> (attribute, every value it takes), telemetry counts these groups per type
+    entity_types = {}
+
+    def __init__(self, width, height, caption, fps=60, headless=False):
+        # Headless games only simulate, they open no window and never draw
+        self.headless = headless
+        self.backend = None
+        if headless:
+            self.screen = None
+        else:
+            self.open_display(width, height, caption)
+
+        # Short name used for telemetry and capture files, e.g. tank_battle
+        self.name = caption.split(" - ")[0].lower().replace(" ", "_")
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.running = True
+        self.update_ms = 0.0
+        self.draw_ms = 0.0
+        self.latency_ms = 0.0  # From reading input to presenting its frame
+        self.telemetry = None
+        self.pipeline = None
+        self.profile = None
+
+        # Gameplay analytics, enabled with GAME_ANALYTICS=<directory>
+        self.analytics = None
+        if os.environ.get("GAME_ANALYTICS"):
+            from analytics import AnalyticsLog
+            self.analytics = AnalyticsLog.from_environment(self.name)
+            if self.analytics is not None:
+                self.analytics.start()
+        self.groups = {}
+        self.frame_hooks = []
+
+        # Static screens such as menus, see static_screen
+        self.idle_timeout_ms = 250
+        self.static_key = None
+        self.static_draws = 0  # Times a static screen was drawn
+
+        # Timed events such as shot cooldowns, games choose the clock units
+        self.scheduler = Scheduler()
+
+        # Seeded random streams per subsystem, GAME_SEED=<int> makes runs repeatable
+        self.rng = RandomService.from_environment()
+
+        # Next level built in the background, GAME_PRELOAD=0 builds levels when they start
+        self.level_loader = LevelPreloader(os.environ.get("GAME_PRELOAD") != "0")
+
+        # Memory debug mode, enabled with GAME_MEMORY_DEBUG=<seconds>
+        self.leak_detector = None
+        if os.environ.get("GAME_MEMORY_DEBUG"):
+            from leak_detector import LeakDetector
+            self.leak_detector = LeakDetector.from_environment()
+            if self.leak_detector is not None:
+                self.leak_detector.start()
+                self.add_frame_hook(self.leak_detector)
+
+    def open_display(self, width, height, caption):
+        # Initialize only the subsystems we use
+        init_pygame()
+        if not pygame.display.get_init():
+            raise RuntimeError("Pygame failed to initialize")
+
+        # Optional SDL2 Renderer backend, enabled with GAME_RENDERER=sdl2
+        if os.environ.get("GAME_RENDERER") == "sdl2":
+            from sdl2_backend import Sdl2Backend
+            self.backend = Sdl2Backend((width, height), caption)
+            # Screens that are not batched are drawn here and uploaded
+            self.screen = pygame.Surface((width, height))
+            return
+
+        # Lower internal resolution for the playing screen, enabled with
+        # GAME_RENDER_SCALE=<factor> or <width>x<height>, GAME_RENDER_SMOOTH=1 smooths the upscale
+        render_scale = os.environ.get("GAME_RENDER_SCALE")
+        if render_scale:
+            from scaled_backend import ScaledBackend, parse_render_size
+            try:
+                render_size = parse_render_size(render_scale, (width, height))
+            except ValueError as e:
+                print(f"Warning: Ignoring GAME_RENDER_SCALE={render_scale}: {e}")
+            else:
+                self.backend = ScaledBackend((width, height), caption, render_size,
+                                             bool(os.environ.get("GAME_RENDER_SMOOTH")))
+                # Menus and other screens draw straight to the window
+                self.screen = self.backend.window
+                return
+
+        self.screen = pygame.display.set_mode((width, height))
+        if not self.screen:
+            raise RuntimeError("Failed to create display surface")
+        pygame.display.set_caption(caption)
+
+    def ticks(self):
+        """Milliseconds of SDL time, games read the clock here so it can be replaced"""
+        return pygame.time.get_ticks()
+
+    # Entity pipeline
+
+    def log_event(self, event, kind, value=0.0, x=0.0):
+        """Record a gameplay event for analytics, tagged with the current level"""
+        if self.analytics is not None:
+            self.analytics.append(event, getattr(self, "current_level", 0), kind, value, x)
+
+    def entity_counts(self):
+        return {name: len(entities) for name, entities in self.groups.items()}
+
+    def mark_level(self, label):
+        """Sample memory at a level boundary when memory debugging is on"""
+        if self.leak_detector is not None:
+            self.leak_detector.sample(label, self.entity_counts())
+
+    def update_group(self, name, *args):
+        """Update every entity in a group and return what they spawned"""
+        spawned = []
+        for entity in self.groups[name]:
+            result = entity.update(*args)
+            if result:
+                if isinstance(result, list):
+                    spawned.extend(result)
+                else:
+                    spawned.append(result)
+        return spawned
+
+    def cull_group(self, name, keep):
+        """Keep only the entities for which keep(entity) is true"""
+        self.groups[name].retain(keep)
+
+    def collide_group(self, name, targets, on_hit, rect_of=RECT, accept=None, refine=None):
+        """Remove each projectile in a group that hits a live target.
+
+        Hits are found by sweeping the projectile's rect over its last
+        move (projectile.last_move), so fast shots cannot tunnel through
+        targets between ticks. A projectile hits only the earliest target
+        along its path and on_hit(projectile, target) is called for that pair.
+        refine is passed on to first_swept_hit for finer hit tests.
+        """
+        projectiles = self.groups[name]
+        if not projectiles:
+            return
+        # Targets do not move while collisions are resolved
+        targets = [target for target in targets if is_alive(target)]
+        target_rects = [rect_of(target) for target in targets]
+        # Slots present now, shots fired from on_hit wait for the next tick
+        slots = projectiles.slots
+        for slot in range(len(slots)):
+            projectile = slots[slot]
+            if projectile is None or (accept is not None and not accept(projectile)):
+                continue
+            target = first_swept_hit(rect_of(projectile), projectile.last_move,
+                                     targets, target_rects, is_alive, refine)
+            if target is not None:
+                on_hit(projectile, target)
+                projectiles.discard_at(slot)
+        projectiles.compact()
+
+    def collect_group(self, name, player_rect, on_collect, rect_of=RECT):
+        """Mark collectibles touching the player as collected"""
+        for collectible in self.groups[name]:
+            if not collectible.collected and rect_of(collectible).colliderect(player_rect):
+                collectible.collected = True
+                on_collect(collectible)
+
+    def draw_group(self, name, *args, visible=None):
+        """Draw a group, skipping entities rejected by visible(entity)"""
+        for entity in self.groups[name]:
+            if visible is None or visible(entity):
+                entity.draw(*args)
+
+    # Main loop
+
+    def add_frame_hook(self, hook):
+        """Call hook(runtime) after every frame"""
+        self.frame_hooks.append(hook)
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            self.dispatch_event(event)
+
+    def dispatch_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+            return
+        if event.type == PROFILE_EVENT or (event.type == pygame.KEYDOWN and event.key == PROFILE_KEY):
+            self.toggle_profile()
+            return
+        if event.type == pygame.WINDOWEXPOSED:
+            # The window lost its contents, draw the static screen again
+            self.static_key = None
+        self.handle_event(event)
+
+    def handle_event(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self):
+        pass
+
+    def present(self):
+        """Show the finished frame"""
+        if self.backend is None:
+            pygame.display.flip()
+        elif self.backend.batched:
+            self.backend.end()
+        else:
+            self.backend.present_surface(self.screen)
+
+    def static_screen(self):
+        """Key describing what a static screen shows, None while the screen animates.
+
+        Screens with a key are drawn once and only drawn again when the
+        key changes, the loop sleeps on input in between.
+        """
+        return None
+
+    def run_frame(self):
+        """Run one iteration of the main loop"""
+        if self.pipeline is not None and self.pipeline_active():
+            self.run_pipelined_frame()
+            return
+        if not self.headless and self.static_screen() is not None:
+            self.run_idle_frame()
+            return
+        self.static_key = None
+        start = time.perf_counter()
+        self.handle_events()
+        self.update()
+        updated = time.perf_counter()
+        self.draw()
+        self.present()
+        presented = time.perf_counter()
+        self.update_ms = (updated - start) * 1000
+        self.draw_ms = (presented - updated) * 1000
+        self.latency_ms = (presented - start) * 1000
+        self.end_frame()
+
+    def run_idle_frame(self):
+        """Block until input arrives, redrawing only when the static screen changed"""
+        start = time.perf_counter()
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type != pygame.NOEVENT:
+            self.dispatch_event(event)
+        self.handle_events()
+        updated = time.perf_counter()
+        key = self.static_screen()
+        if key is not None and key != self.static_key:
+            self.draw()
+            self.present()
+            self.static_key = key
+            self.static_draws += 1
+        presented = time.perf_counter()
+        self.update_ms = (updated - start) * 1000  # Mostly time asleep
+        self.draw_ms = (presented - updated) * 1000
+        self.latency_ms = self.draw_ms
+        # The wait paces the loop, ticking without a frame cap keeps the clock current
+        self.clock.tick()
+        for hook in self.frame_hooks:
+            hook(self)
+
+    def end_frame(self):
+        self.clock.tick(self.fps)
+        for hook in self.frame_hooks:
+            hook(self)
+
+    # Pipelined mode, the next frame simulates on a worker thread while this one renders.
+    # Experimental and off unless GAME_PIPELINE is set: anything simulate_frame reads that the
+    # main thread also writes has to reach it through the snapshot or a lock.
+
+    def start_pipeline(self):
+        """Run the simulation on its own thread when GAME_PIPELINE is set, experimental"""
+        if not os.environ.get("GAME_PIPELINE"):
+            return
+        from pipeline import PipelinedGame, SnapshotPipeline
+        if not isinstance(self, PipelinedGame):
+            return
+        if self.backend is not None:
+            print("Warning: GAME_PIPELINE needs the default renderer, running serially")
+            return
+        self.pipeline = SnapshotPipeline(self.simulate_frame)
+
+    def pipeline_active(self):
+        """Whether the current frame should go through the pipeline"""
+        return True
+
+    def run_pipelined_frame(self):
+        start = time.perf_counter()
+        pipeline = self.pipeline
+        if not pipeline.pending:
+            pipeline.request()
+        snapshot = pipeline.take()
+        simulated = time.perf_counter()
+        # The simulation thread is idle until the next request
+        self.handle_events()
+        if self.running and self.pipeline_active():
+            pipeline.request()
+        self.render_snapshot(snapshot)
+        self.present()
+        presented = time.perf_counter()
+        self.update_ms = (simulated - start) * 1000  # Time spent waiting on the simulation
+        self.draw_ms = (presented - simulated) * 1000
+        self.latency_ms = (presented - snapshot.started) * 1000
+        self.end_frame()
+
+    def handle_frame_error(self, error):
+        """Called when a frame raises, re-raise to stop the loop"""
+        raise error
+
+    # Profiling, costs nothing until a capture starts
+
+    def install_profile_signal(self):
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self.on_profile_signal)
+
+    def on_profile_signal(self, signum, frame):
+        # Only post an event, the capture starts from the main loop
+        pygame.event.post(pygame.event.Event(PROFILE_EVENT))
+
+    def profile_label(self):
+        """Game state and level, tagged onto profile samples and file names"""
+        return "running"
+
+    def toggle_profile(self):
+        """Start a capture of GAME_PROFILE_SECONDS (default 10), or end the running one"""
+        if self.profile is not None and self.profile.active:
+            self.profile.stop()
+            return
+        try:
+            seconds = float(os.environ.get("GAME_PROFILE_SECONDS", 10))
+        except ValueError:
+            seconds = 10.0
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        label = self.profile_label().replace(" ", "-")
+        path = os.path.join(os.environ.get("GAME_PROFILE_DIR", "."), f"{self.name}-{stamp}-{label}")
+        from profiler import ProfileCapture
+        self.profile = ProfileCapture(path, self.profile_label, seconds)
+        self.profile.start()
+        print(f"Profile: capturing {seconds:g} s")
+
+    def start_telemetry(self):
+        """Start publishing frame metrics when GAME_TELEMETRY is set"""
+        if not os.environ.get("GAME_TELEMETRY"):
+            return
+        from telemetry import Telemetry
+        self.telemetry = Telemetry.from_environment(self.name, self.groups, self.entity_types)
+        if self.telemetry is not None:
+            self.telemetry.start()
+            self.add_frame_hook(self.telemetry)
+
+    def shutdown(self):
+        if self.profile is not None:
+            self.profile.stop()
+        if self.analytics is not None:
+            self.analytics.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        if self.leak_detector is not None:
+            self.leak_detector.report()
+            self.leak_detector.stop()
+        try:
+            pygame.quit()
+        except Exception as e:
+            print(f"Error during cleanup: {e}")
+
+    def run(self):
+        """Main game loop"""
+        try:
+            self.start_telemetry()
+            self.start_pipeline()
+            self.install_profile_signal()
+            while self.running:
+                try:
+                    self.run_frame()
+                except Exception as e:
+                    self.handle_frame_error(e)
+        except KeyboardInterrupt:
+            print("Game interrupted by user")
+        except Exception as e:
+            print(f"Critical error in main game loop: {e}")
+            traceback.print_exc()
+        finally:
+            self.shutdown()
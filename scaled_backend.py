@@ -0,0 +1,115 @@
+import pygame
+
+from drawlist import LAYER_HUD, DrawList, SpriteSheet, flush_layers
+
+def parse_render_size(value, size):
+    """Internal render size from a scale factor like 0.5 or a size like 600x400"""
+    if "x" in value:
+        width, height = (int(part) for part in value.split("x"))
+    else:
+        scale = float(value)
+        width, height = round(size[0] * scale), round(size[1] * scale)
+    if not (0 < width <= size[0] and 0 < height <= size[1]):
+        raise ValueError(f"render size {width}x{height} must fit inside the {size[0]}x{size[1]} window")
+    return width, height
+
+class ScaledBackend:
+    """Software backend that draws the world at a lower internal resolution.
+
+    Layers below LAYER_HUD go to an offscreen surface of render_size using
+    sprites pre-scaled to match, which is upscaled to the window once per
+    frame. HUD layers and overlays are drawn on top at window resolution
+    so text stays sharp. Other screens draw straight to the window.
+    """
+    def __init__(self, size, caption, render_size, smooth=False):
+        self.size = size
+        self.render_size = render_size
+        self.scale_x = render_size[0] / size[0]
+        self.scale_y = render_size[1] / size[1]
+        self.smooth = smooth
+        self.window = pygame.display.set_mode(size)
+        if not self.window:
+            raise RuntimeError("Failed to create display surface")
+        pygame.display.set_caption(caption)
+        # Same pixel format as the window so upscaling can write into it directly
+        self.surface = pygame.Surface(render_size, 0, self.window)
+        self.atlas = None  # Sprites scaled to the render size
+        self.sprites = None  # Full size sprites for the HUD layers
+        self.draw_list = DrawList()
+        self.clear_color = (0, 0, 0)
+        self.batched = False
+        self.overlays = {}  # key -> (version, surface)
+        self.frame_overlays = []
+        self.draw_calls = 0
+
+    def load_atlas(self, sprites):
+        scaled = {}
+        for name, (surface, (anchor_x, anchor_y)) in sprites.items():
+            width, height = surface.get_size()
+            size = (max(1, round(width * self.scale_x)), max(1, round(height * self.scale_y)))
+            scaled[name] = (pygame.transform.smoothscale(surface, size),
+                            (round(anchor_x * self.scale_x), round(anchor_y * self.scale_y)))
+        self.atlas = SpriteSheet(scaled)
+        self.sprites = SpriteSheet(sprites)
+
+    def begin(self, clear_color):
+        """Start a batched frame"""
+        self.clear_color = clear_color
+        self.draw_list.clear()
+        self.frame_overlays = []
+        self.batched = True
+
+    def submit(self, layer, name, x, y, width=None, height=None):
+        """Queue a sprite at (x, y) in window coordinates, optionally stretched to width x height"""
+        self.draw_list.add(layer, name, x, y, width, height)
+
+    def overlay(self, key, position, version, render):
+        """Queue a full resolution surface such as the HUD, render() runs when version changes"""
+        cached = self.overlays.get(key)
+        if cached is None or cached[0] != version:
+            cached = self.overlays[key] = (version, render())
+        self.frame_overlays.append((cached[1], position))
+
+    def end(self):
+        """Draw the world at render size, upscale it, draw the HUD on top and present"""
+        surface = self.surface
+        surface.fill(self.clear_color)
+        layers = self.draw_list.layers
+        order = sorted(layers)
+        self.flush_scaled([layers[layer] for layer in order if layer < LAYER_HUD])
+        if self.smooth:
+            pygame.transform.smoothscale(surface, self.size, self.window)
+        else:
+            pygame.transform.scale(surface, self.size, self.window)
+        flush_layers(self.window, self.sprites, ((layer, layers[layer]) for layer in order if layer >= LAYER_HUD))
+        if self.frame_overlays:
+            self.window.blits(self.frame_overlays, False)
+        pygame.display.flip()
+        self.draw_calls = self.draw_list.count + len(self.frame_overlays) + 1
+        self.batched = False
+
+    def flush_scaled(self, layers):
+        """Blit command lists given in window coordinates onto the render surface"""
+        sprites = self.atlas
+        scale_x = self.scale_x
+        scale_y = self.scale_y
+        for commands in layers:
+            blits = []
+            for name, x, y, width, height in commands:
+                left = int(x * scale_x)
+                top = int(y * scale_y)
+                if width is None:
+                    sprite, (anchor_x, anchor_y) = sprites[name]
+                    blits.append((sprite, (left - anchor_x, top - anchor_y)))
+                else:
+                    # Scale both edges so neighbouring stretched sprites still meet
+                    width = int((x + width) * scale_x) - left
+                    height = int((y + height) * scale_y) - top
+                    if width > 0 and height > 0:
+                        blits.append((sprites.sized(name, width, height), (left, top)))
+            if blits:
+                self.surface.blits(blits, False)
+
+    def present_surface(self, surface):
+        """Present a screen drawn straight to the window, used for menus"""
+        pygame.display.flip()
@@ -0,0 +1,43 @@
+import heapq
+from itertools import count
+
+class Scheduler:
+    """Heap of timed events, advancing only runs the events that are due"""
+    def __init__(self, now=0):
+        self.now = now
+        self.events = []
+        self.sequence = count()  # Keeps events due at the same time in order
+
+    def schedule_at(self, due, callback, *args):
+        """Run callback(*args) once the clock reaches due, returns a handle"""
+        event = [due, next(self.sequence), callback, args]
+        heapq.heappush(self.events, event)
+        return event
+
+    def schedule(self, delay, callback, *args):
+        return self.schedule_at(self.now + delay, callback, *args)
+
+    def reset(self, now):
+        """Drop every pending event and set the clock, used when restoring a saved state"""
+        self.now = now
+        self.events = []
+
+    def cancel(self, event):
+        """Cancel a pending event, it is dropped when it comes due"""
+        event[2] = None
+
+    def advance(self, now):
+        """Move the clock to now and run every event due by then"""
+        self.now = now
+        events = self.events
+        while events and events[0][0] <= now:
+            _due, _sequence, callback, args = heapq.heappop(events)
+            if callback is not None:
+                callback(*args)
+
+    def tick(self):
+        """Advance a frame-counting clock by one"""
+        self.advance(self.now + 1)
+
+    def __len__(self):
+        return len(self.events)
@@ -0,0 +1,129 @@
+import os
+
+import pygame
+from pygame._sdl2 import video
+
+from drawlist import DrawList
+
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 1
+
+class TextureAtlas:
+    """All sprites packed on shelves into one texture"""
+    def __init__(self, renderer, sprites):
+        # Tallest first keeps the shelves tight
+        order = sorted(sprites, key=lambda name: sprites[name][0].get_height(), reverse=True)
+        placements = {}
+        x = y = shelf_height = 0
+        for name in order:
+            surface, _anchor = sprites[name]
+            width, height = surface.get_size()
+            if x + width > ATLAS_WIDTH:
+                x = 0
+                y += shelf_height + ATLAS_PADDING
+                shelf_height = 0
+            placements[name] = (x, y)
+            x += width + ATLAS_PADDING
+            shelf_height = max(shelf_height, height)
+
+        sheet = pygame.Surface((ATLAS_WIDTH, y + shelf_height), pygame.SRCALPHA)
+        self.regions = {}
+        for name, (x, y) in placements.items():
+            surface, anchor = sprites[name]
+            sheet.blit(surface, (x, y))
+            width, height = surface.get_size()
+            if width == 4 and height == 4 and anchor == (0, 0):
+                # Sample the middle of solid swatches so stretching never bleeds
+                region = pygame.Rect(x + 1, y + 1, 2, 2)
+            else:
+                region = pygame.Rect(x, y, width, height)
+            self.regions[name] = (region, anchor)
+        self.sheet = sheet
+        self.texture = video.Texture.from_surface(renderer, sheet)
+
+class Sdl2Backend:
+    """Renderer/Texture backend that draws baked sprites in layer batches"""
+    def __init__(self, size, caption, driver=None):
+        self.size = size
+        self.window = video.Window(caption, size=size)
+        self.renderer = self.create_renderer(driver or os.environ.get("GAME_RENDER_DRIVER"))
+        self.atlas = None
+        self.draw_list = DrawList()
+        self.clear_color = (0, 0, 0)
+        self.batched = False
+        self.overlays = {}  # key -> (version, texture, position)
+        self.frame_overlays = []
+        self.screen_texture = None
+        self.draw_calls = 0
+
+    def create_renderer(self, driver):
+        """Create a renderer, using SDL's software renderer when asked or as a fallback"""
+        names = [info.name for info in video.get_drivers()]
+        if driver is not None:
+            if driver in names:
+                return video.Renderer(self.window, index=names.index(driver))
+            print(f"Warning: Render driver {driver!r} unavailable (have {', '.join(names)}), using the default")
+        try:
+            return video.Renderer(self.window)
+        except pygame.error as e:
+            print(f"Warning: Accelerated renderer unavailable, using software: {e}")
+            return video.Renderer(self.window, index=names.index("software"))
+
+    def load_atlas(self, sprites):
+        self.atlas = TextureAtlas(self.renderer, sprites)
+
+    def begin(self, clear_color):
+        """Start a batched frame"""
+        self.clear_color = clear_color
+        self.draw_list.clear()
+        self.frame_overlays = []
+        self.batched = True
+
+    def submit(self, layer, name, x, y, width=None, height=None):
+        """Queue a sprite at (x, y), optionally stretched to width x height"""
+        self.draw_list.add(layer, name, x, y, width, height)
+
+    def overlay(self, key, position, version, render):
+        """Queue a surface such as the HUD.
+
+        render() is called for the surface and it is re-uploaded only
+        when version changes.
+        """
+        cached = self.overlays.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, video.Texture.from_surface(self.renderer, render()), position)
+            self.overlays[key] = cached
+        elif cached[2] != position:
+            cached = (version, cached[1], position)
+            self.overlays[key] = cached
+        self.frame_overlays.append(cached)
+
+    def end(self):
+        """Draw every layer in order and present"""
+        renderer = self.renderer
+        renderer.draw_color = pygame.Color(self.clear_color)
+        renderer.clear()
+        draw = self.atlas.texture.draw
+        regions = self.atlas.regions
+        for name, x, y, width, height in self.draw_list:
+            region, (anchor_x, anchor_y) = regions[name]
+            if width is None:
+                draw(region, (x - anchor_x, y - anchor_y, region.width, region.height))
+            else:
+                draw(region, (x, y, width, height))
+        calls = self.draw_list.count
+        for _version, texture, position in self.frame_overlays:
+            texture.draw(None, (position[0], position[1], texture.width, texture.height))
+            calls += 1
+        renderer.present()
+        self.draw_calls = calls
+        self.batched = False
+
+    def present_surface(self, surface):
+        """Present a software-drawn surface, used for menus and other screens"""
+        if self.screen_texture is None:
+            self.screen_texture = video.Texture(self.renderer, surface.get_size(), streaming=True)
+        self.screen_texture.update(surface)
+        self.renderer.clear()
+        self.screen_texture.draw()
+        self.renderer.present()
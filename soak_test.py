@@ -0,0 +1,163 @@
+import argparse
+import csv
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from autopilot import Autopilot
+from Q2 import Game
+
+# Changes between the first and last span that count as degradation
+FRAME_TIME_LIMIT = 1.25  # p95/p99 frame time ratio
+RSS_LIMIT_MB = 32
+ENTITY_LIMIT = 1.5  # Mean live entity count ratio
+
+def rss_mb():
+    """Resident set size in megabytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        try:
+            import resource
+        except ImportError:
+            return float("nan")  # Neither is available on Windows, the RSS check never fires
+        # Peak rather than current, but still shows growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+class SoakTest:
+    """Runs Fox Adventure under the autopilot and samples health metrics over time"""
+    def __init__(self, game, sample_interval=60.0, level_timeout=10800):
+        self.game = game
+        self.autopilot = Autopilot(game)
+        game.read_keys = self.autopilot.read_keys
+        self.sample_interval = sample_interval
+        self.level_timeout = level_timeout  # Frames before a stuck run is restarted
+        self.samples = []
+        self.frame_times = []
+        self.frames = 0
+        self.levels = 0
+        self.restarts = 0
+
+    def start_run(self):
+        self.game.reset_game()
+        self.game.game_state = "playing"
+        self.level_started = self.frames
+        self.level = self.game.current_level
+
+    def run(self, seconds):
+        game = self.game
+        self.start_run()
+        started = time.perf_counter()
+        next_sample = started + self.sample_interval
+        while time.perf_counter() - started < seconds:
+            frame_start = time.perf_counter()
+            game.run_frame()
+            now = time.perf_counter()
+            self.frame_times.append((now - frame_start) * 1000)
+            self.frames += 1
+
+            if game.current_level != self.level or game.game_state == "victory":
+                self.levels += 1
+                self.level = game.current_level
+                self.level_started = self.frames
+            if game.game_state != "playing" or self.frames - self.level_started > self.level_timeout:
+                self.restarts += 1
+                self.start_run()
+            if now >= next_sample:
+                self.sample(now - started)
+                next_sample += self.sample_interval
+        if self.frame_times:
+            self.sample(time.perf_counter() - started)
+
+    def sample(self, elapsed):
+        times = sorted(self.frame_times)
+        self.frame_times = []
+        counts = self.game.entity_counts()
+        sample = {
+            "seconds": round(elapsed, 1),
+            "frames": len(times),
+            "frame_p50": percentile(times, 0.50),
+            "frame_p95": percentile(times, 0.95),
+            "frame_p99": percentile(times, 0.99),
+            "frame_max": times[-1],
+            "rss_mb": rss_mb(),
+            "entities": sum(counts.values()),
+            "levels": self.levels,
+            "restarts": self.restarts,
+        }
+        sample.update({f"count_{name}": count for name, count in counts.items()})
+        self.samples.append(sample)
+        print(f"{elapsed / 60:7.1f} min  p50 {sample['frame_p50']:5.2f}  p95 {sample['frame_p95']:5.2f}"
+              f"  p99 {sample['frame_p99']:5.2f} ms  rss {sample['rss_mb']:6.1f} MB"
+              f"  entities {sample['entities']:3}  levels {self.levels}  restarts {self.restarts}")
+
+    def degradation(self, span=3600.0):
+        """Compare the first and last span of samples, returns a list of findings"""
+        if len(self.samples) < 2:
+            return []
+        duration = self.samples[-1]["seconds"]
+        span = min(span, duration / 2)
+        first = [s for s in self.samples if s["seconds"] <= span]
+        last = [s for s in self.samples if s["seconds"] > duration - span]
+        if not first or not last:
+            return []
+
+        def mean(samples, key):
+            return sum(s[key] for s in samples) / len(samples)
+
+        findings = []
+        for key in ("frame_p95", "frame_p99"):
+            before, after = mean(first, key), mean(last, key)
+            if before > 0 and after / before > FRAME_TIME_LIMIT:
+                findings.append(f"{key} rose from {before:.2f} to {after:.2f} ms")
+        growth = last[-1]["rss_mb"] - first[0]["rss_mb"]
+        if growth > RSS_LIMIT_MB:
+            findings.append(f"RSS grew by {growth:.1f} MB")
+        before, after = mean(first, "entities"), mean(last, "entities")
+        if before > 0 and after / before > ENTITY_LIMIT:
+            findings.append(f"mean entity count rose from {before:.1f} to {after:.1f}")
+        return findings
+
+    def write_csv(self, path):
+        fields = []
+        for sample in self.samples:
+            fields.extend(key for key in sample if key not in fields)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fields)
+            writer.writeheader()
+            writer.writerows(self.samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test Fox Adventure with the autopilot")
+    parser.add_argument("hours", type=float, nargs="?", default=2.0)
+    parser.add_argument("--sample", type=float, default=60.0, help="seconds between samples")
+    parser.add_argument("--uncapped", action="store_true", help="run frames without the 60 FPS cap")
+    parser.add_argument("--csv", help="write samples to this file")
+    args = parser.parse_args()
+
+    game = Game()
+    if args.uncapped:
+        game.fps = 0
+    soak = SoakTest(game, sample_interval=args.sample)
+    print(f"Soak test for {args.hours:g} h, sampling every {args.sample:g} s")
+    soak.run(args.hours * 3600)
+    if args.csv:
+        soak.write_csv(args.csv)
+
+    findings = soak.degradation()
+    print(f"{soak.frames} frames, {soak.levels} levels cleared, {soak.restarts} restarts, "
+          f"{soak.autopilot.shots} shots")
+    if findings:
+        print("DEGRADED: " + "; ".join(findings))
+        raise SystemExit(1)
+    print("No degradation between the first and last hour of the run")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from collections import Counter, namedtuple
+from itertools import islice
+
+# Compact description of an entity that has not been created yet
+Spawn = namedtuple("Spawn", "trigger kind x y variant")
+
+class WaveSpawner:
+    """Creates entities from spawn descriptors as their trigger is reached.
+
+    Descriptors are sorted by trigger (a world position or a time) once,
+    so each advance only moves a cursor past the triggers that are due.
+    """
+    def __init__(self, spawns):
+        self.spawns = sorted(spawns, key=lambda spawn: spawn.trigger)
+        self.cursor = 0
+        self.remaining = Counter(spawn.kind for spawn in self.spawns)
+
+    @property
+    def done(self):
+        return self.cursor >= len(self.spawns)
+
+    def pending(self, kind):
+        """Number of entities of a kind still waiting to spawn"""
+        return self.remaining[kind]
+
+    def upcoming(self):
+        """Lazy iterator over the descriptors not spawned yet, nothing is copied until it is read"""
+        return islice(self.spawns, self.cursor, None)
+
+    def seek(self, cursor):
+        """Move the cursor, the descriptors before it count as spawned"""
+        self.cursor = cursor
+        self.remaining = Counter(spawn.kind for spawn in self.spawns[cursor:])
+
+    def advance(self, trigger, create):
+        """Call create(spawn) for every descriptor whose trigger is <= trigger"""
+        spawns = self.spawns
+        while self.cursor < len(spawns) and spawns[self.cursor].trigger <= trigger:
+            spawn = spawns[self.cursor]
+            self.cursor += 1
+            self.remaining[spawn.kind] -= 1
+            create(spawn)
@@ -0,0 +1,24 @@
+import pygame
+
+_fonts = {}
+
+def init_pygame():
+    """Initialize the display subsystem, fonts start in get_font"""
+    if not pygame.display.get_init():
+        pygame.display.init()
+        # Clock.tick starts SDL's timer, which pygame.time.get_ticks needs
+        pygame.time.Clock().tick()
+
+def get_font(size, name=None):
+    """Load a font on first use and reuse it afterwards"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if name is None:
+            font = pygame.font.Font(None, size)
+        else:
+            font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
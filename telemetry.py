@@ -0,0 +1,184 @@
+import gc
+import os
+import socket
+import threading
+from array import array
+from collections import Counter
+from operator import attrgetter
+
+TIMING_FIELDS = ("frame_ms", "update_ms", "draw_ms")
+
+class RingBuffer:
+    """Fixed-size buffer of numeric rows for one writer and one reader.
+
+    The writer fills a row and then bumps the written count, the reader
+    only looks at rows below that count, so no lock is needed. A reader
+    that falls behind skips the lost rows. The oldest row's slot is the
+    one the writer fills next, so at most capacity - 1 rows are read back,
+    and rows whose slots were reused during the copy are dropped.
+    """
+    def __init__(self, fields, capacity=4096):
+        self.fields = fields
+        self.width = len(fields)
+        self.capacity = capacity
+        self.data = array("d", bytes(8 * self.width * capacity))
+        self.written = 0
+
+    def append(self, values):
+        start = (self.written % self.capacity) * self.width
+        self.data[start:start + self.width] = array("d", values)
+        self.written += 1
+
+    def read_since(self, position):
+        """Return (rows written after position, new position)"""
+        end = self.written
+        position = max(position, end - self.capacity + 1)
+        rows = []
+        for index in range(position, end):
+            start = (index % self.capacity) * self.width
+            rows.append(self.data[start:start + self.width])
+        # Check the count again, the writer may have lapped the reader during the copy
+        first_intact = self.written - self.capacity + 1
+        if first_intact > position:
+            rows = rows[first_intact - position:]
+        return rows, end
+
+class Telemetry:
+    """Samples frame metrics into a ring buffer and publishes aggregates once per second.
+
+    entity_types maps a group name to (attribute, types), the entities in
+    that group are counted per value of the attribute. Other groups are
+    counted as a whole. Going over every entity costs far more than
+    len(), so the per type counts are refreshed every type_interval
+    frames and repeated in between.
+    """
+    def __init__(self, game_name, groups, entity_types=None, socket_path=None, metrics_path=None, interval=1.0,
+                 type_interval=4):
+        self.game_name = game_name
+        self.groups = list(groups)
+        entity_types = entity_types or {}
+        self.typed_groups = [(name, attrgetter(entity_types[name][0]), entity_types[name][1])
+                             for name in self.groups if name in entity_types]
+        self.whole_groups = [name for name in self.groups if name not in entity_types]
+        self.fields = (TIMING_FIELDS + ("projectiles",)
+                       + tuple(f"entities_{name}_{kind}" for name, _type_of, types in self.typed_groups
+                               for kind in types)
+                       + tuple(f"entities_{name}" for name in self.whole_groups)
+                       + ("gc_gen0", "gc_gen1", "gc_gen2"))
+        self.buffer = RingBuffer(self.fields)
+        self.socket_path = socket_path or f"/tmp/{game_name}-telemetry.sock"
+        self.metrics_path = metrics_path or f"{game_name}.prom"
+        self.interval = interval
+        self.type_interval = type_interval
+        self.frames = 0
+        self.type_counts = []
+        self.collections = [0, 0, 0]
+        self.read_position = 0
+        self.latest = {}
+        self.stopping = threading.Event()
+        if hasattr(socket, "AF_UNIX"):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        else:
+            print("Warning: Unix sockets unavailable, telemetry only writes the metrics file")
+            self.socket = None
+        self.thread = threading.Thread(target=self.publish_loop, name="telemetry", daemon=True)
+
+    @classmethod
+    def from_environment(cls, game_name, groups, entity_types=None):
+        """Create telemetry when GAME_TELEMETRY is set"""
+        if not os.environ.get("GAME_TELEMETRY"):
+            return None
+        return cls(game_name, groups, entity_types,
+                   socket_path=os.environ.get("GAME_TELEMETRY_SOCKET"),
+                   metrics_path=os.environ.get("GAME_TELEMETRY_FILE"))
+
+    def start(self):
+        gc.callbacks.append(self.count_collection)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=2)
+        if self.count_collection in gc.callbacks:
+            gc.callbacks.remove(self.count_collection)
+        self.publish()
+        if self.socket is not None:
+            self.socket.close()
+
+    def count_collection(self, phase, info):
+        if phase == "start":
+            self.collections[info["generation"]] += 1
+
+    def __call__(self, game):
+        """Frame hook, records one row"""
+        groups = game.groups
+        if self.frames % self.type_interval == 0:
+            self.type_counts = self.count_types(groups)
+        self.frames += 1
+        projectiles = 0
+        for name, _type_of, _types in self.typed_groups:
+            if "projectile" in name:
+                projectiles += len(groups.get(name, ()))
+        counts = list(self.type_counts)
+        for name in self.whole_groups:
+            count = len(groups.get(name, ()))
+            counts.append(count)
+            if "projectile" in name:
+                projectiles += count
+        self.buffer.append([game.clock.get_time(), game.update_ms, game.draw_ms, projectiles]
+                           + counts + self.collections)
+
+    def count_types(self, groups):
+        counts = []
+        for name, type_of, types in self.typed_groups:
+            tally = Counter(map(type_of, groups.get(name, ())))
+            counts.extend(tally[kind] for kind in types)
+        return counts
+
+    def publish_loop(self):
+        while not self.stopping.wait(self.interval):
+            self.publish()
+
+    def publish(self):
+        """Aggregate the rows since the last publish and send them out"""
+        rows, self.read_position = self.buffer.read_since(self.read_position)
+        if not rows:
+            return
+        summary = {"frames": len(rows)}
+        for index, field in enumerate(self.fields):
+            values = [row[index] for row in rows]
+            if field in TIMING_FIELDS:
+                values.sort()
+                summary[f"{field}_mean"] = sum(values) / len(values)
+                summary[f"{field}_p95"] = values[min(len(values) - 1, int(len(values) * 0.95))]
+                summary[f"{field}_max"] = values[-1]
+            else:
+                summary[field] = values[-1]
+        self.latest = summary
+        self.send(summary)
+        self.write_metrics(summary)
+
+    def send(self, summary):
+        if self.socket is None:
+            return
+        line = " ".join(f"{key}={value:g}" for key, value in summary.items())
+        try:
+            self.socket.sendto(f"{self.game_name} {line}".encode(), self.socket_path)
+        except OSError:
+            pass  # Nobody is listening
+
+    def write_metrics(self, summary):
+        """Write a Prometheus text exposition file, replaced atomically"""
+        lines = []
+        for key, value in summary.items():
+            name = f"game_{key}"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f'{name}{{game="{self.game_name}"}} {value:g}')
+        temporary = f"{self.metrics_path}.tmp"
+        try:
+            with open(temporary, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(temporary, self.metrics_path)
+        except OSError as e:
+            print(f"Warning: Could not write telemetry file: {e}")
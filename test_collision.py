@@ -0,0 +1,88 @@
+import pygame
+import pytest
+
+from collision import first_swept_hit, sweep_time
+
+TARGET = pygame.Rect(20, 0, 10, 10)
+
+@pytest.mark.parametrize("box, move, expected", [
+    # Straight through along x, entering when the right edge reaches 20
+    ((0, 0, 10, 10), (20, 0), 0.5),
+    ((0, 0, 10, 10), (40, 0), 0.25),
+    # Coming from the other side
+    ((40, 0, 10, 10), (-20, 0), 0.5),
+    # Zero velocity on y, the rows must already overlap
+    ((0, 5, 10, 10), (20, 0), 0.5),
+    ((0, 10, 10, 10), (20, 0), None),
+    ((0, -10, 10, 10), (20, 0), None),
+    # Zero velocity on both axes is a plain overlap test
+    ((15, 0, 10, 10), (0, 0), 0.0),
+    ((10, 0, 10, 10), (0, 0), None),
+    # Starting already overlapping hits at once, whichever way it moves
+    ((15, 0, 10, 10), (20, 0), 0.0),
+    ((25, 5, 10, 10), (-5, -5), 0.0),
+    ((25, 5, 10, 10), (30, 30), 0.0),
+    # Grazing, only touching the target edge at the end of the move is not a hit
+    ((0, 0, 10, 10), (10, 0), None),
+    ((0, 0, 10, 10), (10.5, 0), pytest.approx(10 / 10.5)),
+    # Stopping short of the target
+    ((0, 0, 10, 10), (5, 0), None),
+    # Moving away from the target
+    ((40, 0, 10, 10), (10, 0), None),
+    # Sliding along the target's top edge never overlaps it
+    ((0, -10, 10, 10), (40, 0), None),
+    # Diagonal moves, through the target, away from it and ending on its corner
+    ((0, 10, 10, 10), (20, -10), 0.5),
+    ((0, 20, 10, 10), (20, -20), 0.5),
+    ((0, 10, 10, 10), (20, 20), None),
+    ((0, 20, 10, 10), (10, -10), None),
+])
+def test_sweep_time(box, move, expected):
+    x, y, width, height = box
+    assert sweep_time(x, y, width, height, move[0], move[1], TARGET) == expected
+
+class Target:
+    def __init__(self, rect, alive=True):
+        self.rect = pygame.Rect(rect)
+        self.alive = alive
+
+def is_alive(target):
+    return target.alive
+
+def hit(end, move, targets, refine=None):
+    return first_swept_hit(pygame.Rect(end), move, targets, [target.rect for target in targets], is_alive, refine)
+
+def test_first_swept_hit_earliest_target():
+    near = Target((20, 0, 10, 10))
+    far = Target((50, 0, 10, 10))
+    # The shot ends past both targets, listed farthest first
+    assert hit((70, 0, 5, 5), (70, 0), [far, near]) is near
+
+def test_first_swept_hit_tunnelling():
+    # A thin target the shot skips over between ticks
+    wall = Target((30, 0, 2, 10))
+    assert hit((60, 2, 5, 5), (60, 0), [wall]) is wall
+    assert hit((60, 2, 5, 5), (20, 0), [wall]) is None
+
+def test_first_swept_hit_skips_dead_targets():
+    dead = Target((20, 0, 10, 10), alive=False)
+    behind = Target((40, 0, 10, 10))
+    assert hit((60, 0, 5, 5), (60, 0), [dead, behind]) is behind
+
+def test_first_swept_hit_refine():
+    near = Target((20, 0, 10, 10))
+    far = Target((40, 0, 10, 10))
+    paths = []
+
+    def refine(target, path):
+        paths.append(path)
+        return target is far
+
+    assert hit((60, 0, 5, 5), (60, 0), [near, far], refine) is far
+    # refine sees the box around the whole move
+    assert paths[0] == pygame.Rect(0, 0, 65, 5)
+
+def test_first_swept_hit_no_move():
+    target = Target((20, 0, 10, 10))
+    assert hit((22, 2, 5, 5), (0, 0), [target]) is target
+    assert hit((0, 0, 5, 5), (0, 0), [target]) is None
@@ -0,0 +1,211 @@
+import random
+
+import pygame
+import pytest
+
+from collision import first_swept_hit
+from entity_list import EntityList
+from runtime import GameRuntime, entity_group
+
+class Entity:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"Entity({self.name!r})"
+
+def entities(count):
+    return [Entity(index) for index in range(count)]
+
+def test_discard_at_keeps_order_and_count():
+    items = entities(6)
+    group = EntityList(items)
+    group.discard_at(1)
+    group.discard_at(4)
+    assert len(group) == 4
+    assert list(group) == [items[0], items[2], items[3], items[5]]
+    # Slots keep their places until compact()
+    assert group.slots[1] is None and group.slots[5] is items[5]
+    group.compact()
+    assert group.slots == [items[0], items[2], items[3], items[5]]
+    assert len(group) == 4
+
+def test_discard_at_twice_counts_once():
+    group = EntityList(entities(3))
+    group.discard_at(0)
+    group.discard_at(0)
+    assert len(group) == 2
+    assert group.removed == 1
+
+def test_bool_follows_live_entities():
+    group = EntityList(entities(2))
+    assert group
+    group.discard_at(0)
+    group.discard_at(1)
+    assert not group
+    assert len(group) == 0
+    group.compact()
+    assert group.slots == []
+
+def test_discard_during_iteration():
+    items = entities(8)
+    group = EntityList(items)
+    seen = []
+    for slot, entity in enumerate(group.slots):
+        if entity is None:
+            continue
+        seen.append(entity)
+        if slot % 2 == 0:
+            group.discard_at(slot)
+        if slot == 2:
+            # Removing a later entity while looping skips it
+            group.discard_at(5)
+    assert seen == [item for index, item in enumerate(items) if index != 5]
+    group.compact()
+    assert list(group) == [items[1], items[3], items[7]]
+
+def test_iterating_skips_entities_removed_mid_loop():
+    items = entities(5)
+    group = EntityList(items)
+    seen = []
+    for entity in group:
+        seen.append(entity)
+        if entity is items[1]:
+            group.discard_at(3)
+    assert seen == [items[0], items[1], items[2], items[4]]
+
+def test_append_during_iteration():
+    items = entities(3)
+    group = EntityList(items)
+    seen = []
+    for entity in group:
+        seen.append(entity)
+        if len(seen) <= 3:
+            group.append(Entity(f"child of {entity.name}"))
+    # Loops over the group also reach entities added while they run
+    assert [entity.name for entity in seen] == [0, 1, 2, "child of 0", "child of 1", "child of 2"]
+    assert len(group) == 6
+
+def test_append_after_discard_before_compact():
+    items = entities(3)
+    group = EntityList(items)
+    group.discard_at(0)
+    extra = Entity("extra")
+    group.append(extra)
+    assert len(group) == 3
+    assert list(group) == [items[1], items[2], extra]
+    group.compact()
+    assert group.slots == [items[1], items[2], extra]
+
+def test_retain_drops_tombstones():
+    items = entities(6)
+    group = EntityList(items)
+    group.discard_at(0)
+    group.retain(lambda entity: entity.name != 3)
+    assert group.slots == [items[1], items[2], items[4], items[5]]
+    assert group.removed == 0
+    assert len(group) == 4
+
+def test_clear_leaves_running_loops_alone():
+    items = entities(3)
+    group = EntityList(items)
+    seen = []
+    for entity in group:
+        seen.append(entity)
+        group.clear()
+    assert seen == items
+    assert len(group) == 0 and not group
+
+class Game(GameRuntime):
+    shots = entity_group("shots")
+
+    def __init__(self):
+        super().__init__(100, 100, "Test", headless=True)
+        self.shots = []
+
+def test_entity_group_wraps_lists():
+    game = Game()
+    assert isinstance(game.shots, EntityList)
+    items = entities(3)
+    # Such as the lists rewind restores
+    game.shots = items
+    assert isinstance(game.shots, EntityList)
+    assert list(game.shots) == items
+    group = EntityList(items)
+    game.shots = group
+    assert game.shots is group
+
+class Shot:
+    def __init__(self, x, y, dx):
+        self.rect = pygame.Rect(x, y, 4, 4)
+        self.last_move = (dx, 0)
+
+class Target:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 10, 10)
+        self.alive = True
+
+def reference_collide(shots, targets, on_hit):
+    """collide_group as a plain list scan, removing with list.remove"""
+    live = [target for target in targets if target.alive]
+    rects = [target.rect for target in live]
+    for shot in list(shots):
+        target = first_swept_hit(shot.rect, shot.last_move, live, rects, lambda target: target.alive)
+        if target is not None:
+            on_hit(shot, target)
+            shots.remove(shot)
+
+def scene(seed):
+    rng = random.Random(seed)
+    shots = [Shot(rng.randrange(0, 300), rng.randrange(0, 50), rng.choice((-12, 12))) for _ in range(60)]
+    targets = [Target(rng.randrange(0, 300), rng.randrange(0, 50)) for _ in range(8)]
+    return shots, targets
+
+@pytest.mark.parametrize("seed", range(5))
+def test_collide_group_matches_list_removal(seed):
+    shots, targets = scene(seed)
+    expected_hits = []
+    expected = list(shots)
+
+    def kill(hits):
+        def on_hit(shot, target):
+            hits.append((shot, target))
+            target.alive = len(hits) % 3 != 0
+        return on_hit
+
+    reference_collide(expected, targets, kill(expected_hits))
+    assert expected_hits
+    for target in targets:
+        target.alive = True
+
+    game = Game()
+    game.shots = shots
+    hits = []
+    game.collide_group("shots", targets, kill(hits))
+    assert hits == expected_hits
+    assert list(game.shots) == expected
+    assert game.shots.removed == 0
+    assert len(game.shots) == len(expected)
+
+def test_collide_group_leaves_new_shots_for_next_tick():
+    game = Game()
+    target = Target(20, 0)
+    shot = Shot(20, 0, 12)
+    game.shots = [shot]
+    fired = Shot(20, 0, 12)
+
+    def on_hit(hit_shot, hit_target):
+        # A shot spawned by a hit lands past the slots being tested
+        game.shots.append(fired)
+
+    game.collide_group("shots", [target], on_hit)
+    assert list(game.shots) == [fired]
+
+def test_cull_group_keeps_order():
+    game = Game()
+    items = entities(10)
+    game.shots = items
+    game.shots.discard_at(2)
+    game.cull_group("shots", lambda entity: entity.name % 3)
+    assert list(game.shots) == [items[1], items[4], items[5], items[7], items[8]]
+    assert game.shots.slots == list(game.shots)
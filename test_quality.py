@@ -0,0 +1,45 @@
+from quality import QUALITY_FULL, QUALITY_NO_BOBBING, QUALITY_NO_GLOW, QualityGovernor
+
+def run(governor, frame_ms, frames):
+    for _ in range(frames):
+        governor.record(frame_ms)
+
+def test_steps_down_to_no_bobbing_and_stops():
+    governor = QualityGovernor(fps=60, window=10, cooldown=10)
+    run(governor, 30.0, 200)
+    assert governor.tier == QUALITY_NO_BOBBING
+    assert [change[2] for change in governor.history] == [1, 2, 3]
+    settings = governor.settings()
+    assert not settings.draw_glow and not settings.draw_health_bars and not settings.animate_bobbing
+
+def test_steps_back_up_with_headroom():
+    governor = QualityGovernor(fps=60, window=10, cooldown=10)
+    run(governor, 30.0, 200)
+    run(governor, 2.0, 200)
+    assert governor.tier == QUALITY_FULL
+    assert governor.settings().animate_bobbing
+
+def test_settings_hold_still_when_the_tier_changes():
+    governor = QualityGovernor(fps=60, window=10, cooldown=10)
+    settings = governor.settings()
+    governor.set_tier(QUALITY_NO_BOBBING)
+    assert settings.draw_glow and settings.animate_bobbing
+
+def test_only_sustained_changes_are_printed(capsys):
+    governor = QualityGovernor(fps=60, window=10, announce_after=50)
+    # Within budget and without headroom, record() leaves the tier alone
+    run(governor, 12.0, 10)
+    # Flipping back and forth faster than announce_after prints nothing
+    for _ in range(5):
+        governor.set_tier(QUALITY_NO_GLOW)
+        run(governor, 12.0, 20)
+        governor.set_tier(QUALITY_FULL)
+        run(governor, 12.0, 20)
+    assert len(governor.history) == 10
+    governor.set_tier(QUALITY_NO_GLOW)
+    run(governor, 12.0, 49)
+    assert capsys.readouterr().out == ""
+    run(governor, 12.0, 1)
+    assert capsys.readouterr().out.splitlines() == ["Quality: full -> no glow (avg frame 12.0 ms, budget 16.7 ms)"]
+    run(governor, 12.0, 100)
+    assert capsys.readouterr().out == ""
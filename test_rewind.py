@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from rewind import RewindBuffer, Segment
+
+def make_tables(ticks, seed=0):
+    """Tables for consecutive ticks where entities move, appear and go away"""
+    rng = np.random.default_rng(seed)
+    ids = list(range(6))
+    next_id = len(ids)
+    state = {entity_id: rng.integers(0, 100, 4).astype(np.float64) for entity_id in ids}
+    tables = []
+    for tick in range(ticks):
+        if tick % 4 == 1 and len(ids) > 2:
+            del state[ids.pop(int(rng.integers(len(ids))))]
+        if tick % 5 == 2:
+            ids.append(next_id)
+            state[next_id] = rng.integers(0, 100, 4).astype(np.float64)
+            next_id += 1
+        for entity_id in ids:
+            if rng.random() < 0.5:
+                state[entity_id][int(rng.integers(4))] += 1
+        tables.append(np.array([[entity_id, *state[entity_id]] for entity_id in ids]))
+    return tables
+
+def encode(tables):
+    segment = Segment(tables[0])
+    for previous, table in zip(tables, tables[1:]):
+        segment.append(previous, table)
+    return segment
+
+def assert_tables_equal(decoded, expected):
+    assert len(decoded) == len(expected)
+    for ours, theirs in zip(decoded, expected):
+        np.testing.assert_array_equal(ours, theirs)
+
+def test_segment_round_trip():
+    tables = make_tables(20)
+    assert_tables_equal(encode(tables).decode(), tables)
+
+@pytest.mark.parametrize("ticks", [1, 2, 7, 19, 20])
+def test_truncate_keeps_prefix(ticks):
+    tables = make_tables(20)
+    segment = encode(tables)
+    segment.truncate(ticks)
+    assert segment.ticks == ticks
+    assert_tables_equal(segment.decode(), tables[:ticks])
+
+@pytest.mark.parametrize("ticks", [1, 2, 7, 19])
+def test_truncate_counts_bytes_like_append(ticks):
+    tables = make_tables(20)
+    segment = encode(tables)
+    segment.truncate(ticks)
+    assert segment.nbytes == encode(tables[:ticks]).nbytes
+
+def test_append_after_truncate():
+    tables = make_tables(20)
+    segment = encode(tables)
+    segment.truncate(8)
+    resumed = make_tables(20, seed=1)[:3]
+    # Carry on from tick 8 with different state
+    previous = tables[7]
+    for table in resumed:
+        segment.append(previous, table)
+        previous = table
+    expected = tables[:8] + resumed
+    assert_tables_equal(segment.decode(), expected)
+    assert segment.nbytes == encode(expected).nbytes
+
+def rows(table):
+    return [tuple(row) for row in table]
+
+def test_scrub_and_resume():
+    tables = make_tables(50)
+    buffer = RewindBuffer(seconds=10, fps=60, keyframe_interval=8)
+    for table in tables:
+        buffer.record(rows(table))
+    np.testing.assert_array_equal(buffer.step_back(), tables[-2])
+    np.testing.assert_array_equal(buffer.step_back(20), tables[-22])
+
+    # Recording again drops the ticks after the scrub position
+    newer = make_tables(5, seed=2)
+    for table in newer:
+        buffer.record(rows(table))
+    expected = tables[:-21] + newer
+    assert buffer.ticks == len(expected)
+    assert_tables_equal([buffer.table_at(index) for index in range(buffer.ticks)], expected)
+    assert buffer.nbytes == sum(segment.nbytes for segment in buffer.segments)
+
+def test_resume_keeps_byte_total():
+    tables = make_tables(60)
+    buffer = RewindBuffer(seconds=10, fps=60, keyframe_interval=10)
+    for table in tables:
+        buffer.record(rows(table))
+    for back in (3, 14, 25):
+        buffer.step_back(back)
+        buffer.resume()
+        assert buffer.nbytes == sum(segment.nbytes for segment in buffer.segments)
+
+def test_eviction_by_bytes():
+    tables = make_tables(100)
+    buffer = RewindBuffer(seconds=100, fps=60, keyframe_interval=10, max_bytes=2000)
+    for table in tables:
+        buffer.record(rows(table))
+        assert buffer.nbytes <= 2000 or len(buffer.segments) == 1
+    assert buffer.nbytes == sum(segment.nbytes for segment in buffer.segments)
+    np.testing.assert_array_equal(buffer.table_at(buffer.ticks - 1), tables[-1])
@@ -0,0 +1,89 @@
+import socket
+from types import SimpleNamespace
+
+from telemetry import RingBuffer, Telemetry
+
+def fill(buffer, start, stop):
+    for value in range(start, stop):
+        buffer.append([value, -value])
+
+def test_read_since_returns_new_rows():
+    buffer = RingBuffer(("a", "b"), capacity=8)
+    fill(buffer, 0, 5)
+    rows, position = buffer.read_since(0)
+    assert [list(row) for row in rows] == [[value, -value] for value in range(5)]
+    fill(buffer, 5, 7)
+    rows, position = buffer.read_since(position)
+    assert [row[0] for row in rows] == [5, 6]
+    assert position == 7
+
+def test_read_since_skips_lost_rows():
+    buffer = RingBuffer(("a", "b"), capacity=8)
+    fill(buffer, 0, 20)
+    rows, position = buffer.read_since(0)
+    # The oldest slot may be half written by the next append
+    assert [row[0] for row in rows] == list(range(13, 20))
+    assert position == 20
+
+class LappingData:
+    """Buffer storage where the writer appends a row during each copy"""
+    def __init__(self, buffer, data):
+        self.buffer = buffer
+        self.data = data
+
+    def __getitem__(self, index):
+        row = self.data[index]
+        fill(self.buffer, int(self.buffer.written), int(self.buffer.written) + 1)
+        return row
+
+    def __setitem__(self, index, value):
+        self.data[index] = value
+
+def test_read_since_drops_rows_overwritten_during_copy():
+    buffer = RingBuffer(("a", "b"), capacity=8)
+    fill(buffer, 0, 8)
+    buffer.data = LappingData(buffer, buffer.data)
+    rows, position = buffer.read_since(0)
+    assert position == 8
+    # Seven rows were written during the copy of rows 1-7, reusing all their slots
+    assert rows == []
+    assert buffer.written == 15
+    buffer.data = buffer.data.data
+    fill(buffer, 15, 19)
+    rows, position = buffer.read_since(position)
+    # 19 rows written, only the last 7 are safe to read
+    assert [row[0] for row in rows] == [12, 13, 14, 15, 16, 17, 18]
+
+def make_game():
+    projectiles = [SimpleNamespace(owner="player")] * 3 + [SimpleNamespace(owner="enemy")]
+    enemies = [SimpleNamespace(enemy_type="basic")] * 2 + [SimpleNamespace(enemy_type="boss")]
+    return SimpleNamespace(groups={"projectiles": projectiles, "enemies": enemies, "collectibles": [object()] * 5},
+                           clock=SimpleNamespace(get_time=lambda: 16), update_ms=4.0, draw_ms=6.0)
+
+def test_counts_per_entity_type(tmp_path):
+    game = make_game()
+    entity_types = {"projectiles": ("owner", ("player", "enemy")),
+                    "enemies": ("enemy_type", ("basic", "heavy", "boss"))}
+    telemetry = Telemetry("test", game.groups, entity_types, metrics_path=str(tmp_path / "test.prom"))
+    telemetry(game)
+    telemetry.publish()
+    telemetry.socket.close()
+    latest = telemetry.latest
+    assert latest["projectiles"] == 4
+    assert latest["entities_projectiles_player"] == 3
+    assert latest["entities_projectiles_enemy"] == 1
+    assert latest["entities_enemies_basic"] == 2
+    assert latest["entities_enemies_heavy"] == 0
+    assert latest["entities_enemies_boss"] == 1
+    assert latest["entities_collectibles"] == 5
+    assert 'game_entities_enemies_boss{game="test"} 1' in (tmp_path / "test.prom").read_text()
+
+def test_metrics_file_without_unix_sockets(tmp_path, monkeypatch):
+    monkeypatch.delattr(socket, "AF_UNIX", raising=False)
+    game = make_game()
+    telemetry = Telemetry("test", game.groups, metrics_path=str(tmp_path / "test.prom"))
+    assert telemetry.socket is None
+    telemetry(game)
+    telemetry.stop()
+    assert telemetry.latest["entities_enemies"] == 3
+    assert "game_frames" in (tmp_path / "test.prom").read_text()